@@ -0,0 +1,78 @@
+"""
+Benchmark the cold start of the meters Lambda: import and init time.
+
+Imports ``metr.api.meters.views`` in fresh interpreters under ``-X importtime``
+and reports the cumulative time of the slowest modules. Exits non-zero when
+the median total exceeds the budget, by default the recorded baseline plus a
+margin for run-to-run noise. Re-record the baseline when the cold start
+improves.
+
+Run with ``python -m benchmarks.bench_cold_start [budget_ms] [runs]``.
+"""
+
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+ENTRY_POINT = "metr.api.meters.views"
+
+# Modules that must stay out of the cold start; they are imported on first use.
+LAZY_MODULES = ("brotli", "gzip")
+
+# Median cold start recorded with 7 runs on the development machine, and the
+# margin allowed over it before the run fails.
+BASELINE_MS = 520
+MARGIN = 0.2
+
+
+def _import_times() -> Dict[str, int]:
+    """Import the entry point in a fresh interpreter; return microseconds."""
+    code = (
+        f"import sys, {ENTRY_POINT}\n"
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    loaded = result.stdout.strip()
+    if loaded:
+        raise SystemExit(f"Loaded at cold start, expected lazily: {loaded}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+def main(budget_ms: float = BASELINE_MS * (1 + MARGIN), runs: int = 7):
+    samples: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(runs):
+        for module, cumulative in _import_times().items():
+            samples[module].append(cumulative)
+
+    medians = {module: statistics.median(times) for module, times in samples.items()}
+    top_level = sorted(
+        (m for m in medians if "." not in m), key=medians.__getitem__, reverse=True
+    )
+    for module in top_level[:10]:
+        print(f"{module:>30}: {medians[module] / 1000:8.1f} ms")
+    for module in sorted(m for m in medians if m.startswith("metr.")):
+        print(f"{module:>30}: {medians[module] / 1000:8.1f} ms")
+
+    total_ms = medians[ENTRY_POINT] / 1000
+    print(f"Cold start: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    if total_ms > budget_ms:
+        raise SystemExit("Cold start is over budget.")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:2]), *(int(arg) for arg in sys.argv[2:]))
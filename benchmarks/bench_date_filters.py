@@ -0,0 +1,126 @@
+"""
+Benchmark the supply date filters of GET /meters with and without indexes.
+
+Each filter is timed for a first page, with and without its total, through
+the statement ``MeterPersistor.get_meters`` executes, first with the supply
+window indexes and then with them dropped. The query plan of that statement
+is printed along with the timings, once the table has been analyzed.
+
+Run with ``python -m benchmarks.bench_date_filters [rows]``.
+"""
+
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from metr.api.meters.persistors import MeterPersistor
+from metr.database import database
+from metr.database.database import Base, configure_database
+from metr.database.models import Meter
+
+FILTERS: Dict[str, Dict[str, Any]] = {
+    "active_on": {"active_on": date(2024, 6, 1)},
+    "start range": {
+        "supply_start_date__gte": datetime(2024, 1, 1),
+        "supply_start_date__lte": datetime(2024, 1, 31),
+    },
+    "end range": {
+        "supply_end_date__gte": datetime(2024, 1, 1),
+        "supply_end_date__lte": datetime(2024, 1, 31),
+    },
+}
+
+
+def _populate(session: Session, count: int, batch_size: int = 50_000):
+    start = datetime(2015, 1, 1)
+    for offset in range(0, count, batch_size):
+        rows = []
+        for i in range(offset, min(offset + batch_size, count)):
+            supply_start = start + timedelta(days=random.randrange(3650))
+            rows.append(
+                {
+                    "external_reference": f"REF{i}",
+                    "supply_start_date": supply_start,
+                    "supply_end_date": (
+                        supply_start + timedelta(days=random.randrange(30, 730))
+                        if i % 4
+                        else None
+                    ),
+                    "enabled": bool(i % 3),
+                    "annual_quantity": random.random() * 100_000,
+                }
+            )
+        session.execute(insert(Meter), rows)
+    session.commit()
+
+
+def _get_meters(filters: Dict[str, Any], with_total: bool):
+    with MeterPersistor() as persistor:
+        persistor.get_meters(page_size="20", with_total=with_total, **filters)
+
+
+def _time(filters: Dict[str, Any], with_total: bool, repeat: int = 5) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        _get_meters(filters, with_total)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def _plan(engine: Engine, filters: Dict[str, Any]) -> List[str]:
+    """Return the query plan of the page with its total, as executed."""
+    executed: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _get_meters(filters, with_total=True)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    statement, parameters = executed[0]
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+    return [row[-1] for row in plan]
+
+
+def _run(engine: Engine, label: str):
+    for name, filters in FILTERS.items():
+        print(
+            f"{label:>12} {name:>12}: page {_time(filters, False):8.2f} ms  "
+            f"page and total {_time(filters, True):8.2f} ms"
+        )
+        for step in _plan(engine, filters):
+            print(f"{'':>27}{step}")
+
+
+def main(rows: int = 1_000_000):
+    engine = configure_database("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with database.Session() as session:
+        _populate(session, rows)
+        session.execute(text("ANALYZE"))
+        session.commit()
+    _run(engine, "indexed")
+
+    with database.Session() as session:
+        for index in Meter.__table__.indexes:
+            if index.name.startswith("ix_meter_supply"):
+                session.execute(text(f"DROP INDEX {index.name}"))
+        session.execute(text("ANALYZE"))
+        session.commit()
+    _run(engine, "unindexed")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,91 @@
+"""
+Benchmark the per-request SQL overhead of filtered GET /meters queries.
+
+Runs the list and count queries of a few filter shapes, with values changing
+on every request, in three modes:
+
+- ``uncompiled``: statements rebuilt and compiled to SQL on every request;
+- ``rebuilt``: statements rebuilt on every request, their SQL served from
+  SQLAlchemy's compiled cache, as before the statement cache;
+- ``cached``: statements reused from the statement cache.
+
+Run with ``python -m benchmarks.bench_filter_statements [requests]``.
+"""
+
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+from metr.api.meters.caches import statement_cache
+from metr.api.meters.persistors import MeterPersistor
+from metr.database import database
+from metr.database.models import Meter
+
+
+def _populate(rows: int = 1000):
+    start = datetime(2020, 1, 1)
+    with database.Session.begin() as session:
+        session.execute(
+            insert(Meter),
+            [
+                {
+                    "external_reference": f"REF{i}",
+                    "supply_start_date": start + timedelta(days=i),
+                    "supply_end_date": start + timedelta(days=2 * i) if i % 2 else None,
+                    "enabled": bool(i % 3),
+                    "annual_quantity": random.random() * 100_000,
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+def _filters(i: int) -> dict:
+    shapes = (
+        {"enabled__eq": bool(i % 2), "annual_quantity__gte": float(i)},
+        {"meter_id__in": tuple(range(i % 50, i % 50 + 5))},
+        {
+            "external_reference__prefix": f"REF{i % 10}",
+            "supply_end_date__is_null": False,
+        },
+        {"active_on__eq": date(2020, 1, 1) + timedelta(days=i % 365)},
+    )
+    return shapes[i % len(shapes)]
+
+
+def _run(label: str, requests: int, rebuild: bool):
+    statement_cache.clear()
+    statement_cache.backend.stats.reset()
+    started = time.perf_counter()
+    for i in range(requests):
+        if rebuild:
+            statement_cache.clear()
+        with MeterPersistor() as persistor:
+            filters = _filters(i)
+            persistor.get_meters(page_size="20", with_total=True, **filters)
+            persistor.count_meters(**filters)
+    elapsed = (time.perf_counter() - started) / requests * 1_000_000
+    print(f"{label:>12}: {elapsed:8.1f} us/request  {statement_cache.stats}")
+
+
+def main(requests: int = 2000):
+    engine = database.configure_database()
+    database.Base.metadata.create_all(engine)
+    _populate()
+
+    uncompiled = engine.execution_options(compiled_cache=None)
+    database.Session.configure(bind=uncompiled)
+    database.ReadSession.configure(bind=uncompiled)
+    _run("uncompiled", requests, rebuild=True)
+
+    database.Session.configure(bind=engine)
+    database.ReadSession.configure(bind=engine)
+    _run("rebuilt", requests, rebuild=True)
+    _run("cached", requests, rebuild=False)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
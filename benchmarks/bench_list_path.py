@@ -0,0 +1,75 @@
+"""
+Benchmark the GET /meters read path: ORM hydration against Core row tuples.
+
+Run with ``python -m benchmarks.bench_list_path [rows]``.
+"""
+
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from metr.api.meters.serializers import row_as_dict
+from metr.database.database import Base
+from metr.database.models import METER_FIELDS, Meter
+
+
+def _populate(session: Session, count: int):
+    start = datetime(2020, 1, 1)
+    session.execute(
+        insert(Meter),
+        [
+            {
+                "external_reference": f"REF{i}",
+                "supply_start_date": start + timedelta(days=i % 3650),
+                "supply_end_date": (
+                    start + timedelta(days=i % 3650 + 365) if i % 2 else None
+                ),
+                "enabled": bool(i % 3),
+                "annual_quantity": random.random() * 100_000,
+            }
+            for i in range(count)
+        ],
+    )
+    session.commit()
+
+
+def _orm_path(session: Session, count: int) -> str:
+    meters = session.query(Meter).order_by(Meter.meter_id).limit(count).all()
+    return json.dumps([meter.as_dict() for meter in meters])
+
+
+def _core_path(session: Session, count: int) -> str:
+    columns = [Meter.__table__.columns[name] for name in METER_FIELDS]
+    statement = select(*columns).order_by(Meter.meter_id).limit(count)
+    return json.dumps([row_as_dict(row) for row in session.execute(statement)])
+
+
+def main(count: int = 100_000, repeat: int = 3):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        _populate(session, count)
+
+    results = {}
+    for name, path in (("orm", _orm_path), ("core", _core_path)):
+        best = float("inf")
+        for _ in range(repeat):
+            # A fresh session per run, like a fresh invocation.
+            with Session(engine) as session:
+                started = time.perf_counter()
+                body = path(session, count)
+                best = min(best, time.perf_counter() - started)
+        results[name] = body
+        print(f"{name:>5}: {best * 1000:8.1f} ms  {count / best:12,.0f} rows/s")
+
+    assert results["orm"] == results["core"], "Serialized output differs"
+    print("Output is byte-identical.")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
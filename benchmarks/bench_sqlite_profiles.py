@@ -0,0 +1,96 @@
+"""
+Benchmark a file-backed SQLite database under each PRAGMA profile.
+
+Measures small committed writes (one meter per transaction, like POST
+/meters), a bulk import, and reads while another connection writes.
+
+Run with ``python -m benchmarks.bench_sqlite_profiles [rows]``.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from metr.database.database import SQLITE_PROFILES, Base, create_database_engine
+from metr.database.models import Meter
+
+
+def _meter(i: int) -> dict:
+    return {
+        "external_reference": f"REF{i}",
+        "supply_start_date": datetime(2020, 1, 1),
+        "enabled": bool(i % 2),
+        "annual_quantity": float(i),
+    }
+
+
+def _rate(count: int, started: float) -> str:
+    return f"{count / (time.perf_counter() - started):10,.0f}/s"
+
+
+def _run(directory: Path, profile: str, rows: int):
+    url = f"sqlite:///{directory / profile}.db"
+    # The read-only profile cannot write; its database is filled as default.
+    engine = create_database_engine(
+        url, sqlite_profile="default" if profile == "read_only" else profile
+    )
+    Base.metadata.create_all(engine)
+    commits = rows // 10
+    started = time.perf_counter()
+    for i in range(commits):
+        with Session(engine) as session:
+            session.execute(insert(Meter).values(**_meter(i)))
+            session.commit()
+    commits_rate = _rate(commits, started)
+
+    started = time.perf_counter()
+    with Session(engine) as session:
+        session.execute(insert(Meter), [_meter(i) for i in range(commits, rows)])
+        session.commit()
+    bulk_rate = _rate(rows - commits, started)
+
+    # Reads of the whole table while another connection keeps writing.
+    reader = create_database_engine(url, sqlite_profile=profile)
+    stop = threading.Event()
+
+    def write():
+        i = rows
+        while not stop.is_set():
+            with Session(engine) as session:
+                session.execute(insert(Meter).values(**_meter(i)))
+                session.commit()
+            i += 1
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    reads = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < 1:
+        with reader.connect() as connection:
+            connection.scalar(select(func.sum(Meter.annual_quantity)))
+        reads += 1
+    read_rate = _rate(reads, started)
+    stop.set()
+    writer.join()
+    engine.dispose()
+    reader.dispose()
+
+    if profile == "read_only":
+        commits_rate = bulk_rate = f"{'-':>12}"
+    print(f"{profile:>12}: commits {commits_rate}  bulk {bulk_rate}  reads {read_rate}")
+
+
+def main(rows: int = 10_000):
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in SQLITE_PROFILES:
+            _run(Path(directory), profile, rows)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
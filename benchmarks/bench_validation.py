@@ -0,0 +1,77 @@
+"""
+Benchmark per-request validation: json.loads plus pydantic against one-pass JSON.
+
+Run with ``python -m benchmarks.bench_validation [batch_size]``.
+"""
+
+import json
+import sys
+import timeit
+
+from metr.api.meters.schemas import MeterSchema, MeterUpsertBatchAdapter
+
+
+def _meter(index: int) -> dict:
+    return {
+        "meter_id": index + 1,
+        "external_reference": f"REF{index}",
+        "supply_start_date": "2021-01-01T00:00:00",
+        "supply_end_date": None,
+        "enabled": True,
+        "annual_quantity": 123.45,
+    }
+
+
+def _report(name: str, statement, number: int, per: int = 1):
+    best = min(timeit.repeat(statement, number=number, repeat=5)) / number
+    print(f"{name:>28}: {best * 1e6 / per:8.2f} us per meter")
+
+
+def main(batch_size: int = 1000):
+    body = json.dumps(_meter(0))
+    _report(
+        "single: loads + model + dict",
+        lambda: MeterSchema(**json.loads(body)).model_dump(),
+        10_000,
+    )
+    _report(
+        "single: model_validate_json",
+        lambda: MeterSchema.model_validate_json(body).model_dump(),
+        10_000,
+    )
+
+    batch = [_meter(i) for i in range(batch_size)]
+    array = json.dumps(batch)
+    ndjson = "\n".join(json.dumps(meter) for meter in batch)
+    _report(
+        "batch: loads + validate",
+        lambda: MeterUpsertBatchAdapter.validate_python(json.loads(array)),
+        10,
+        batch_size,
+    )
+    _report(
+        "batch: validate_json",
+        lambda: MeterUpsertBatchAdapter.validate_json(array),
+        10,
+        batch_size,
+    )
+    _report(
+        "ndjson: loads per line",
+        lambda: MeterUpsertBatchAdapter.validate_python(
+            [json.loads(line) for line in ndjson.splitlines()]
+        ),
+        10,
+        batch_size,
+    )
+    _report(
+        "ndjson: joined validate_json",
+        lambda: MeterUpsertBatchAdapter.validate_json(
+            "[" + ",".join(ndjson.splitlines()) + "]"
+        ),
+        10,
+        batch_size,
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,208 @@
+"""In-process caches shared across warm invocations."""
+
+import os
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+from aws_lambda_typing.responses import APIGatewayProxyResponseV2
+
+from metr.core.cache import CacheBackend, LRUCacheBackend
+
+# The representations a single meter response may be cached in.
+CACHEABLE_CONTENT_TYPES = ("application/json", "application/xml", "text/csv")
+
+
+class CountCache:
+    """Bounded LRU cache of meter counts keyed by filter signature."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize.
+
+        :param maxsize: The maximum number of filter signatures to keep.
+        """
+        self.backend = LRUCacheBackend(maxsize=maxsize)
+
+    @staticmethod
+    def _signature(filters: Dict[str, Any]) -> FrozenSet[Tuple[str, Any]]:
+        """Return a hashable signature for a set of filters."""
+        return frozenset((k, v) for k, v in filters.items() if v is not None)
+
+    def get(self, filters: Dict[str, Any]) -> Optional[int]:
+        """
+        Return the cached count for the filters, if any.
+
+        :param filters: The filters the count was made with.
+        :return: The cached count or None.
+        """
+        return self.backend.get(self._signature(filters))
+
+    def set(self, filters: Dict[str, Any], count: int):
+        """
+        Cache the count for the filters, evicting the least recently used.
+
+        :param filters: The filters the count was made with.
+        :param count: The count of matching meters.
+        """
+        self.backend.set(self._signature(filters), count)
+
+    def clear(self):
+        """Drop every cached count."""
+        self.backend.clear()
+
+
+class StatementCache:
+    """
+    Bounded LRU cache of SQL statements keyed by their shape.
+
+    Statements take their values through bound parameters, so one statement
+    serves every request of the same shape without being built again.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Initialize.
+
+        :param maxsize: The maximum number of statements to keep.
+        """
+        self.backend = LRUCacheBackend(maxsize=maxsize)
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Return the statement for a shape, building and caching it on a miss.
+
+        :param key: The shape of the statement.
+        :param build: A function building the statement.
+        :return: The statement.
+        """
+        statement = self.backend.get(key)
+        if statement is None:
+            statement = build()
+            self.backend.set(key, statement)
+
+        return statement
+
+    def clear(self):
+        """Drop every cached statement."""
+        self.backend.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """The hit, miss and eviction counters of the cache."""
+        return self.backend.stats.as_dict()
+
+
+class MeterCache:
+    """
+    Read-through cache of serialized single-meter responses.
+
+    Entries are keyed by meter ID and content type. The cache is disabled
+    until a backend is configured.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        """
+        Initialize.
+
+        :param backend: The backend to store responses in, or None to disable.
+        """
+        self.backend = backend
+
+    def configure(self, backend: Optional[CacheBackend]):
+        """
+        Swap the cache backend.
+
+        :param backend: The backend to store responses in, or None to disable.
+        """
+        self.backend = backend
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a backend is configured."""
+        return self.backend is not None
+
+    def get(
+        self, meter_id: int, content_type: str
+    ) -> Optional[APIGatewayProxyResponseV2]:
+        """
+        Return a copy of the cached response for a meter, if any.
+
+        :param meter_id: The ID of the meter.
+        :param content_type: The content type of the representation.
+        :return: The cached response or None.
+        """
+        if self.backend is None or content_type not in CACHEABLE_CONTENT_TYPES:
+            return None
+
+        response = self.backend.get((meter_id, content_type))
+        if response is None:
+            return None
+
+        return {**response, "headers": dict(response["headers"])}
+
+    def set(
+        self,
+        meter_id: int,
+        content_type: str,
+        response: APIGatewayProxyResponseV2,
+    ):
+        """
+        Cache the response for a meter.
+
+        :param meter_id: The ID of the meter.
+        :param content_type: The content type of the representation.
+        :param response: The response to cache.
+        """
+        if self.backend is None or content_type not in CACHEABLE_CONTENT_TYPES:
+            return
+
+        self.backend.set(
+            (meter_id, content_type),
+            {**response, "headers": dict(response["headers"])},
+        )
+
+    def invalidate(self, meter_ids: Iterable[int]):
+        """
+        Drop every cached representation of the given meters.
+
+        :param meter_ids: The IDs of the meters that were written.
+        """
+        if self.backend is None:
+            return
+
+        for meter_id in meter_ids:
+            for content_type in CACHEABLE_CONTENT_TYPES:
+                self.backend.delete((meter_id, content_type))
+
+    def clear(self):
+        """Drop every cached response."""
+        if self.backend is not None:
+            self.backend.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """The hit, miss and eviction counters of the backend."""
+        if self.backend is None:
+            return {"hits": 0, "misses": 0, "evictions": 0}
+
+        return self.backend.stats.as_dict()
+
+
+def _meter_cache_backend() -> Optional[CacheBackend]:
+    """
+    Build the meter cache backend from the environment.
+
+    ``METR_METER_CACHE_SIZE`` enables the cache with that many entries, and
+    ``METR_METER_CACHE_TTL`` bounds how stale, in seconds, an entry may get
+    through writes made by other containers.
+    """
+    maxsize = int(os.environ.get("METR_METER_CACHE_SIZE") or 0)
+    if not maxsize:
+        return None
+
+    ttl = os.environ.get("METR_METER_CACHE_TTL")
+    return LRUCacheBackend(maxsize=maxsize, ttl=float(ttl) if ttl else None)
+
+
+count_cache = CountCache()
+statement_cache = StatementCache()
+meter_cache = MeterCache(_meter_cache_backend())
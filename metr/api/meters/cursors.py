@@ -0,0 +1,107 @@
+"""Opaque keyset cursors for paginating meters."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from metr.core.exceptions import BadRequestException
+from metr.database.models import METER_FIELDS, Meter
+
+
+def parse_order_by(order_by: Optional[str]) -> Tuple[str, bool]:
+    """
+    Resolve an ``order_by`` parameter to a Meter column name and direction.
+
+    Accepts the same ``field`` / ``-field`` syntax as ``sort_query``.
+
+    :param order_by: The field to order by, prefixed with "-" for descending.
+    :return: A tuple of the column name and whether it is descending.
+    """
+    if not order_by:
+        return "meter_id", False
+
+    descending = order_by.startswith("-")
+    column_name = order_by.lstrip("-")
+    if column_name not in METER_FIELDS:
+        raise BadRequestException(f"Cannot order by unknown field: {column_name}")
+
+    return column_name, descending
+
+
+def encode_cursor(order_by: Optional[str], sort_value: Any, meter_id: int) -> str:
+    """
+    Encode the position after a row into an opaque cursor.
+
+    :param order_by: The order_by parameter the page was fetched with.
+    :param sort_value: The value of the sort column on the last row.
+    :param meter_id: The ID of the last row, used as a tie-breaker.
+    :return: A URL-safe cursor string.
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+
+    payload = json.dumps([order_by or "", sort_value, meter_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Optional[str]) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    :param cursor: The cursor string.
+    :param order_by: The order_by parameter of the current request.
+    :return: A tuple of the last sort value and the last meter ID.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order_by, sort_value, meter_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequestException("Invalid cursor.")
+
+    if cursor_order_by != (order_by or ""):
+        raise BadRequestException("Cursor does not match the requested order_by.")
+
+    column_name, _ = parse_order_by(order_by)
+    column_type = Meter.__table__.columns[column_name].type.python_type
+    if sort_value is not None and column_type is datetime:
+        try:
+            sort_value = datetime.fromisoformat(sort_value)
+        except (TypeError, ValueError):
+            raise BadRequestException("Invalid cursor.")
+
+    return sort_value, int(meter_id)
+
+
+def encode_change_cursor(change_version: int, meter_id: int, deleted: bool) -> str:
+    """
+    Encode the position after a change of the change feed into a cursor.
+
+    :param change_version: The collection version of the last change.
+    :param meter_id: The ID of the meter of the last change.
+    :param deleted: Whether the last change was a deletion.
+    :return: A URL-safe cursor string.
+    """
+    payload = json.dumps([change_version, meter_id, deleted], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, int, bool]:
+    """
+    Decode a cursor produced by :func:`encode_change_cursor`.
+
+    :param cursor: The cursor string.
+    :return: A tuple of the change version, meter ID and deletion flag of the
+        last change.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        change_version, meter_id, deleted = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        return int(change_version), int(meter_id), bool(deleted)
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequestException("Invalid cursor.")
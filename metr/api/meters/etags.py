@@ -0,0 +1,80 @@
+"""Entity tags for conditional requests on meters."""
+
+import hashlib
+from typing import Dict, Optional, Tuple
+
+from metr.core.compression import identity_etag
+
+# Short, stable tags for the representations a meter can be served in.
+_FORMATS = {"application/json": "json", "application/xml": "xml", "text/csv": "csv"}
+
+
+def _format_tag(content_type: str) -> str:
+    return _FORMATS.get(content_type, content_type.replace('"', ""))
+
+
+def meter_etag(meter_id: int, version: int, content_type: str) -> str:
+    """
+    Build the strong ETag of a single meter representation.
+
+    :param meter_id: The ID of the meter.
+    :param version: The row version of the meter.
+    :param content_type: The content type of the representation.
+    :return: The quoted ETag.
+    """
+    return f'"{meter_id}.{version}.{_format_tag(content_type)}"'
+
+
+def collection_etag(
+    version: int, query_params: Dict[str, str], content_type: str
+) -> str:
+    """
+    Build the strong ETag of a meter list representation.
+
+    :param version: The version counter of the meter table.
+    :param query_params: The query parameters selecting the page.
+    :param content_type: The content type of the representation.
+    :return: The quoted ETag.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(query_params.items()))
+    digest = hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+    return f'"c{version}.{digest}.{_format_tag(content_type)}"'
+
+
+def parse_meter_etag(etag: str) -> Optional[Tuple[int, int]]:
+    """
+    Extract the meter ID and version from a meter ETag.
+
+    :param etag: The quoted ETag, as sent in an If-Match header.
+    :return: A tuple of meter ID and version, or None if it is not a meter ETag.
+    """
+    try:
+        meter_id, version, _ = etag.strip().strip('"').split(".", 2)
+        return int(meter_id), int(version)
+    except ValueError:
+        return None
+
+
+def etag_match(header: Optional[str], etag: str) -> Optional[str]:
+    """
+    Find the ETag an If-None-Match style header lists for a representation.
+
+    Weak validators are compared by their opaque tag, as RFC 9110 prescribes
+    for If-None-Match. The ETags of compressed representations match the
+    identity ETag they derive from.
+
+    :param header: The header value, a list of ETags or "*".
+    :param etag: The current ETag of the identity representation.
+    :return: The matching ETag as listed, or None if none matches.
+    """
+    if not header:
+        return None
+
+    for candidate in header.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == "*":
+            return etag
+        if identity_etag(candidate) == etag:
+            return candidate
+
+    return None
@@ -0,0 +1,210 @@
+"""
+Meter filters given as ``field__op=value`` query parameters.
+
+Filters are parsed into a dictionary of typed values keyed by ``field__op``.
+Their SQL criteria only depend on the filter shape, the keys and the
+``is_null`` flags, and take the values through bound parameters, so the
+statements built from them can be cached and reused across requests.
+"""
+
+import sys
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import and_, bindparam, or_
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.elements import BindParameter
+
+from metr.core.exceptions import BadRequestException
+from metr.database.models import METER_FIELDS, Meter
+
+# Operators of the filter grammar, building a criterion from a bound value.
+OPERATORS: Dict[str, Callable[[ColumnElement, BindParameter], ColumnElement]] = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "in": lambda column, value: column.in_(value),
+    # A range on the column rather than LIKE, which ignores case in SQLite and
+    # cannot use the index. The upper bound is bound as ``{key}__end``.
+    "prefix": lambda column, value: and_(
+        column >= value,
+        column < bindparam(f"{value.key}__end", type_=column.type),
+    ),
+}
+# ``is_null`` is part of the shape: its value picks IS NULL or IS NOT NULL.
+IS_NULL = "is_null"
+# The supply dates filtered without an operator keep their historical meaning.
+DEFAULT_OPERATORS = {"supply_start_date": "gte", "supply_end_date": "gte"}
+# The day a supply window must overlap, open-ended without a supply end date.
+ACTIVE_ON = "active_on"
+
+FilterShape = Tuple[Tuple[str, Any], ...]
+
+_MAX_CHAR = chr(sys.maxunicode)
+
+_ADAPTERS: Dict[Any, TypeAdapter] = {}
+
+
+def _adapter(python_type: Any) -> TypeAdapter:
+    """Return a (shared) pydantic adapter coercing strings to a type."""
+    if python_type not in _ADAPTERS:
+        _ADAPTERS[python_type] = TypeAdapter(python_type)
+
+    return _ADAPTERS[python_type]
+
+
+def split_filter(key: str) -> Tuple[str, str]:
+    """
+    Split a filter name into its field and operator.
+
+    :param key: The filter name, ``field`` or ``field__op``.
+    :return: A tuple of the field and the operator.
+    """
+    field, _, op = key.partition("__")
+    if field == ACTIVE_ON and op in ("", "eq"):
+        return field, "eq"
+    if field not in METER_FIELDS or (op and op not in OPERATORS and op != IS_NULL):
+        raise BadRequestException(f"Unknown filter: {key}")
+    if op == "prefix" and Meter.__table__.columns[field].type.python_type is not str:
+        raise BadRequestException(f"Prefix filters only apply to text: {key}")
+
+    return field, op or DEFAULT_OPERATORS.get(field, "eq")
+
+
+def _prefix_end(prefix: str) -> str:
+    """
+    Return the smallest string after every string starting with a prefix.
+
+    SQLite compares text by its UTF-8 bytes, in code point order, so this is the
+    prefix with its last character incremented.
+
+    :param prefix: A prefix with a character other than U+10FFFF.
+    :return: The exclusive upper bound of the strings starting with the prefix.
+    """
+    prefix = prefix.rstrip(_MAX_CHAR)
+    end = ord(prefix[-1]) + 1
+    if 0xD800 <= end <= 0xDFFF:
+        # Surrogates are not characters and cannot be encoded.
+        end = 0xE000
+
+    return prefix[:-1] + chr(end)
+
+
+def parse_filters(params: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    Parse query parameters into typed filters.
+
+    ``in`` takes a comma separated list of values, ``is_null`` a boolean and
+    ``prefix``, on text fields only, the non-empty start of a string.
+
+    :param params: The filtering query parameters.
+    :return: The filter values, keyed by ``field__op``.
+    """
+    filters = {}
+    for key, raw_value in params.items():
+        field, op = split_filter(key)
+        python_type: Any
+        if field == ACTIVE_ON:
+            python_type = date
+        elif op == IS_NULL:
+            python_type = bool
+        else:
+            python_type = Meter.__table__.columns[field].type.python_type
+
+        try:
+            if op == "in":
+                value = tuple(
+                    _adapter(python_type).validate_strings(item)
+                    for item in raw_value.split(",")
+                )
+            else:
+                value = _adapter(python_type).validate_strings(raw_value)
+        except ValidationError:
+            raise BadRequestException(f"Invalid value for filter: {key}")
+        if op == "prefix" and not raw_value.rstrip(_MAX_CHAR):
+            raise BadRequestException(f"Invalid value for filter: {key}")
+
+        filters[f"{field}__{op}"] = value
+
+    return filters
+
+
+def filter_shape(filters: Mapping[str, Any]) -> FilterShape:
+    """
+    Return the part of the filters that SQL statements depend on.
+
+    :param filters: The filter values, keyed by ``field`` or ``field__op``.
+    :return: A hashable shape, equal for filters differing only in values.
+    """
+    shape = []
+    for key, value in filters.items():
+        field, op = split_filter(key)
+        shape.append((f"{field}__{op}", bool(value) if op == IS_NULL else None))
+
+    return tuple(sorted(shape))
+
+
+def filter_criteria(shape: FilterShape) -> List[ColumnElement]:
+    """
+    Build the WHERE criteria for a filter shape, with values left unbound.
+
+    :param shape: The shape returned by :func:`filter_shape`.
+    :return: A list of criteria taking the values of :func:`filter_values`.
+    """
+    criteria = []
+    for key, is_null in shape:
+        field, op = split_filter(key)
+        if field == ACTIVE_ON:
+            day_end: BindParameter[datetime] = bindparam(
+                f"{key}__end", type_=Meter.supply_start_date.type
+            )
+            day_start: BindParameter[datetime] = bindparam(
+                key, type_=Meter.supply_end_date.type
+            )
+            criteria.append(Meter.supply_start_date < day_end)
+            criteria.append(
+                or_(Meter.supply_end_date.is_(None), Meter.supply_end_date > day_start)
+            )
+            continue
+
+        column = Meter.__table__.columns[field]
+        if op == IS_NULL:
+            criteria.append(column.is_(None) if is_null else column.is_not(None))
+            continue
+
+        value: BindParameter[Any] = bindparam(
+            key, type_=column.type, expanding=op == "in"
+        )
+        criteria.append(OPERATORS[op](column, value))
+
+    return criteria
+
+
+def filter_values(filters: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Return the bound parameter values for the criteria of some filters.
+
+    :param filters: The filter values, keyed by ``field`` or ``field__op``.
+    :return: The parameters to execute :func:`filter_criteria` statements with.
+    """
+    values: Dict[str, Any] = {}
+    for key, value in filters.items():
+        field, op = split_filter(key)
+        key = f"{field}__{op}"
+        if field == ACTIVE_ON:
+            day_start = datetime.combine(value, time.min)
+            values[key] = day_start
+            values[f"{key}__end"] = day_start + timedelta(days=1)
+        elif op == "prefix":
+            values[key] = value
+            values[f"{key}__end"] = _prefix_end(value)
+        elif op == "in":
+            values[key] = list(value)
+        elif op != IS_NULL:
+            values[key] = value
+
+    return values
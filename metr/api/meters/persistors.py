@@ -1,167 +1,742 @@
 """Meter persisting operations."""
 
-from datetime import datetime
-from typing import Dict, List, Optional, Union
-
-from sqlalchemy import func
-from sqlalchemy_utils.functions import sort_query
-
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    Row,
+    Select,
+    and_,
+    bindparam,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.elements import BindParameter
+
+from metr.api.meters.caches import count_cache, meter_cache, statement_cache
+from metr.api.meters.cursors import decode_cursor, parse_order_by
+from metr.api.meters.filters import (
+    FilterShape,
+    filter_criteria,
+    filter_shape,
+    filter_values,
+)
 from metr.core.base import BasePersistor
-from metr.database.models import Meter
+from metr.core.exceptions import BadRequestException
+from metr.database.models import (
+    METER_FIELDS,
+    Meter,
+    MeterSummary,
+    MeterTombstone,
+    TableVersion,
+    next_table_version,
+    utcnow,
+)
+
+METER_COLUMNS = tuple(Meter.__table__.columns[name] for name in METER_FIELDS)
+UPSERT_COLUMNS = (
+    "supply_start_date",
+    "supply_end_date",
+    "enabled",
+    "annual_quantity",
+)
+# Dimensions meter stats can be grouped by, and the aggregates computed per group.
+STATS_GROUPS: Dict[str, Union[InstrumentedAttribute[Any], ColumnElement[Any]]] = {
+    "enabled": Meter.enabled,
+    "supply_start_year": cast(func.strftime("%Y", Meter.supply_start_date), Integer),
+    "supply_start_month": func.strftime("%Y-%m", Meter.supply_start_date),
+    "has_supply_end_date": Meter.supply_end_date.is_not(None),
+}
+STATS_AGGREGATES = ("count", "sum", "avg", "min", "max")
+# The fields of a change feed entry: the meter, when and whether it was deleted.
+CHANGE_FIELDS = (*METER_FIELDS, "changed_at", "change_version", "deleted")
+# The count of every meter, read from the summary rather than the meter table.
+SUMMARY_COUNT = select(func.coalesce(func.sum(MeterSummary.meter_count), 0))
+
+
+def _count_statement(shape: FilterShape) -> Select:
+    """
+    Build the statement counting the meters of a filter shape.
+
+    :param shape: The shape returned by :func:`filter_shape`.
+    :return: The statement, served from the summary table when unfiltered.
+    """
+    if not shape:
+        return SUMMARY_COUNT
+
+    return select(func.count(Meter.meter_id)).where(*filter_criteria(shape))
+
+
+def _constraint_error(error: IntegrityError) -> BadRequestException:
+    """
+    Translate a constraint violation on the meter table to a client error.
+
+    :param error: The error raised by the database.
+    :return: The exception to raise instead.
+    """
+    message = str(error.orig)
+    if "external_reference" in message:
+        if "UNIQUE" in message:
+            return BadRequestException(
+                "Meter with this external reference already exists."
+            )
+        return BadRequestException("Meter external reference required.")
+
+    return BadRequestException(f"Meter violates a database constraint: {message}")
+
+
+def _keyset_criterion(column_name: str, descending: bool, null: bool) -> ColumnElement:
+    """
+    Build the WHERE criterion selecting rows after a keyset position.
+
+    SQLite sorts NULLs first in ascending order and last in descending order,
+    so a NULL sort value has to be handled on its own side of the boundary.
+    The position is bound through the ``cursor_value`` and ``cursor_meter_id``
+    parameters.
+
+    :param column_name: The column the results are ordered by.
+    :param descending: Whether the results are ordered descending.
+    :param null: Whether the sort column value of the last row seen is NULL.
+    :return: The criterion to filter the next page with.
+    """
+    column = getattr(Meter, column_name)
+    meter_id: BindParameter[int] = bindparam(
+        "cursor_meter_id", type_=Meter.meter_id.type
+    )
+    if column_name == "meter_id":
+        return column < meter_id if descending else column > meter_id
+
+    tie_breaker = Meter.meter_id < meter_id if descending else Meter.meter_id > meter_id
+    if null:
+        same_key = and_(column.is_(None), tie_breaker)
+        return same_key if descending else or_(column.is_not(None), same_key)
+
+    value: BindParameter[Any] = bindparam("cursor_value", type_=column.type)
+    same_key = and_(column == value, tie_breaker)
+    if descending:
+        return or_(column < value, column.is_(None), same_key)
+    return or_(column > value, same_key)
 
 
 class MeterPersistor(BasePersistor):
-    """Persisting operations for meters."""
+    """
+    Persisting operations for meters.
+
+    Read-only queries run in ``read_session``, which may be on a replica.
+    """
 
-    def does_external_reference_exist(self, external_reference: str) -> bool:
+    def add_meter(self, meter_data: Dict[str, Any]) -> Row:
         """
-        Check to see if there is a Meter with a given external reference.
+        Add a new Meter to the database in a single INSERT.
 
-        :param external_reference: The external reference
-        :return: True if the external reference already exists.
+        Duplicate external references are caught by the unique index rather
+        than looked up beforehand.
+
+        :param meter_data: The column values of the meter, without its ID.
+        :return: The new meter row, holding ``METER_FIELDS`` and the version.
         """
-        return (
-            self.session.query(Meter)
-            .filter(Meter.external_reference == external_reference)
-            .scalar()
-            is not None
+        statement = (
+            insert(Meter).values(**meter_data).returning(*METER_COLUMNS, Meter.version)
         )
+        try:
+            meter = self.session.execute(statement).one()
+        except IntegrityError as e:
+            self.rollback()
+            raise _constraint_error(e)
+        self.bump_collection_version()
+        self.commit()
+        count_cache.clear()
+        meter_cache.invalidate([meter.meter_id])
 
-    def add_meter(self, meter: Meter):
+        return meter
+
+    def get_existing_external_references(
+        self, external_references: Iterable[str], chunk_size: int = 500
+    ) -> Set[str]:
         """
-        Add a new Meter to the database.
+        Find which of the given external references are already in use.
 
-        :param meter: The Meter object to add
+        :param external_references: The external references to look up.
+        :param chunk_size: The number of references to look up per query.
+        :return: The subset of external references that already exist.
         """
-        self.session.add(meter)
-        self.commit()
+        references = list(external_references)
+        existing: Set[str] = set()
+        for start in range(0, len(references), chunk_size):
+            chunk = references[start : start + chunk_size]
+            existing.update(
+                self.session.scalars(
+                    select(Meter.external_reference).where(
+                        Meter.external_reference.in_(chunk)
+                    )
+                )
+            )
+
+        return existing
+
+    def add_meters(
+        self, meters: List[Dict[str, Any]], chunk_size: int = 500
+    ) -> List[int]:
+        """
+        Insert many meters in a single transaction.
+
+        Meters are inserted with one multi-row INSERT per chunk. SQLite does
+        not guarantee the order of RETURNING rows, so new IDs are matched back
+        by external reference, which must be unique within the batch.
+
+        :param meters: The column values of the meters to add.
+        :param chunk_size: The number of meters to insert per statement.
+        :return: The IDs of the new meters, in the order given.
+        """
+        meter_ids: Dict[str, int] = {}
+        try:
+            for start in range(0, len(meters), chunk_size):
+                statement = (
+                    insert(Meter)
+                    .values(meters[start : start + chunk_size])
+                    .returning(Meter.external_reference, Meter.meter_id)
+                )
+                meter_ids.update(self.session.execute(statement).tuples().all())
+            self.bump_collection_version()
+            self.commit()
+        except IntegrityError as e:
+            self.rollback()
+            raise _constraint_error(e)
+        except Exception:
+            self.rollback()
+            raise
+        count_cache.clear()
+        meter_cache.invalidate(meter_ids.values())
+
+        return [meter_ids[meter["external_reference"]] for meter in meters]
+
+    def upsert_meters(
+        self, meters: List[Dict[str, Any]], chunk_size: int = 500
+    ) -> Tuple[List[Row], Set[str]]:
+        """
+        Insert or update meters by external reference in a single transaction.
+
+        Each chunk is one ``INSERT ... ON CONFLICT (external_reference) DO
+        UPDATE ... WHERE ... RETURNING`` statement. Meters whose columns are
+        all unchanged are not written, so replaying a sync bumps no versions
+        and adds nothing to the change feed; they are selected instead.
+
+        :param meters: The column values of the meters, without meter IDs.
+        :param chunk_size: The number of meters to upsert per statement.
+        :return: The resulting meter rows, one per distinct external reference
+            in the order given, and the external references of the meters
+            created.
+        """
+        upserted: Dict[str, Row] = {}
+        created: Set[str] = set()
+        try:
+            for start in range(0, len(meters), chunk_size):
+                insert_statement = sqlite_insert(Meter).values(
+                    meters[start : start + chunk_size]
+                )
+                excluded = insert_statement.excluded
+                statement = insert_statement.on_conflict_do_update(
+                    index_elements=[Meter.external_reference],
+                    set_={
+                        **{column: excluded[column] for column in UPSERT_COLUMNS},
+                        "version": Meter.version + 1,
+                        "updated_at": utcnow(),
+                        "change_version": next_table_version(Meter.__tablename__),
+                    },
+                    where=or_(
+                        *[
+                            getattr(Meter, column).is_distinct_from(excluded[column])
+                            for column in UPSERT_COLUMNS
+                        ]
+                    ),
+                ).returning(*METER_COLUMNS, Meter.version)
+                for row in self.session.execute(statement):
+                    upserted[row.external_reference] = row
+                    # Updates bump the version, so only new rows are at 1.
+                    if row.version == 1:
+                        created.add(row.external_reference)
+            written = list(upserted.values())
+            unchanged = [
+                reference
+                for reference in dict.fromkeys(m["external_reference"] for m in meters)
+                if reference not in upserted
+            ]
+            for start in range(0, len(unchanged), chunk_size):
+                query = select(*METER_COLUMNS).where(
+                    Meter.external_reference.in_(unchanged[start : start + chunk_size])
+                )
+                for row in self.session.execute(query):
+                    upserted[row.external_reference] = row
+            if written:
+                self.bump_collection_version()
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
+        if written:
+            count_cache.clear()
+            meter_cache.invalidate(row.meter_id for row in written)
+
+        rows = [
+            upserted[reference]
+            for reference in dict.fromkeys(m["external_reference"] for m in meters)
+        ]
+        return rows, created
 
     def get_meters(
         self,
-        meter_id: Optional[int] = None,
-        external_reference: Optional[str] = None,
-        supply_start_date: Optional[datetime] = None,
-        supply_end_date: Optional[datetime] = None,
-        enabled: Optional[bool] = None,
-        annual_quantity: Optional[float] = None,
         order_by: Optional[str] = None,
         page: Optional[str] = "1",
         page_size: Optional[str] = "20",
-    ) -> List[Dict[str, Union[str, int, float, bool, datetime]]]:
+        cursor: Optional[str] = None,
+        fields: Sequence[str] = METER_FIELDS,
+        with_total: bool = False,
+        **filters: Any,
+    ) -> Tuple[Sequence[Sequence[Any]], Optional[int]]:
         """
         Get meters based on given criteria.
 
-        :param meter_id: The ID of the meter.
-        :param external_reference: Unique identifier used by the integrators system.
-        :param supply_start_date: The date this meter started or will start providing data.
-        :param supply_end_date: The date this meter stopped or will stop providing data.
-        :param enabled: True if the meter is currently active.
-        :param annual_quantity: Best guess or average annual quantity this meter measured or will measure.
+        Meters are selected as plain column tuples rather than ORM objects, to
+        be handed straight to a serializer. The statement is built once per
+        shape of the request and kept in the statement cache; the filter
+        values, cursor position and page bounds are bound on execution.
+
         :param order_by: The field to order the query results by.
         :param page: The page number of results to show.
         :param page_size: The number of objects per page.
+        :param cursor: An opaque cursor to continue after, replacing ``page``.
+        :param fields: The fields to select, in order.
+        :param with_total: Also return the total count of meters matching the
+            filters, computed by a subquery in the same statement.
+        :param filters: The filter values, as returned by :func:`parse_filters`.
+
+        :return: A list of meter rows holding ``fields``, with one extra row
+            when a further page exists, and the total count if requested.
+        """
+        column_name, descending = parse_order_by(order_by)
+        params = filter_values(filters)
+        paging = None
+        if cursor:
+            sort_value, params["cursor_meter_id"] = decode_cursor(cursor, order_by)
+            paging = "cursor_null" if sort_value is None else "cursor"
+            if sort_value is not None:
+                params["cursor_value"] = sort_value
+        elif page and page_size:
+            params["offset"] = (int(page) - 1) * int(page_size)
+            paging = "offset"
+        if page_size:
+            params["limit"] = int(page_size) + 1
+
+        shape = filter_shape(filters)
+        key = (
+            "list",
+            shape,
+            tuple(fields),
+            column_name,
+            descending,
+            paging,
+            "limit" in params,
+            with_total,
+        )
 
-        :return: A list of meter objects.
+        def build():
+            criteria = filter_criteria(shape)
+            columns = [Meter.__table__.columns[name] for name in fields]
+            if with_total:
+                total = _count_statement(shape)
+                columns.append(total.scalar_subquery().label("total"))
+            statement = select(*columns).where(*criteria)
+
+            order_columns = [getattr(Meter, column_name)]
+            if column_name != "meter_id":
+                order_columns.append(Meter.meter_id)
+            statement = statement.order_by(
+                *[col.desc() if descending else col.asc() for col in order_columns]
+            )
+            if paging in ("cursor", "cursor_null"):
+                statement = statement.where(
+                    _keyset_criterion(column_name, descending, paging == "cursor_null")
+                )
+            elif paging == "offset":
+                statement = statement.offset(bindparam("offset"))
+            if "limit" in params:
+                statement = statement.limit(bindparam("limit"))
+
+            return statement
+
+        statement = statement_cache.get(key, build)
+        rows = self.read_session.execute(statement, params).all()
+        if not with_total:
+            return rows, None
+
+        if not rows:
+            # Past the last row there is nothing to carry the total.
+            return [], self.count_meters(**filters)
+
+        return [row[:-1] for row in rows], rows[0].total
+
+    def count_meters(self, **filters: Any) -> int:
         """
-        query = self.session.query(Meter)
+        Count meters based on given criteria.
 
-        if meter_id is not None:
-            query = query.filter(Meter.meter_id == meter_id)
+        :param filters: The filter values, as returned by :func:`parse_filters`.
 
-        if external_reference is not None:
-            query = query.filter(Meter.external_reference == external_reference)
+        :return: Total count of the Meter objects based on data provided.
+        """
+        shape = filter_shape(filters)
+        statement = statement_cache.get(
+            ("count", shape), lambda: _count_statement(shape)
+        )
 
-        if enabled is not None:
-            query = query.filter(Meter.enabled == enabled)
+        return self.read_session.scalar(statement, filter_values(filters))
 
-        if supply_start_date is not None:
-            query = query.filter(Meter.supply_start_date >= supply_start_date)
+    def estimate_meters_count(self, **filters: Any) -> int:
+        """
+        Count meters based on given criteria, served from the count cache.
 
-        if supply_end_date is not None:
-            query = query.filter(Meter.supply_end_date >= Meter.supply_end_date)
+        Cached counts are dropped on every write made through this container,
+        but writes from other containers are not seen until then, so the
+        result is an estimate.
 
-        if annual_quantity is not None:
-            query = query.filter(Meter.annual_quantity == annual_quantity)
+        :param filters: The same filters as accepted by :meth:`count_meters`.
 
-        if order_by is not None:
-            query = sort_query(query, order_by)
+        :return: The (possibly cached) count of matching meters.
+        """
+        count = count_cache.get(filters)
+        if count is None:
+            count = self.count_meters(**filters)
+            count_cache.set(filters, count)
+
+        return count
 
-        if page and page_size:
-            query = query.offset((int(page) - 1) * int(page_size)).limit(int(page_size))
+    def get_meter_stats(
+        self, group_by: Sequence[str] = (), **filters: Any
+    ) -> Sequence[Row]:
+        """
+        Aggregate the annual quantity of meters based on given criteria.
 
-        return query.all()
+        :param group_by: The names of the ``STATS_GROUPS`` to group meters by.
+        :param filters: The filter values, as returned by :func:`parse_filters`.
 
-    def count_meters(
+        :return: A row per group, holding the group values followed by the
+            ``STATS_AGGREGATES`` of its annual quantities, ordered by group.
+        """
+        shape = filter_shape(filters)
+
+        def build():
+            groups = [STATS_GROUPS[name].label(name) for name in group_by]
+            quantity = Meter.annual_quantity
+            return (
+                select(
+                    *groups,
+                    func.count(Meter.meter_id).label("count"),
+                    func.sum(quantity).label("sum"),
+                    func.avg(quantity).label("avg"),
+                    func.min(quantity).label("min"),
+                    func.max(quantity).label("max"),
+                )
+                .where(*filter_criteria(shape))
+                .group_by(*groups)
+                .order_by(*groups)
+            )
+
+        statement = statement_cache.get(("stats", shape, tuple(group_by)), build)
+
+        return self.read_session.execute(statement, filter_values(filters)).all()
+
+    def get_changes(
         self,
-        meter_id: Optional[int] = None,
-        external_reference: Optional[str] = None,
-        supply_start_date: Optional[datetime] = None,
-        supply_end_date: Optional[datetime] = None,
-        enabled: Optional[bool] = None,
-        annual_quantity: Optional[float] = None,
-    ) -> int:
+        since: int,
+        after: Optional[Tuple[int, int, bool]] = None,
+        limit: int = 100,
+    ) -> Sequence[Row]:
         """
-        Count meters based on given criteria.
+        Get the meters created, updated or deleted since a watermark.
+
+        Changes are ordered by the collection version their write committed,
+        which every meter and tombstone is stamped with. Unlike clock times,
+        versions increase in commit order, so a write committed after a sync
+        always sorts after its watermark. Live meters and tombstones are both
+        found through an index on that version, so the cost follows the number
+        of changes rather than the number of meters.
+
+        :param since: The watermark, the collection version up to which every
+            change has been seen. Ignored when ``after`` is given.
+        :param after: The change version, meter ID and deletion flag of the
+            last change seen, to continue after.
+        :param limit: The maximum number of changes to return.
+        :return: Rows holding ``CHANGE_FIELDS``, oldest change first. Deleted
+            meters only hold their ID and external reference.
+        """
+        params: Dict[str, Any] = {"since": since, "limit": limit}
+        if after is not None:
+            params["since"], params["after_meter_id"], params["after_deleted"] = after
+
+        def build():
+            watermark = bindparam("since", type_=Integer)
+            meters = select(
+                *METER_COLUMNS,
+                Meter.updated_at.label("changed_at"),
+                Meter.change_version,
+                literal(False, Boolean).label("deleted"),
+            ).where(
+                Meter.change_version >= watermark
+                if after
+                else Meter.change_version > watermark
+            )
+            tombstones = select(
+                MeterTombstone.meter_id,
+                MeterTombstone.external_reference,
+                *[null() for _ in METER_FIELDS[2:]],
+                MeterTombstone.deleted_at,
+                MeterTombstone.change_version,
+                literal(True, Boolean),
+            ).where(
+                MeterTombstone.change_version >= watermark
+                if after
+                else MeterTombstone.change_version > watermark
+            )
+            changes = union_all(meters, tombstones).subquery()
+            position = (
+                changes.c.change_version,
+                changes.c.meter_id,
+                changes.c.deleted,
+            )
+            statement = select(changes).order_by(*position).limit(bindparam("limit"))
+            if after:
+                statement = statement.where(
+                    tuple_(*position)
+                    > tuple_(
+                        watermark,
+                        bindparam("after_meter_id", type_=Integer),
+                        bindparam("after_deleted", type_=Boolean),
+                    )
+                )
+
+            return statement
+
+        statement = statement_cache.get(("changes", after is not None), build)
+
+        return self.read_session.execute(statement, params).all()
+
+    def iter_meters(
+        self,
+        chunk_size: int = 1000,
+        fields: Sequence[str] = METER_FIELDS,
+        **filters: Any,
+    ) -> Iterator[Sequence[Row]]:
+        """
+        Stream meter rows based on given criteria, in chunks.
 
-        :param meter_id: The ID of the meter.
-        :param external_reference: Unique identifier used by the integrators system.
-        :param supply_start_date: The date this meter started or will start providing data.
-        :param supply_end_date: The date this meter stopped or will stop providing data.
-        :param enabled: True if the meter is currently active.
-        :param annual_quantity: Best guess or average annual quantity this meter measured or will measure.
+        Rows are plain column tuples fetched through a streaming cursor, so
+        only one chunk is held in memory at a time.
 
-        :return: Total count of the Meter objects based on data provided.
+        :param chunk_size: The number of rows to fetch per chunk.
+        :param fields: The fields to select, in order.
+        :param filters: The filter values, as returned by :func:`parse_filters`.
+
+        :return: An iterator of row chunks.
         """
-        query = self.session.query(func.count(Meter.meter_id))
+        statement = (
+            select(*[Meter.__table__.columns[name] for name in fields])
+            .where(*filter_criteria(filter_shape(filters)))
+            .order_by(Meter.meter_id)
+            .execution_options(yield_per=chunk_size)
+        )
 
-        if meter_id is not None:
-            query = query.filter(Meter.meter_id == meter_id)
+        yield from self.read_session.execute(
+            statement, filter_values(filters)
+        ).partitions()
 
-        if external_reference is not None:
-            query = query.filter(Meter.external_reference == external_reference)
+    def get_meter(self, meter_id: int, primary: bool = False) -> Optional[Meter]:
+        """
+        Get a Meter object by it's ID.
 
-        if enabled is not None:
-            query = query.filter(Meter.enabled == enabled)
+        :param meter_id: The ID of the Meter
+        :param primary: Read from the primary database rather than
+            ``read_session``, for results that outlive the request.
 
-        if supply_start_date is not None:
-            query = query.filter(Meter.supply_start_date >= supply_start_date)
+        :return: The Meter object, or None if it does not exist.
+        """
+        session = self.session if primary else self.read_session
+        query = session.query(Meter).filter_by(meter_id=meter_id)
 
-        if supply_end_date is not None:
-            query = query.filter(Meter.supply_end_date >= Meter.supply_end_date)
+        return query.first()
 
-        if annual_quantity is not None:
-            query = query.filter(Meter.annual_quantity == annual_quantity)
+    def get_meter_version(self, meter_id: int) -> Optional[int]:
+        """
+        Get the row version of a Meter without loading the rest of it.
 
-        return query.scalar()
+        :param meter_id: The ID of the Meter
 
-    def get_meter(self, meter_id: int) -> Meter:
+        :return: The version, or None if the Meter does not exist.
         """
-        Get a Meter object by it's ID.
+        return self.read_session.scalar(
+            select(Meter.version).where(Meter.meter_id == meter_id)
+        )
 
-        :param meter_id: The ID of the Meter
+    def get_collection_version(self) -> int:
+        """
+        Get the version counter of the meter table, bumped by every write.
 
-        :return: The Meter object.
+        :return: The version of the meter collection.
         """
-        query = self.session.query(Meter).filter_by(meter_id=meter_id)
+        version = self.read_session.scalar(
+            select(TableVersion.version).where(
+                TableVersion.table_name == Meter.__tablename__
+            )
+        )
 
-        return query.first()
+        return version or 0
 
-    def update_meter(self, meter: Meter):
+    def bump_collection_version(self):
+        """Bump the version counter of the meter table in the current transaction."""
+        statement = sqlite_insert(TableVersion).values(
+            table_name=Meter.__tablename__, version=1
+        )
+        self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[TableVersion.table_name],
+                set_={"version": TableVersion.version + 1},
+            )
+        )
+
+    def update_meter(
+        self,
+        meter_id: int,
+        meter_data: Dict[str, Any],
+        versions: Optional[Sequence[int]] = None,
+    ) -> Optional[Row]:
         """
-        Update a Meter object.
+        Update a Meter in a single UPDATE, bumping its version.
 
-        :param meter: The Meter object to update.
+        :param meter_id: The ID of the meter.
+        :param meter_data: The column values to set.
+        :param versions: Only update the meter if it is at one of these versions.
+        :return: The updated meter row, holding ``METER_FIELDS`` and the
+            version, or None if no meter matched.
         """
+        statement = (
+            update(Meter)
+            .where(Meter.meter_id == meter_id)
+            .values(**meter_data, version=Meter.version + 1)
+            .returning(*METER_COLUMNS, Meter.version)
+            .execution_options(synchronize_session=False)
+        )
+        if versions is not None:
+            statement = statement.where(Meter.version.in_(versions))
+        try:
+            meter = self.session.execute(statement).one_or_none()
+        except IntegrityError as e:
+            self.rollback()
+            raise _constraint_error(e)
+        if meter is None:
+            self.rollback()
+            return None
+
+        self.bump_collection_version()
         self.commit()
-        self.session.refresh(meter)
+        count_cache.clear()
+        meter_cache.invalidate([meter_id])
+
+        return meter
+
+    def update_meters(self, meter_data: Dict[str, Any], **filters: Any) -> List[int]:
+        """
+        Update every Meter matching the filters in a single UPDATE.
+
+        :param meter_data: The column values to set.
+        :param filters: The filter values, as returned by :func:`parse_filters`.
+        :return: The IDs of the updated meters.
+        """
+        statement = (
+            update(Meter)
+            .where(*filter_criteria(filter_shape(filters)))
+            .values(**meter_data, version=Meter.version + 1)
+            .returning(Meter.meter_id)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            meter_ids = list(self.session.scalars(statement, filter_values(filters)))
+        except IntegrityError as e:
+            self.rollback()
+            raise _constraint_error(e)
+        if meter_ids:
+            self.bump_collection_version()
+        self.commit()
+        count_cache.clear()
+        meter_cache.invalidate(meter_ids)
+
+        return meter_ids
 
-    def delete_meter(self, meter_id: int):
+    def delete_meter(self, meter_id: int, versions: Optional[Sequence[int]] = None):
         """
         Delete a Meter object.
 
         :param meter_id: The ID of the meter.
+        :param versions: Only delete the meter if it is at one of these versions.
         """
-        count = self.session.query(Meter).filter_by(meter_id=meter_id).delete()
+        statement = delete(Meter).where(Meter.meter_id == meter_id)
+        if versions is not None:
+            statement = statement.where(Meter.version.in_(versions))
+        external_reference = self.session.scalar(
+            statement.returning(Meter.external_reference).execution_options(
+                synchronize_session=False
+            )
+        )
+        if external_reference is not None:
+            self.add_tombstone(meter_id, external_reference)
+            self.bump_collection_version()
         self.commit()
+        count_cache.clear()
+        meter_cache.invalidate([meter_id])
+
+        return external_reference is not None
+
+    def add_tombstone(self, meter_id: int, external_reference: str):
+        """
+        Record the deletion of a meter in the current transaction.
 
-        return count > 0
+        :param meter_id: The ID of the deleted meter.
+        :param external_reference: The external reference of the deleted meter.
+        """
+        statement = sqlite_insert(MeterTombstone).values(
+            meter_id=meter_id,
+            external_reference=external_reference,
+            deleted_at=utcnow(),
+        )
+        self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[MeterTombstone.meter_id],
+                set_={
+                    "external_reference": statement.excluded.external_reference,
+                    "deleted_at": statement.excluded.deleted_at,
+                    "change_version": statement.excluded.change_version,
+                },
+            )
+        )
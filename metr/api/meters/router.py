@@ -0,0 +1,132 @@
+"""Single entry point dispatching every meter route to its handler."""
+
+import re
+from typing import Dict, List, Pattern, Tuple
+from urllib.parse import unquote
+
+from aws_lambda_typing.context import Context
+from aws_lambda_typing.events import APIGatewayProxyEventV2
+from aws_lambda_typing.responses import APIGatewayProxyResponseV2
+
+from metr.api.meters import views
+from metr.core.exceptions import MethodNotAllowedException, NotFoundException
+
+# Route keys, as configured on the API Gateway, mapped to their handlers.
+ROUTES: Dict[str, views.Handler] = {
+    "GET /meters": views.get_meters,
+    "POST /meters": views.post_meters,
+    "PATCH /meters": views.patch_meters,
+    "POST /meters:batch": views.post_meters_batch,
+    "GET /meters/export": views.export_meters,
+    "GET /meters/stats": views.get_meter_stats,
+    "GET /meters/changes": views.get_changes,
+    "PUT /meters/by-ref": views.put_meters_by_ref,
+    "PUT /meters/by-ref/{external_reference}": views.put_meter_by_ref,
+    "GET /meters/{meter_id}": views.get_meter,
+    "PUT /meters/{meter_id}": views.put_meter,
+    "PATCH /meters/{meter_id}": views.patch_meter,
+    "DELETE /meters/{meter_id}": views.delete_meter,
+}
+
+_PARAMETER = re.compile(r"\{(\w+)\}")
+
+
+def _template_pattern(path: str) -> Pattern:
+    """
+    Compile a path template to a regular expression.
+
+    :param path: A path with ``{name}`` parameters, each matching one segment.
+    :return: The pattern, with a named group per parameter.
+    """
+    parts = _PARAMETER.split(path)
+    return re.compile(
+        "^"
+        + "".join(
+            f"(?P<{part}>[^/]+)" if i % 2 else re.escape(part)
+            for i, part in enumerate(parts)
+        )
+        + "$"
+    )
+
+
+def _compile_routes() -> Tuple[
+    Dict[Tuple[str, str], views.Handler],
+    List[Tuple[Pattern, Dict[str, views.Handler]]],
+]:
+    """
+    Split the route table into exact paths and path templates.
+
+    Exact paths are looked up by ``(method, path)``; templates are compiled
+    once and tried in order, with a handler per method.
+
+    :return: The exact routes and the compiled template routes.
+    """
+    static: Dict[Tuple[str, str], views.Handler] = {}
+    templates: Dict[str, Dict[str, views.Handler]] = {}
+    for route_key, handler in ROUTES.items():
+        method, path = route_key.split(" ", 1)
+        if _PARAMETER.search(path):
+            templates.setdefault(path, {})[method] = handler
+        else:
+            static[(method, path)] = handler
+
+    dynamic = [
+        (_template_pattern(path), handlers) for path, handlers in templates.items()
+    ]
+    return static, dynamic
+
+
+_STATIC_ROUTES, _TEMPLATE_ROUTES = _compile_routes()
+_STATIC_PATHS = {path for _, path in _STATIC_ROUTES}
+
+
+def _resolve(event: APIGatewayProxyEventV2) -> views.Handler:
+    """
+    Find the handler for a request, filling in its path parameters.
+
+    Exact paths take precedence over templates, so ``/meters/export`` is never
+    taken for a meter ID.
+
+    :param event: The request event.
+    :return: The handler of the matching route.
+    """
+    handler = ROUTES.get(event.get("routeKey", ""))
+    if handler is not None:
+        return handler
+
+    method = event["requestContext"]["http"]["method"]
+    path = event["rawPath"].rstrip("/") or "/"
+    if path in _STATIC_PATHS:
+        handler = _STATIC_ROUTES.get((method, path))
+        if handler is None:
+            raise MethodNotAllowedException(f"Method not allowed: {method} {path}")
+        return handler
+
+    for pattern, handlers in _TEMPLATE_ROUTES:
+        match = pattern.match(path)
+        if match is None:
+            continue
+        handler = handlers.get(method)
+        if handler is None:
+            raise MethodNotAllowedException(f"Method not allowed: {method} {path}")
+        event["pathParameters"] = {
+            **(event.get("pathParameters") or {}),
+            **{name: unquote(value) for name, value in match.groupdict().items()},
+        }
+        return handler
+
+    raise NotFoundException(f"Not found: {path}")
+
+
+@views.handles_errors
+def handle(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
+    """
+    Serve any meter route from one Lambda function.
+
+    Routes are matched on the ``routeKey`` when the API Gateway resolved one,
+    and otherwise, for ``$default`` routes, on the method and raw path. All
+    routes then share the warm engine, caches and validators of this container.
+    """
+    return _resolve(event)(event, context)
@@ -1,9 +1,20 @@
 """Module to manage schemas."""
 
+import json
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+)
+
+from metr.core.exceptions import BadRequestException
 
 
 class MeterSchema(BaseModel):
@@ -18,3 +29,82 @@ class MeterSchema(BaseModel):
 
     class ConfigDict:
         from_attributes = True
+
+
+class MeterUpsertSchema(BaseModel):
+    """Meter Schema for upserts, identified by external reference."""
+
+    external_reference: str = Field(min_length=1, max_length=32)
+    supply_start_date: datetime
+    supply_end_date: Optional[datetime] = None
+    enabled: bool = True
+    annual_quantity: float = Field(gt=0)
+
+
+class MeterPatchSchema(BaseModel):
+    """
+    Meter Schema for JSON Merge Patch updates.
+
+    Only the fields present in the patch are validated and set. ``null``
+    removes a value, which only the supply end date allows.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    external_reference: Optional[str] = Field(default=None, min_length=1, max_length=32)
+    supply_start_date: Optional[datetime] = None
+    supply_end_date: Optional[datetime] = None
+    enabled: Optional[bool] = None
+    annual_quantity: Optional[float] = Field(default=None, gt=0)
+
+    @field_validator(
+        "external_reference", "supply_start_date", "enabled", "annual_quantity"
+    )
+    @classmethod
+    def _required(cls, value: Any) -> Any:
+        if value is None:
+            raise ValueError("Field cannot be removed.")
+        return value
+
+
+MeterBatchAdapter: TypeAdapter[List[MeterSchema]] = TypeAdapter(List[MeterSchema])
+MeterUpsertBatchAdapter: TypeAdapter[List[MeterUpsertSchema]] = TypeAdapter(
+    List[MeterUpsertSchema]
+)
+
+
+def validate_meter_batch(
+    items: Union[str, List[Any]],
+) -> Tuple[Dict[int, MeterSchema], Dict[int, List[Dict[str, Any]]]]:
+    """
+    Validate a batch of meters in a single pass.
+
+    A JSON array is parsed and validated by one pydantic-core call. Only when
+    the batch has invalid items are the remaining ones validated again on
+    their own, to tell them apart from the failing ones.
+
+    :param items: The raw meter payloads, or a JSON array of them.
+    :return: The valid meters and the validation errors, both by index.
+    """
+    try:
+        if isinstance(items, str):
+            return dict(enumerate(MeterBatchAdapter.validate_json(items))), {}
+        return dict(enumerate(MeterBatchAdapter.validate_python(items))), {}
+    except ValidationError as e:
+        if isinstance(items, str):
+            items = json.loads(items)
+            if not isinstance(items, list):
+                raise BadRequestException("Expected a list of meters.")
+            return validate_meter_batch(items)
+
+        errors: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for error in e.errors(include_url=False, include_context=False):
+            index, *loc = error["loc"]
+            errors[int(index)].append({**error, "loc": loc})
+
+    valid = {
+        index: MeterSchema.model_validate(item)
+        for index, item in enumerate(items)
+        if index not in errors
+    }
+    return valid, dict(errors)
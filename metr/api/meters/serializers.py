@@ -0,0 +1,283 @@
+"""Serializers turning meter rows into response payloads."""
+
+import csv
+import io
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from metr.core.exceptions import BadRequestException
+from metr.database.models import METER_FIELDS
+
+DATE_FIELDS = ("supply_start_date", "supply_end_date")
+
+
+def row_as_dict(
+    row: Sequence[Any], fields: Sequence[str] = METER_FIELDS
+) -> Dict[str, Any]:
+    """
+    Convert a meter row to a dictionary, matching :meth:`Meter.as_dict`.
+
+    :param row: A row of meter column values, starting with ``fields``. Any
+        extra trailing values are ignored.
+    :param fields: The fields the row holds, to narrow the dictionary to.
+    :return: The meter as a dictionary.
+    """
+    if fields is not METER_FIELDS:
+        meter = dict(zip(fields, row))
+        for field in DATE_FIELDS:
+            if field in meter:
+                meter[field] = meter[field].isoformat() if meter[field] else None
+        return meter
+
+    meter_id, external_reference, start, end, enabled, annual_quantity = row[:6]
+    return {
+        "meter_id": meter_id,
+        "external_reference": external_reference,
+        "supply_start_date": start.isoformat(),
+        "supply_end_date": end.isoformat() if end else None,
+        "enabled": enabled,
+        "annual_quantity": annual_quantity,
+    }
+
+
+def iter_ndjson(
+    chunks: Iterable[Sequence[Sequence[Any]]], fields: Sequence[str] = METER_FIELDS
+) -> Iterator[str]:
+    """
+    Write chunks of meter rows as newline-delimited JSON.
+
+    :param chunks: An iterable of row chunks, as fetched from the database.
+    :param fields: The fields the rows hold.
+    :return: An iterator of NDJSON text, one piece per chunk.
+    """
+    for rows in chunks:
+        yield "".join(json.dumps(row_as_dict(row, fields)) + "\n" for row in rows)
+
+
+def iter_csv(
+    chunks: Iterable[Sequence[Sequence[Any]]], fields: Sequence[str] = METER_FIELDS
+) -> Iterator[str]:
+    """
+    Write chunks of meter rows as CSV, starting with a header line.
+
+    :param chunks: An iterable of row chunks, as fetched from the database.
+    :param fields: The fields the rows hold, used as the header.
+    :return: An iterator of CSV text, one piece per chunk.
+    """
+    output = io.StringIO()
+    csv_writer = csv.DictWriter(output, fieldnames=fields)
+    csv_writer.writeheader()
+    for rows in chunks:
+        csv_writer.writerows(row_as_dict(row, fields) for row in rows)
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+
+    if output.tell():
+        yield output.getvalue()
+
+
+def parse_fields(fields: Optional[str]) -> Sequence[str]:
+    """
+    Resolve a ``fields`` parameter to the meter fields to return.
+
+    :param fields: A comma separated list of fields, or None for all of them.
+    :return: The requested fields, in representation order.
+    """
+    if fields is None:
+        return METER_FIELDS
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(METER_FIELDS)
+    if unknown:
+        raise BadRequestException(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if not requested:
+        raise BadRequestException("At least one field is required.")
+
+    return tuple(field for field in METER_FIELDS if field in requested)
+
+
+# Characters XML 1.0 cannot represent, not even as character references.
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _escape_xml(value: str) -> str:
+    """Escape text for XML, replacing unrepresentable characters with U+FFFD."""
+    if _INVALID_XML_CHARS.search(value):
+        value = _INVALID_XML_CHARS.sub("\ufffd", value)
+
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&apos;")
+    )
+
+
+def _xml_element(name: str, value: Any) -> str:
+    """
+    Write a value as an XML element with a type attribute.
+
+    The structure matches what ``dicttoxml`` produces for the same value.
+
+    :param name: The element name.
+    :param value: The value to write.
+    :return: The XML element.
+    """
+    if value is None:
+        return f'<{name} type="null"></{name}>'
+    if isinstance(value, bool):
+        return f'<{name} type="bool">{"true" if value else "false"}</{name}>'
+    if isinstance(value, int):
+        return f'<{name} type="int">{value}</{name}>'
+    if isinstance(value, float):
+        return f'<{name} type="float">{value}</{name}>'
+    if isinstance(value, dict):
+        children = "".join(_xml_element(k, v) for k, v in value.items())
+        return f'<{name} type="dict">{children}</{name}>'
+    if isinstance(value, (list, tuple)):
+        children = "".join(_xml_element("item", item) for item in value)
+        return f'<{name} type="list">{children}</{name}>'
+
+    return f'<{name} type="str">{_escape_xml(str(value))}</{name}>'
+
+
+class Serializer:
+    """Base class for the encoder of one content type."""
+
+    content_type: str
+
+    def iter_dumps(
+        self, body: Dict[str, Any], fields: Sequence[str] = METER_FIELDS
+    ) -> Iterator[str]:
+        """
+        Encode a response body, piece by piece.
+
+        :param body: The response body.
+        :param fields: The meter fields in the body.
+        :return: An iterator of encoded text.
+        """
+        raise NotImplementedError
+
+    def dumps(self, body: Dict[str, Any], fields: Sequence[str] = METER_FIELDS) -> str:
+        """
+        Encode a response body.
+
+        :param body: The response body.
+        :param fields: The meter fields in the body.
+        :return: The encoded text.
+        """
+        return "".join(self.iter_dumps(body, fields))
+
+    def iter_rows(
+        self,
+        chunks: Iterable[Sequence[Sequence[Any]]],
+        fields: Sequence[str] = METER_FIELDS,
+    ) -> Iterator[str]:
+        """
+        Encode chunks of meter rows as a stream, for exports.
+
+        :param chunks: An iterable of row chunks, as fetched from the database.
+        :param fields: The fields the rows hold.
+        :return: An iterator of encoded text, one piece per chunk.
+        """
+        raise NotImplementedError(f"{self.content_type} does not support streaming.")
+
+
+class JSONSerializer(Serializer):
+    """Encoder for application/json."""
+
+    content_type = "application/json"
+
+    def iter_dumps(self, body, fields=METER_FIELDS):
+        yield json.dumps(body)
+
+    def dumps(self, body, fields=METER_FIELDS):
+        return json.dumps(body)
+
+
+class NDJSONSerializer(Serializer):
+    """Encoder for application/x-ndjson, one meter per line."""
+
+    content_type = "application/x-ndjson"
+
+    def iter_dumps(self, body, fields=METER_FIELDS):
+        for meter in _body_rows(body):
+            yield json.dumps(meter) + "\n"
+
+    def iter_rows(self, chunks, fields=METER_FIELDS):
+        return iter_ndjson(chunks, fields)
+
+
+class CSVSerializer(Serializer):
+    """Encoder for text/csv, one meter per row under a header line."""
+
+    content_type = "text/csv"
+
+    def iter_dumps(self, body, fields=METER_FIELDS):
+        output = io.StringIO()
+        csv_writer = csv.DictWriter(output, fieldnames=fields)
+        csv_writer.writeheader()
+        csv_writer.writerows(_body_rows(body))
+        yield output.getvalue()
+
+    def iter_rows(self, chunks, fields=METER_FIELDS):
+        return iter_csv(chunks, fields)
+
+
+class XMLSerializer(Serializer):
+    """Encoder for application/xml, written incrementally without dicttoxml."""
+
+    content_type = "application/xml"
+
+    def iter_dumps(self, body, fields=METER_FIELDS):
+        yield '<?xml version="1.0" encoding="UTF-8" ?><root>'
+        for name, value in body.items():
+            if name == "meters" and isinstance(value, list):
+                yield '<meters type="list">'
+                for meter in value:
+                    yield _xml_element("item", meter)
+                yield "</meters>"
+            else:
+                yield _xml_element(name, value)
+        yield "</root>"
+
+
+def _body_rows(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the rows of a list body, or the single meter of a meter body."""
+    for key in ("meters", "stats", "changes"):
+        if key in body:
+            return body[key]
+
+    return [body]
+
+
+SERIALIZERS: Dict[str, Serializer] = {
+    serializer.content_type: serializer
+    for serializer in (
+        JSONSerializer(),
+        XMLSerializer(),
+        CSVSerializer(),
+        NDJSONSerializer(),
+    )
+}
+
+
+def get_serializer(accept: Optional[str]) -> Serializer:
+    """
+    Pick the serializer for an accept header, defaulting to JSON.
+
+    Media types are tried in the order listed; parameters such as ``q`` are
+    ignored.
+
+    :param accept: The accept header of the request.
+    :return: The serializer to encode the response with.
+    """
+    for media_type in (accept or "").split(","):
+        serializer = SERIALIZERS.get(media_type.split(";", 1)[0].strip().lower())
+        if serializer is not None:
+            return serializer
+
+    return SERIALIZERS["application/json"]
@@ -1,20 +1,46 @@
 """Service module for meters endpoints."""
 
-import csv
-import io
-import json
-import logging
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, cast
 from urllib.parse import urlencode
 
-import dicttoxml
 from aws_lambda_typing.responses import APIGatewayProxyResponseV2
 
-from metr.core.exceptions import BadRequestException
-from metr.database.models import Meter
-from metr.api.meters.persistors import MeterPersistor
-
-dicttoxml.LOG.setLevel(logging.ERROR)
+from metr.api.meters.caches import meter_cache
+from metr.api.meters.cursors import (
+    decode_change_cursor,
+    encode_change_cursor,
+    encode_cursor,
+    parse_order_by,
+)
+from metr.api.meters.etags import (
+    collection_etag,
+    etag_match,
+    meter_etag,
+    parse_meter_etag,
+)
+from metr.api.meters.filters import parse_filters
+from metr.api.meters.persistors import (
+    CHANGE_FIELDS,
+    STATS_AGGREGATES,
+    STATS_GROUPS,
+    MeterPersistor,
+)
+from metr.api.meters.schemas import validate_meter_batch
+from metr.api.meters.serializers import (
+    SERIALIZERS,
+    get_serializer,
+    parse_fields,
+    row_as_dict,
+)
+from metr.core.compression import response_compressor
+from metr.core.exceptions import BadRequestException, PreconditionFailedException
+from metr.database.models import METER_FIELDS, Meter
+
+COUNT_MODES = ("exact", "estimate", "none")
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+PAGINATION_PARAMS = ("page", "page_size", "cursor", "order_by")
+# Query parameters shaping the response rather than filtering meters.
+CONTROL_PARAMS = PAGINATION_PARAMS + ("count", "fields", "format", "group_by")
 
 
 class MeterService:
@@ -38,35 +64,83 @@ class MeterService:
         if headers == {}:
             headers = {"accept": "application/json"}
         self.headers = headers
+        self.content_type = get_serializer(headers.get("accept")).content_type
         self.meter_persistor = MeterPersistor()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.meter_persistor.__exit__(exc_type, exc_value, traceback)
+
+    def close(self):
+        """Close the DB session used by this service."""
+        self.meter_persistor.close()
+
+    def _close_after(self, chunks: Iterator[str]) -> Iterator[str]:
+        """
+        Yield from a streaming body, closing the DB session once it is done.
+
+        :param chunks: The chunks of the response body.
+        :return: The same chunks.
+        """
+        try:
+            yield from chunks
+        finally:
+            self.close()
+
+    def _filter_params(self) -> Dict[str, str]:
+        """Return the query parameters that filter meters."""
+        return {k: v for k, v in self.query_params.items() if k not in CONTROL_PARAMS}
+
+    def _filters(self) -> Dict[str, Any]:
+        """Return the meter filters of the query, coerced to column types."""
+        return parse_filters(self._filter_params())
+
     def _assign_next_page_hyperlink(
         self,
-        meters_count: int,
-        page: int,
+        last_meter: Optional[Sequence[Any]],
         page_size: int,
+        fields: Sequence[str] = METER_FIELDS,
     ) -> Optional[str]:
         """
         Insert a hyperlink with the next page for pagination.
 
-        :param meters_count: The total mumber of meter objects in the query.
-        :param page: The page number of results to show.
+        The link carries an opaque keyset cursor pointing after the last meter
+        of the current page, so fetching it costs the same however deep it is.
+
+        :param last_meter: The last meter row of the page, or None if there is
+            no further page.
         :param page_size: The number of objects per page.
+        :param fields: The fields the row holds, in order.
 
         :return: A hyperlink with the next page of results.
         """
-        next_page = None
-        if (page * page_size) < meters_count:
-            next_query_params = {"page": page + 1, "page_size": page_size}
-            next_page = f"{self.base_url}?{urlencode(next_query_params)}"
+        if last_meter is None:
+            return None
 
-        return next_page
+        order_by = self.query_params.get("order_by")
+        column_name, _ = parse_order_by(order_by)
+        next_query_params: Dict[str, Any] = {
+            k: v for k, v in self.query_params.items() if k not in ("page", "cursor")
+        }
+        next_query_params["page_size"] = page_size
+        next_query_params["cursor"] = encode_cursor(
+            order_by,
+            last_meter[fields.index(column_name)],
+            last_meter[fields.index("meter_id")],
+        )
+
+        return f"{self.base_url}?{urlencode(next_query_params)}"
 
     def _format_response_data(
         self,
         body: Dict[str, Any],
         content_type: str,
         status_code: int,
+        fields: Sequence[str] = METER_FIELDS,
+        compress: bool = True,
+        etag: Optional[str] = None,
     ) -> APIGatewayProxyResponseV2:
         """
         Format the response data based on the Content Type.
@@ -74,34 +148,93 @@ class MeterService:
         :param body: The body of the request.
         :param content_type: The Content Type to return in the response.
         :param status_code: The status code to return in the response.
+        :param fields: The meter fields in the body, used as the CSV header.
+        :param compress: Whether to compress the body per the Accept-Encoding.
+        :param etag: The ETag of the uncompressed representation, if any.
 
         :return: The APIGatewayProxyResponseV2.
         """
+        serializer = SERIALIZERS.get(content_type) or get_serializer(content_type)
+        headers = {"content-type": serializer.content_type}
+        if etag is not None:
+            headers["etag"] = etag
         response_data = APIGatewayProxyResponseV2(
             statusCode=status_code,
-            headers={"content-type": content_type},
-            body=json.dumps(body),
+            headers=headers,
+            body=serializer.dumps(body, fields),
         )
-
-        if content_type == "application/xml":
-            response_data["body"] = dicttoxml.dicttoxml(json.dumps(body))
-        elif content_type == "text/csv":
-            output = io.StringIO()
-            csv_writer = csv.DictWriter(output, fieldnames=body["meters"][0].keys())
-            csv_writer.writeheader()
-            csv_writer.writerows(body["meters"])
-            response_data["body"] = output.getvalue()
+        if compress:
+            response_data = self._compress(response_data)
 
         return response_data
 
-    def _get_meter_by_id(self, meter_id: int) -> Meter:
+    def _compress(
+        self, response_data: APIGatewayProxyResponseV2
+    ) -> APIGatewayProxyResponseV2:
+        """
+        Compress a response for the encodings the client accepts.
+
+        :param response_data: The uncompressed response.
+        :return: The response, compressed if worthwhile.
+        """
+        return response_compressor.compress(
+            response_data, self.headers.get("accept-encoding")
+        )
+
+    def _positive_int_param(self, name: str, default: int) -> int:
+        """
+        Parse a query parameter that must be a positive integer.
+
+        :param name: The name of the query parameter.
+        :param default: The value to use when the parameter is missing.
+        :return: The parsed value.
+        """
+        try:
+            value = int(self.query_params.get(name, default))
+        except ValueError:
+            value = 0
+        if value < 1:
+            raise BadRequestException(f"Invalid {name}, expected a positive integer.")
+
+        return value
+
+    @staticmethod
+    def _not_modified(etag: str) -> APIGatewayProxyResponseV2:
+        """
+        Build a 304 response for a representation the client already has.
+
+        :param etag: The ETag the client listed for its representation.
+        :return: The APIGatewayProxyResponseV2.
+        """
+        return APIGatewayProxyResponseV2(
+            statusCode=304, headers={"etag": etag, "vary": "accept-encoding"}
+        )
+
+    @staticmethod
+    def _if_match_versions(if_match: str) -> List[Tuple[int, int]]:
+        """
+        Parse the meter IDs and versions listed in an If-Match header.
+
+        :param if_match: The If-Match header value.
+        :return: A list of (meter ID, version) tuples.
+        """
+        versions = []
+        for etag in if_match.split(","):
+            parsed = parse_meter_etag(etag)
+            if parsed is not None:
+                versions.append(parsed)
+
+        return versions
+
+    def _get_meter_by_id(self, meter_id: int, primary: bool = False) -> Meter:
         """
         Return a Meter object by its ID.
 
         :param meter_id: The ID of the Meter.
+        :param primary: Read from the primary database rather than a replica.
         :return: The Meter object.
         """
-        meter = self.meter_persistor.get_meter(meter_id)
+        meter = self.meter_persistor.get_meter(meter_id, primary=primary)
         if not meter:
             raise BadRequestException(f"Meter not found. ID: {meter_id}")
 
@@ -116,53 +249,271 @@ class MeterService:
         :param meter_data: A dict of the meter data to add.
         :return: The APIGatewayProxyResponseV2 of the new meter.
         """
-        meter = Meter(
-            external_reference=meter_data["external_reference"],
-            supply_start_date=meter_data["supply_start_date"],
-            supply_end_date=meter_data["supply_end_date"],
-            enabled=bool(meter_data["enabled"]),
-            annual_quantity=float(meter_data["annual_quantity"]),
+        # The data is validated already; the meter ID is assigned on insert.
+        meter = self.meter_persistor.add_meter(
+            {k: v for k, v in meter_data.items() if k != "meter_id"}
         )
 
-        if self.meter_persistor.does_external_reference_exist(meter.external_reference):
-            raise BadRequestException(
-                "Meter with this external reference already exists."
-            )
+        return self._format_response_data(
+            body=row_as_dict(meter), content_type=self.content_type, status_code=201
+        )
+
+    def add_meters(self, items: Union[str, List[Any]]) -> APIGatewayProxyResponseV2:
+        """
+        Add a batch of meters to the DB in a single transaction.
+
+        Every item gets its own result, so invalid or duplicate meters are
+        reported without rejecting the rest of the batch.
 
-        self.meter_persistor.add_meter(meter)
+        :param items: The raw meter payloads to validate and add, or a JSON
+            array of them.
+        :return: The APIGatewayProxyResponseV2 with the per-item results.
+        """
+        valid, errors = validate_meter_batch(items)
+        results: Dict[int, Dict[str, Any]] = {
+            index: {
+                "index": index,
+                "status": 400,
+                "error": "Validation failed",
+                "details": details,
+            }
+            for index, details in errors.items()
+        }
+
+        existing = self.meter_persistor.get_existing_external_references(
+            meter.external_reference
+            for meter in valid.values()
+            if meter.external_reference is not None
+        )
+        to_add: Dict[int, Dict[str, Any]] = {}
+        for index, meter in valid.items():
+            if meter.external_reference is None:
+                error = "Meter external reference required."
+            elif meter.external_reference in existing:
+                error = "Meter with this external reference already exists."
+            else:
+                existing.add(meter.external_reference)
+                to_add[index] = meter.model_dump(exclude={"meter_id"})
+                continue
+            results[index] = {"index": index, "status": 400, "error": error}
+
+        meter_ids = []
+        if to_add:
+            meter_ids = self.meter_persistor.add_meters(list(to_add.values()))
+        for (index, meter_data), meter_id in zip(to_add.items(), meter_ids):
+            results[index] = {
+                "index": index,
+                "status": 201,
+                "meter": row_as_dict((meter_id, *meter_data.values())),
+            }
 
         return self._format_response_data(
-            body=meter.as_dict(),
-            content_type=self.headers["accept"],
-            status_code=201,
+            body={"results": [results[index] for index in sorted(results)]},
+            content_type="application/json",
+            status_code=201 if not results.keys() - to_add.keys() else 207,
         )
 
     def get_meters(self):
         """
         Get a list of meters.
+
+        The ``count`` query parameter selects how ``total`` is obtained:
+        ``exact`` (default) counts in the same statement as the page,
+        ``estimate`` serves it from the per-filter count cache and ``none``
+        skips counting altogether.
         """
-        meters = self.meter_persistor.get_meters(**self.query_params)
-        count_params = {k:v for k,v in self.query_params.items() if k not in ("page", "page_size")}
-        meters_count = self.meter_persistor.count_meters(**count_params)
+        count_mode = self.query_params.get("count", "exact")
+        if count_mode not in COUNT_MODES:
+            raise BadRequestException(
+                f"Invalid count mode, expected one of: {', '.join(COUNT_MODES)}."
+            )
+
+        page_size = self._positive_int_param("page_size", 20)
+        page = None
+        if not self.query_params.get("cursor"):
+            page = self._positive_int_param("page", 1)
+
+        content_type = self.content_type
+        etag = collection_etag(
+            self.meter_persistor.get_collection_version(),
+            self.query_params,
+            content_type,
+        )
+        matched = etag_match(self.headers.get("if-none-match"), etag)
+        if matched:
+            return self._not_modified(matched)
+
+        fields = parse_fields(self.query_params.get("fields"))
+        # The cursor of the next page needs the sort key and the meter ID.
+        column_name, _ = parse_order_by(self.query_params.get("order_by"))
+        selected = tuple(dict.fromkeys((*fields, column_name, "meter_id")))
+
+        filters = self._filters()
+        pagination = {
+            k: v for k, v in self.query_params.items() if k in PAGINATION_PARAMS
+        }
+        meters, meters_count = self.meter_persistor.get_meters(
+            **pagination, **filters, fields=selected, with_total=count_mode == "exact"
+        )
+        if count_mode == "estimate":
+            meters_count = self.meter_persistor.estimate_meters_count(**filters)
 
-        page, page_size = int(self.query_params.get("page", 1)), int(self.query_params.get("page_size", 20))
+        last_meter = meters[page_size - 1] if len(meters) > page_size else None
         next_page = self._assign_next_page_hyperlink(
-            page=page,
+            last_meter=last_meter,
             page_size=page_size,
-            meters_count=meters_count,
+            fields=selected,
         )
         body = {
             "page": page,
             "page_size": page_size,
             "total": meters_count,
-            "meters": [meter.as_dict() for meter in meters],
+            "meters": [row_as_dict(meter, fields) for meter in meters[:page_size]],
             "next_page": next_page,
         }
 
-        response_data = self._format_response_data(
-            body=body, content_type=self.headers["accept"], status_code=200
+        return self._format_response_data(
+            body=body,
+            content_type=content_type,
+            status_code=200,
+            fields=fields,
+            etag=etag,
+        )
+
+    def get_meter_stats(self) -> APIGatewayProxyResponseV2:
+        """
+        Aggregate the annual quantity of the meters matching the filters.
+
+        The ``group_by`` query parameter is a comma separated list of
+        ``STATS_GROUPS``; without it the stats cover every matching meter.
+
+        :return: The APIGatewayProxyResponseV2 with a row of stats per group.
+        """
+        group_by = tuple(
+            dict.fromkeys(
+                name.strip()
+                for name in self.query_params.get("group_by", "").split(",")
+                if name.strip()
+            )
+        )
+        unknown = set(group_by).difference(STATS_GROUPS)
+        if unknown:
+            raise BadRequestException(
+                f"Cannot group by: {', '.join(sorted(unknown))}. "
+                f"Expected any of: {', '.join(STATS_GROUPS)}."
+            )
+
+        content_type = self.content_type
+        etag = collection_etag(
+            self.meter_persistor.get_collection_version(),
+            self.query_params,
+            content_type,
+        )
+        matched = etag_match(self.headers.get("if-none-match"), etag)
+        if matched:
+            return self._not_modified(matched)
+
+        rows = self.meter_persistor.get_meter_stats(group_by, **self._filters())
+        fields = (*group_by, *STATS_AGGREGATES)
+        body = {"stats": [dict(zip(fields, row)) for row in rows]}
+
+        return self._format_response_data(
+            body=body,
+            content_type=content_type,
+            status_code=200,
+            fields=fields,
+            etag=etag,
+        )
+
+    def get_changes(self) -> APIGatewayProxyResponseV2:
+        """
+        Get the meters created, updated or deleted since a watermark.
+
+        The watermark is the ``changed_since`` query parameter on the first
+        request, and the ``cursor`` of ``next_page`` after that. Every page
+        returns the ``watermark`` up to which every change has been returned,
+        to start the next sync from.
+
+        :return: The APIGatewayProxyResponseV2 with a page of changes.
+        """
+        page_size = self._positive_int_param("page_size", 100)
+
+        cursor = self.query_params.get("cursor")
+        after = decode_change_cursor(cursor) if cursor else None
+        if after is not None:
+            since = after[0]
+        elif "changed_since" in self.query_params:
+            try:
+                since = int(self.query_params["changed_since"])
+            except ValueError:
+                since = -1
+            if since < 0:
+                raise BadRequestException(
+                    "Invalid changed_since, expected a watermark or 0."
+                )
+        else:
+            raise BadRequestException("Either changed_since or cursor is required.")
+
+        rows = self.meter_persistor.get_changes(since, after, limit=page_size + 1)
+        changes = []
+        for row in rows[:page_size]:
+            change = row_as_dict(row, CHANGE_FIELDS)
+            change["changed_at"] = row.changed_at.isoformat()
+            changes.append(change)
+
+        next_page = None
+        watermark = rows[len(changes) - 1].change_version if changes else since
+        if len(rows) > page_size:
+            last = rows[page_size - 1]
+            next_query_params = {
+                "page_size": page_size,
+                "cursor": encode_change_cursor(
+                    last.change_version, last.meter_id, last.deleted
+                ),
+            }
+            next_page = f"{self.base_url}?{urlencode(next_query_params)}"
+            # The next page may hold more changes of the same version.
+            watermark = rows[page_size].change_version - 1
+
+        body = {"changes": changes, "watermark": watermark, "next_page": next_page}
+        return self._format_response_data(
+            body=body,
+            content_type=self.content_type,
+            status_code=200,
+            fields=CHANGE_FIELDS,
+        )
+
+    def export_meters(self) -> APIGatewayProxyResponseV2:
+        """
+        Export every meter matching the filters as NDJSON or CSV.
+
+        The format comes from the ``format`` query parameter, or else from the
+        accept header. The body is a generator of text chunks, to be written
+        to a Lambda response stream as it is produced, so memory stays bounded
+        however many meters are exported.
+
+        :return: The APIGatewayProxyResponseV2 with a streaming body.
+        """
+        export_format = self.query_params.get("format")
+        if export_format is None:
+            export_format = "csv" if self.content_type == "text/csv" else "ndjson"
+        if export_format not in EXPORT_FORMATS:
+            raise BadRequestException(
+                f"Invalid export format, expected one of: {', '.join(EXPORT_FORMATS)}."
+            )
+
+        serializer = SERIALIZERS[EXPORT_FORMATS[export_format]]
+        fields = parse_fields(self.query_params.get("fields"))
+        chunks = self.meter_persistor.iter_meters(fields=fields, **self._filters())
+
+        # The response type only allows a string body; Lambda response
+        # streaming writes the generator's chunks instead.
+        body = cast(str, self._close_after(serializer.iter_rows(chunks, fields)))
+        return APIGatewayProxyResponseV2(
+            statusCode=200,
+            headers={"content-type": serializer.content_type},
+            body=body,
         )
-        return response_data
 
     def get_meter(self, path_parameters: Dict[str, str]) -> APIGatewayProxyResponseV2:
         """
@@ -171,14 +522,41 @@ class MeterService:
         :param path_parameters: The pathParameters of the request.
         :return: The APIGatewayProxyResponseV2 of the meter.
         """
-        meter_id = path_parameters.get("meter_id")
-        if not meter_id:
+        raw_meter_id = path_parameters.get("meter_id")
+        if not raw_meter_id:
             raise BadRequestException("Meter ID required.")
 
-        meter = self._get_meter_by_id(int(meter_id))
-        return self._format_response_data(
-            meter.as_dict(), self.headers["accept"], status_code=200
+        meter_id = int(raw_meter_id)
+        content_type = self.content_type
+        if_none_match = self.headers.get("if-none-match")
+        cached = meter_cache.get(meter_id, content_type)
+        if cached is not None:
+            matched = etag_match(if_none_match, cached["headers"]["etag"])
+            if matched:
+                return self._not_modified(matched)
+            return self._compress(cached)
+
+        if if_none_match:
+            version = self.meter_persistor.get_meter_version(meter_id)
+            if version is None:
+                raise BadRequestException(f"Meter not found. ID: {meter_id}")
+            etag = meter_etag(meter_id, version, content_type)
+            matched = etag_match(if_none_match, etag)
+            if matched:
+                return self._not_modified(matched)
+
+        # A lagging replica would put a stale meter in the cache, where it
+        # outlives the lag, so the cache is only filled from the primary.
+        meter = self._get_meter_by_id(meter_id, primary=meter_cache.enabled)
+        response_data = self._format_response_data(
+            meter.as_dict(),
+            content_type,
+            status_code=200,
+            compress=False,
+            etag=meter_etag(meter.meter_id, meter.version, content_type),
         )
+        meter_cache.set(meter_id, content_type, response_data)
+        return self._compress(response_data)
 
     def update_meter(self, meter_data: Dict[str, Any]) -> APIGatewayProxyResponseV2:
         """
@@ -192,34 +570,153 @@ class MeterService:
             raise BadRequestException(
                 "Meter ID in the body does not match the meter to be updated."
             )
-        meter = self._get_meter_by_id(int(meter_id))
+        return self._update_meter(
+            meter_id, {k: v for k, v in meter_data.items() if k != "meter_id"}
+        )
 
-        for key, value in meter_data.items():
-            if hasattr(meter, key):
-                if (
-                    key == "external_reference"
-                    and self.meter_persistor.does_external_reference_exist(value)
-                ):
-                    raise BadRequestException(
-                        "Meter with this external reference already exists."
-                    )
-                setattr(meter, key, value)
+    def _update_meter(
+        self, meter_id: int, meter_data: Dict[str, Any]
+    ) -> APIGatewayProxyResponseV2:
+        """
+        Set columns of a meter in one statement, honouring If-Match.
 
-        self.meter_persistor.update_meter(meter)
+        :param meter_id: The ID of the meter.
+        :param meter_data: The column values to set.
+        :return: The APIGatewayProxyResponseV2 with the updated meter.
+        """
+        versions = None
+        if_match = self.headers.get("if-match")
+        if if_match and if_match.strip() != "*":
+            versions = [
+                version
+                for tagged_id, version in self._if_match_versions(if_match)
+                if tagged_id == meter_id
+            ]
+            if not versions:
+                raise PreconditionFailedException("Meter has been modified.")
+
+        meter = self.meter_persistor.update_meter(
+            meter_id, meter_data, versions=versions
+        )
+        if meter is None:
+            if self.meter_persistor.get_meter_version(meter_id) is None:
+                raise BadRequestException(f"Meter not found. ID: {meter_id}")
+            raise PreconditionFailedException("Meter has been modified.")
 
         return self._format_response_data(
-            body=meter.as_dict(), content_type=self.headers["accept"], status_code=200
+            body=row_as_dict(meter),
+            content_type=self.content_type,
+            status_code=200,
+            etag=meter_etag(meter.meter_id, meter.version, self.content_type),
         )
 
-    def delete_meter(self, path_parameters: Dict[str, str]):
+    def patch_meter(
+        self, path_parameters: Dict[str, str], meter_data: Dict[str, Any]
+    ) -> APIGatewayProxyResponseV2:
         """
-        Delete a Meter object by its ID.
+        Apply a merge patch to a meter, without loading it first.
 
         :param path_parameters: The pathParameters of the request.
+        :param meter_data: The validated fields present in the patch.
+        :return: The APIGatewayProxyResponseV2 with the updated meter.
         """
         meter_id = path_parameters.get("meter_id")
         if not meter_id:
             raise BadRequestException("Meter ID required.")
+        if not meter_data:
+            raise BadRequestException("The patch sets no fields.")
+
+        return self._update_meter(int(meter_id), meter_data)
+
+    def patch_meters(self, meter_data: Dict[str, Any]) -> APIGatewayProxyResponseV2:
+        """
+        Apply a merge patch to every meter matching the query filters.
+
+        :param meter_data: The validated fields present in the patch.
+        :return: The APIGatewayProxyResponseV2 with the number of updated meters.
+        """
+        filters = self._filters()
+        if not filters:
+            raise BadRequestException("Bulk updates require at least one filter.")
+        if not meter_data:
+            raise BadRequestException("The patch sets no fields.")
+        if "external_reference" in meter_data:
+            raise BadRequestException("External references cannot be set in bulk.")
+
+        meter_ids = self.meter_persistor.update_meters(meter_data, **filters)
+
+        return self._format_response_data(
+            body={"updated": len(meter_ids)},
+            content_type="application/json",
+            status_code=200,
+        )
+
+    def upsert_meter(
+        self, external_reference: str, meter_data: Dict[str, Any]
+    ) -> APIGatewayProxyResponseV2:
+        """
+        Create or replace a meter identified by its external reference.
+
+        :param external_reference: The external reference from the path.
+        :param meter_data: The validated meter data.
+        :return: The APIGatewayProxyResponseV2 with the resulting meter, with
+            a 201 status code if it was created.
+        """
+        if meter_data["external_reference"] != external_reference:
+            raise BadRequestException(
+                "External reference in the body does not match the meter to be "
+                "updated."
+            )
+
+        (meter,), created = self.meter_persistor.upsert_meters([meter_data])
+
+        return self._format_response_data(
+            body=row_as_dict(meter),
+            content_type=self.content_type,
+            status_code=201 if created else 200,
+        )
+
+    def upsert_meters(self, meters: List[Dict[str, Any]]) -> APIGatewayProxyResponseV2:
+        """
+        Create or replace many meters identified by their external references.
+
+        :param meters: The validated meter data.
+        :return: The APIGatewayProxyResponseV2 with the resulting meters.
+        """
+        rows, _ = self.meter_persistor.upsert_meters(meters)
+
+        return self._format_response_data(
+            body={"meters": [row_as_dict(row) for row in rows]},
+            content_type=self.content_type,
+            status_code=200,
+        )
+
+    def delete_meter(self, path_parameters: Dict[str, str]):
+        """
+        Delete a Meter object by its ID.
+
+        :param path_parameters: The pathParameters of the request.
+        """
+        raw_meter_id = path_parameters.get("meter_id")
+        if not raw_meter_id:
+            raise BadRequestException("Meter ID required.")
 
-        if not self.meter_persistor.delete_meter(int(meter_id)):
+        meter_id = int(raw_meter_id)
+        versions = None
+        if_match = self.headers.get("if-match")
+        if if_match and if_match.strip() != "*":
+            versions = [
+                version
+                for tagged_id, version in self._if_match_versions(if_match)
+                if tagged_id == meter_id
+            ]
+            if not versions:
+                raise PreconditionFailedException("Meter has been modified.")
+
+        if not self.meter_persistor.delete_meter(meter_id, versions=versions):
+            if (
+                versions is not None
+                and self.meter_persistor.get_meter_version(meter_id) is not None
+            ):
+                raise PreconditionFailedException("Meter has been modified.")
             raise BadRequestException("Meter does not exist.")
@@ -1,168 +1,285 @@
 """Get meters endpoint file."""
 
 import json
+from functools import wraps
+from typing import Any, Callable
 
 from aws_lambda_typing.context import Context
 from aws_lambda_typing.events import APIGatewayProxyEventV2
 from aws_lambda_typing.responses import APIGatewayProxyResponseV2
 from pydantic import ValidationError
+from sqlalchemy.orm import configure_mappers
 
-from metr.core.exceptions import BadRequestException
-from metr.api.meters.schemas import MeterSchema
+from metr.api.meters.schemas import (
+    MeterPatchSchema,
+    MeterSchema,
+    MeterUpsertBatchAdapter,
+    MeterUpsertSchema,
+)
 from metr.api.meters.services import MeterService
+from metr.core.exceptions import APIException, BadRequestException
+from metr.database.database import get_engine, get_read_engine
 
 
+def _prewarm():
+    """
+    Do the one-off setup work during the Lambda init phase.
+
+    Creates the engines and opens their first pooled connections, configures the
+    ORM mappers and runs the request validators once, so that the first
+    invocation does not pay for any of it.
+    """
+    for engine in {get_engine(), get_read_engine()}:
+        with engine.connect():
+            pass
+    configure_mappers()
+    sample = {
+        "external_reference": "prewarm",
+        "supply_start_date": "2020-01-01",
+        "annual_quantity": 1,
+    }
+    MeterSchema.model_validate({**sample, "meter_id": 1})
+    MeterUpsertBatchAdapter.validate_python([sample])
+
+
+_prewarm()
+
+
+def _meter_list_json(event: APIGatewayProxyEventV2) -> str:
+    """
+    Return the meter payloads of a request body as a single JSON array.
+
+    An ``application/x-ndjson`` body, one meter per line, is joined into an
+    array, so that either form can be validated in one pass.
+
+    :param event: The request event.
+    :return: The JSON array text.
+    """
+    body = event.get("body", "")
+    if event.get("headers", {}).get("content-type") == "application/x-ndjson":
+        return "[" + ",".join(line for line in body.splitlines() if line.strip()) + "]"
+
+    return body
+
+
+Handler = Callable[[APIGatewayProxyEventV2, Context], APIGatewayProxyResponseV2]
+
+
+def _error_response(status_code: int, body: Any) -> APIGatewayProxyResponseV2:
+    return {
+        "statusCode": status_code,
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(body),
+    }
+
+
+def handles_errors(handler: Handler) -> Handler:
+    """
+    Turn the exceptions raised by a handler into JSON error responses.
+
+    :param handler: The Lambda handler to wrap.
+    :return: The wrapped handler.
+    """
+
+    @wraps(handler)
+    def wrapper(
+        event: APIGatewayProxyEventV2, context: Context
+    ) -> APIGatewayProxyResponseV2:
+        try:
+            return handler(event, context)
+        except APIException as e:
+            return _error_response(e.status_code, e.to_dict())
+        except json.JSONDecodeError as e:
+            return _error_response(400, {"error": "Bad Request", "message": str(e)})
+        except ValidationError as e:
+            return _error_response(
+                400,
+                {
+                    "error": "Bad Request",
+                    "message": "Validation failed",
+                    "details": e.errors(include_url=False, include_context=False),
+                },
+            )
+        except Exception as e:
+            return _error_response(
+                500, {"error": "Internal Server Error", "message": str(e)}
+            )
+
+    return wrapper
+
+
+def _meter_service(event: APIGatewayProxyEventV2) -> MeterService:
+    return MeterService(
+        base_url=event["rawPath"],
+        headers=event.get("headers", {}),
+        query_params=event.get("queryStringParameters", {}),
+    )
+
+
+@handles_errors
 def post_meters(
     event: APIGatewayProxyEventV2, context: Context
 ) -> APIGatewayProxyResponseV2:
     """
     Add a meter object to the database.
     """
-    try:
-        service = MeterService(
-            base_url=event["rawPath"],
-            headers=event.get("headers", {"accept": "application/json"}),
-            query_params=event.get("queryStringParameters", {}),
-        )
-        meter = MeterSchema(**json.loads(event["body"]))
-        new_meter = service.add_meter(meter.dict())
-
-        return new_meter
-    except BadRequestException as e:
-        return {
-            "statusCode": e.status_code,
-            "headers": {"content-type": "application/json"},
-            "body": json.dumps(e.to_dict()),
-        }
-    except ValidationError as e:
-        return {
-            "statusCode": 400,
-            "headers": {"content-type": "application/json"},
-            "body": json.dumps(
-                {
-                    "error": "Bad Request",
-                    "message": "Validation failed",
-                    "details": e.errors(),
-                }
-            ),
-        }
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {"content-type": "application/json"},
-            "body": json.dumps({"error": "Internal Server Error", "message": str(e)}),
-        }
+    with _meter_service(event) as service:
+        meter = MeterSchema.model_validate_json(event["body"])
+        return service.add_meter(meter.model_dump())
 
 
+@handles_errors
+def post_meters_batch(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
+    """
+    Add a batch of meter objects to the database.
+
+    The body is either a JSON array of meters or, with an
+    ``application/x-ndjson`` content type, one meter per line.
+    """
+    with _meter_service(event) as service:
+        return service.add_meters(_meter_list_json(event))
+
+
+@handles_errors
 def get_meters(
     event: APIGatewayProxyEventV2, context: Context
 ) -> APIGatewayProxyResponseV2:
     """
     Fetch all meters from the database with optional filtering and pagination.
     """
-    try:
-        service = MeterService(
-            base_url=event["rawPath"],
-            headers=event.get("headers", {}),
-            query_params=event.get("queryStringParameters", {}),
-        )
-        meters = service.get_meters()
+    with _meter_service(event) as service:
+        return service.get_meters()
 
-        return meters
 
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {"content-type": "application/json"},
-            "body": json.dumps({"error": "Internal Server Error", "message": str(e)}),
-        }
+@handles_errors
+def get_meter_stats(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
+    """
+    Aggregate the annual quantity of meters, with the same filters as the list.
+    """
+    with _meter_service(event) as service:
+        return service.get_meter_stats()
 
 
-def get_meter(
+@handles_errors
+def get_changes(
     event: APIGatewayProxyEventV2, context: Context
 ) -> APIGatewayProxyResponseV2:
     """
-    Fetch a meter object from the database.
+    Fetch the meters created, updated or deleted since a watermark.
+    """
+    with _meter_service(event) as service:
+        return service.get_changes()
+
+
+@handles_errors
+def export_meters(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
     """
+    Stream every meter matching the filters as NDJSON or CSV.
+
+    The response body is a generator, meant for Lambda response streaming.
+    """
+    service = _meter_service(event)
     try:
-        service = MeterService(
-            base_url=event["rawPath"],
-            headers=event.get("headers", {}),
-            query_params=event.get("queryStringParameters", {}),
-        )
-        meter = service.get_meter(event.get("pathParameters", {}))
+        export = service.export_meters()
+    except Exception:
+        service.close()
+        raise
 
-        return meter
+    # The session is closed by the body generator once it is exhausted.
+    return export
 
-    except BadRequestException as e:
-        return {
-            "statusCode": e.status_code,
-            "headers": {"content-type": "application/json"},
-            "body": json.dumps(e.to_dict()),
-        }
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {"content-type": "application/json"},
-            "body": json.dumps({"error": "Internal Server Error", "message": str(e)}),
-        }
 
+@handles_errors
+def get_meter(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
+    """
+    Fetch a meter object from the database.
+    """
+    with _meter_service(event) as service:
+        return service.get_meter(event.get("pathParameters", {}))
 
+
+@handles_errors
 def put_meter(
     event: APIGatewayProxyEventV2, context: Context
 ) -> APIGatewayProxyResponseV2:
     """Update a meter entry partially or fully."""
-    try:
-        service = MeterService(
-            base_url=event["rawPath"],
-            headers=event.get("headers", {}),
-            query_params=event.get("queryStringParameters", {}),
-        )
-        meter = MeterSchema(**json.loads(event.get("body", "")))
+    with _meter_service(event) as service:
+        meter = MeterSchema.model_validate_json(event.get("body", ""))
+        return service.update_meter(meter_data=meter.model_dump())
 
-        updated_meter = service.update_meter(meter_data=meter.dict())
 
-        return updated_meter
-    except BadRequestException as e:
-        return {
-            "statusCode": e.status_code,
-            "headers": {"content-type": "application/json"},
-            "body": json.dumps(e.to_dict()),
-        }
+@handles_errors
+def patch_meter(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
+    """Update the fields of a meter given in a JSON Merge Patch."""
+    with _meter_service(event) as service:
+        patch = MeterPatchSchema.model_validate_json(event.get("body", ""))
+        return service.patch_meter(
+            event.get("pathParameters", {}), patch.model_dump(exclude_unset=True)
+        )
+
 
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Internal Server Error", "message": str(e)}),
-        }
+@handles_errors
+def patch_meters(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
+    """Apply a JSON Merge Patch to every meter matching the query filters."""
+    with _meter_service(event) as service:
+        patch = MeterPatchSchema.model_validate_json(event.get("body", ""))
+        return service.patch_meters(patch.model_dump(exclude_unset=True))
 
 
-def delete_meter(
+@handles_errors
+def put_meter_by_ref(
     event: APIGatewayProxyEventV2, context: Context
 ) -> APIGatewayProxyResponseV2:
-    """Update a meter entry partially or fully."""
-    try:
-        service = MeterService(
-            base_url=event["rawPath"],
-            headers=event.get("headers", {}),
-            query_params=event.get("queryStringParameters", {}),
-        )
+    """Create or replace a meter identified by its external reference."""
+    with _meter_service(event) as service:
+        external_reference = event.get("pathParameters", {}).get("external_reference")
+        if not external_reference:
+            raise BadRequestException("Meter external reference required.")
+        meter_data = json.loads(event.get("body", ""))
+        if not isinstance(meter_data, dict):
+            raise BadRequestException("The body must be a JSON object.")
+        meter_data.setdefault("external_reference", external_reference)
+        meter = MeterUpsertSchema.model_validate(meter_data)
 
-        service.delete_meter(
-            path_parameters=event.get("pathParameters", {}),
+        return service.upsert_meter(
+            external_reference=external_reference, meter_data=meter.model_dump()
         )
 
-        return {"statusCode": 204}
 
-    except BadRequestException as e:
-        return {
-            "statusCode": e.status_code,
-            "headers": {"content-type": "application/json"},
-            "body": json.dumps(e.to_dict()),
-        }
-
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Internal Server Error", "message": str(e)}),
-        }
+@handles_errors
+def put_meters_by_ref(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
+    """
+    Create or replace many meters identified by their external references.
+
+    The body is either a JSON array of meters or, with an
+    ``application/x-ndjson`` content type, one meter per line.
+    """
+    with _meter_service(event) as service:
+        meters = MeterUpsertBatchAdapter.validate_json(_meter_list_json(event))
+
+        return service.upsert_meters([meter.model_dump() for meter in meters])
+
+
+@handles_errors
+def delete_meter(
+    event: APIGatewayProxyEventV2, context: Context
+) -> APIGatewayProxyResponseV2:
+    """Delete a meter."""
+    with _meter_service(event) as service:
+        service.delete_meter(path_parameters=event.get("pathParameters", {}))
+
+        return {"statusCode": 204}
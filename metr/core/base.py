@@ -1,22 +1,70 @@
 """Base Persistor class for DB operations."""
 
-from metr.database.database import Session
+from typing import Optional
+
+from sqlalchemy.orm import Session as SessionType
+
+from metr.database.database import ReadSession, Session, get_read_snapshot
 
 
 class BasePersistor:
     """Base class for all persistors to handle session management."""
 
-    def __init__(self):
+    def __init__(self, read_your_writes: bool = True):
+        """
+        Initialize.
+
+        :param read_your_writes: Whether reads after a write go to the primary
+            database, so that they see the write despite replication lag.
+        """
         self.session = Session()
+        self.read_your_writes = read_your_writes
+        self._read_session: Optional[SessionType] = None
+        self._written = False
+
+    @property
+    def read_session(self) -> SessionType:
+        """
+        The session to run read-only queries in.
+
+        This is a session on the read engine, unless there is no separate read
+        engine or, with read-your-writes, this persistor has written already.
+        An in-memory read snapshot is refreshed first, if it is due.
+        """
+        if ReadSession.kw["bind"] is self.session.bind:
+            return self.session
+        if self.read_your_writes and (self._written or self.session.in_transaction()):
+            return self.session
+        if self._read_session is None:
+            snapshot = get_read_snapshot()
+            if snapshot is not None:
+                snapshot.refresh()
+            self._read_session = ReadSession()
+
+        return self._read_session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.rollback()
+        self.close()
 
     def commit(self):
         """Commit transaction."""
         self.session.commit()
+        self._written = True
+        snapshot = get_read_snapshot()
+        if snapshot is not None:
+            snapshot.mark_stale()
 
     def rollback(self):
         """Rollback transaction."""
         self.session.rollback()
 
     def close(self):
-        """Close session."""
+        """Close sessions, returning their connections to the pool."""
         self.session.close()
+        if self._read_session is not None:
+            self._read_session.close()
@@ -0,0 +1,131 @@
+"""Pluggable in-process cache backends."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class CacheStats:
+    """Hit, miss and eviction counters of a cache backend."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Convert the counters to a dictionary."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def reset(self):
+        """Reset all counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class CacheBackend:
+    """
+    Base class for cache backends.
+
+    Subclasses implement the storage operations; hit and miss counting is
+    done here so every backend reports the same stats.
+    """
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for a key, if any.
+
+        :param key: The cache key.
+        :return: The cached value or None.
+        """
+        value = self._get(key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Cache a value.
+
+        :param key: The cache key.
+        :param value: The value to cache, anything but None.
+        """
+        self._set(key, value)
+
+    def delete(self, key: Hashable):
+        """
+        Drop a key from the cache, if present.
+
+        :param key: The cache key.
+        """
+        self._delete(key)
+
+    def clear(self):
+        """Drop every cached value."""
+        self._clear()
+
+    def _get(self, key: Hashable) -> Optional[Any]:
+        raise NotImplementedError
+
+    def _set(self, key: Hashable, value: Any):
+        raise NotImplementedError
+
+    def _delete(self, key: Hashable):
+        raise NotImplementedError
+
+    def _clear(self):
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    """A bounded, least recently used cache with an optional time to live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize.
+
+        :param maxsize: The maximum number of entries to keep.
+        :param ttl: The number of seconds entries stay valid, or None for ever.
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.stats.evictions += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def _clear(self):
+        self._entries.clear()
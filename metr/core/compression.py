@@ -0,0 +1,217 @@
+"""Response compression negotiated from the Accept-Encoding header."""
+
+import base64
+import os
+import time
+from importlib.util import find_spec
+from typing import Callable, Dict, Optional
+
+from aws_lambda_typing.responses import APIGatewayProxyResponseV2
+
+
+def _brotli(data: bytes, level: int) -> bytes:
+    import brotli
+
+    return brotli.compress(data, quality=min(level, 11))
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    import gzip
+
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _deflate(data: bytes, level: int) -> bytes:
+    import zlib
+
+    return zlib.compress(data, level)
+
+
+# Supported encodings, in order of preference when the client has none. The
+# codec modules are imported on first use, to keep them out of cold starts.
+ENCODERS: Dict[str, Callable[[bytes, int], bytes]] = {
+    **({"br": _brotli} if find_spec("brotli") is not None else {}),
+    "gzip": _gzip,
+    "deflate": _deflate,
+}
+
+
+# Every coding an ETag may be suffixed with, whether or not it is available.
+CONTENT_CODINGS = ("br", "gzip", "deflate")
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """
+    Derive the ETag of a representation sent with a content coding.
+
+    An encoded body is a different representation from the identity one, so
+    it gets its own strong ETag, suffixed with the coding.
+
+    :param etag: The quoted ETag of the identity representation.
+    :param coding: The content coding of the body.
+    :return: The quoted ETag of the encoded representation.
+    """
+    return f'{etag[:-1]}-{coding}"' if etag.endswith('"') else etag
+
+
+def identity_etag(etag: str) -> str:
+    """
+    Strip the content coding suffix added by :func:`encoded_etag`, if any.
+
+    :param etag: A quoted ETag.
+    :return: The quoted ETag of the identity representation.
+    """
+    for coding in CONTENT_CODINGS:
+        if etag.endswith(f'-{coding}"'):
+            return f'{etag[: -len(coding) - 2]}"'
+
+    return etag
+
+
+class CompressionStats:
+    """Counters of compressed responses, their sizes and the CPU time spent."""
+
+    def __init__(self):
+        self.compressed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """The compressed size of the compressed responses over their raw size."""
+        return self.bytes_out / self.bytes_in if self.bytes_in else 1.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Convert the counters to a dictionary."""
+        return {
+            "compressed": self.compressed,
+            "skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.ratio,
+            "cpu_seconds": self.cpu_seconds,
+        }
+
+    def reset(self):
+        """Reset all counters."""
+        self.compressed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content coding to use for an Accept-Encoding header.
+
+    Codings are ranked by their ``q`` value, ties broken by the order of
+    :data:`ENCODERS`; ``*`` stands for any coding not listed explicitly.
+
+    :param accept_encoding: The Accept-Encoding header of the request.
+    :return: The name of the coding, or None to send the body as is.
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if coding == "x-gzip":
+            coding = "gzip"
+        weights[coding] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for coding in ENCODERS:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+
+    return best
+
+
+class ResponseCompressor:
+    """Compresses response bodies for clients that accept it."""
+
+    def __init__(self, min_size: int = 1024, level: int = 6):
+        """
+        Initialize.
+
+        :param min_size: The body size in bytes below which not to compress.
+        :param level: The compression level, 1 (fastest) to 9 (smallest).
+        """
+        self.min_size = min_size
+        self.level = level
+        self.stats = CompressionStats()
+
+    def compress(
+        self, response: APIGatewayProxyResponseV2, accept_encoding: Optional[str]
+    ) -> APIGatewayProxyResponseV2:
+        """
+        Compress the body of a response, if the client accepts it.
+
+        The compressed body is base64-encoded with ``isBase64Encoded`` set,
+        as API Gateway expects binary bodies, and its ETag is suffixed with
+        the coding.
+
+        :param response: The response with a text body.
+        :param accept_encoding: The Accept-Encoding header of the request.
+        :return: The response, compressed or as it was.
+        """
+        body = response.get("body")
+        if not isinstance(body, str) or response.get("isBase64Encoded"):
+            return response
+
+        # Whether the body is compressed depends on the request, so caches
+        # must key every compressible response on its Accept-Encoding.
+        headers = dict(response.get("headers") or {})
+        headers["vary"] = "accept-encoding"
+        coding = negotiate_encoding(accept_encoding)
+        data = body.encode()
+        if coding is None or len(data) < self.min_size:
+            self.stats.skipped += 1
+            return {**response, "headers": headers}
+
+        started = time.process_time()
+        compressed = ENCODERS[coding](data, self.level)
+        self.stats.cpu_seconds += time.process_time() - started
+        self.stats.compressed += 1
+        self.stats.bytes_in += len(data)
+        self.stats.bytes_out += len(compressed)
+
+        headers["content-encoding"] = coding
+        if "etag" in headers:
+            headers["etag"] = encoded_etag(headers["etag"], coding)
+        return {
+            **response,
+            "headers": headers,
+            "body": base64.b64encode(compressed).decode(),
+            "isBase64Encoded": True,
+        }
+
+
+def _response_compressor() -> ResponseCompressor:
+    """
+    Build the response compressor from the environment.
+
+    ``METR_COMPRESSION_MIN_SIZE`` sets the size threshold in bytes, and
+    ``METR_COMPRESSION_LEVEL`` the compression level.
+    """
+    return ResponseCompressor(
+        min_size=int(os.environ.get("METR_COMPRESSION_MIN_SIZE") or 1024),
+        level=int(os.environ.get("METR_COMPRESSION_LEVEL") or 6),
+    )
+
+
+response_compressor = _response_compressor()
@@ -19,3 +19,24 @@ class BadRequestException(APIException):
 
     status_code = 400
     default_message = "Bad Request."
+
+
+class PreconditionFailedException(APIException):
+    """Exception for HTTP 412 Precondition Failed."""
+
+    status_code = 412
+    default_message = "Precondition Failed."
+
+
+class NotFoundException(APIException):
+    """Exception for HTTP 404 Not Found."""
+
+    status_code = 404
+    default_message = "Not Found."
+
+
+class MethodNotAllowedException(APIException):
+    """Exception for HTTP 405 Method Not Allowed."""
+
+    status_code = 405
+    default_message = "Method Not Allowed."
@@ -0,0 +1,68 @@
+"""
+Stamp the meters written before the change feed existed into it.
+
+Run with ``python -m metr.database.changes`` once, after adding the change feed
+columns to an existing database, against the database configured by
+``METR_DATABASE_URL``. Running it again stamps nothing.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+from metr.database.database import get_engine
+from metr.database.models import Meter, TableVersion, next_table_version
+
+
+def backfill_change_versions(connection: Connection) -> int:
+    """
+    Stamp the meters without a change version with a new collection version.
+
+    The migration leaves existing meters at version 0, which no watermark is
+    below, so a sync from 0 would only see them after their next write.
+
+    :param connection: The connection to backfill in, within a transaction.
+    :return: The number of meters stamped.
+    """
+    stamped = connection.execute(
+        update(Meter)
+        .where(Meter.change_version == 0)
+        .values(change_version=next_table_version(Meter.__tablename__))
+    ).rowcount
+    if stamped:
+        # Like every write, bump the version the meters are stamped with.
+        connection.execute(
+            sqlite_insert(TableVersion)
+            .values(table_name=Meter.__tablename__, version=1)
+            .on_conflict_do_update(
+                index_elements=[TableVersion.table_name],
+                set_={"version": TableVersion.version + 1},
+            )
+        )
+
+    return stamped
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line.
+
+    :param argv: The command line arguments, defaulting to ``sys.argv``.
+    :return: The exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args(argv)
+
+    with get_engine().begin() as connection:
+        stamped = backfill_change_versions(connection)
+
+    print(f"Stamped {stamped} meters.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
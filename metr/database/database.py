@@ -1,12 +1,274 @@
 """SQL Lite Database file."""
 
-from sqlalchemy import create_engine
+import os
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from metr.database.snapshot import Snapshot
+
 Base = declarative_base()
 Session = sessionmaker()
+# Bound to the read engine, or to the primary engine when there is none.
+ReadSession = sessionmaker()
+
+_engine: Optional[Engine] = None
+_read_engine: Optional[Engine] = None
+_read_snapshot: Optional[Snapshot] = None
+_engine_config: Optional[tuple] = None
+
+
+class ConnectionStats:
+    """Counters telling fresh DB connections apart from reused pooled ones."""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+
+    @property
+    def reuses(self) -> int:
+        """The number of checkouts served by an already open connection."""
+        return self.checkouts - self.connects
+
+    def reset(self):
+        """Reset all counters."""
+        self.connects = 0
+        self.checkouts = 0
+
+
+connection_stats = ConnectionStats()
+
+# SQLite PRAGMAs applied to every new connection, by profile name.
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # The SQLite defaults: rollback journal and synchronous=FULL.
+    "default": {},
+    # WAL lets readers proceed alongside a writer; NORMAL only syncs at
+    # checkpoints, which is durable against application crashes.
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # For replicas and reporting jobs; writes are refused. The journal mode
+    # is left to the writer, as setting it fails on ``mode=ro`` connections.
+    "read_only": {
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "query_only": "ON",
+    },
+    # For imports that can be rerun: no syncs at all, and a larger cache.
+    "bulk_load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+}
+
+
+def _on_connect(dbapi_connection, connection_record):
+    connection_stats.connects += 1
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_stats.checkouts += 1
+
+
+def _sqlite_pragmas(pragmas: Dict[str, Any]):
+    """Return a connect listener running the given PRAGMAs."""
+
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return _on_connect
+
+
+def create_database_engine(
+    conn_url: str = "sqlite://",
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_recycle: Optional[int] = None,
+    pool_pre_ping: bool = False,
+    sqlite_profile: Optional[str] = None,
+) -> Engine:
+    """
+    Create an engine, without binding the Session factory to it.
+
+    :param conn_url: The database URL.
+    :param pool_size: The number of connections to keep in the pool.
+    :param max_overflow: The number of connections allowed beyond pool_size.
+    :param pool_recycle: The age in seconds after which to replace connections.
+    :param pool_pre_ping: Whether to test connections on checkout.
+    :param sqlite_profile: The name of the SQLite PRAGMA profile to apply to
+        every connection, from ``SQLITE_PROFILES``.
+    :return: The new engine.
+    """
+    url = make_url(conn_url)
+    engine_options: Dict[str, Any] = {"pool_pre_ping": pool_pre_ping}
+    if pool_recycle is not None:
+        engine_options["pool_recycle"] = pool_recycle
+    # In-memory SQLite uses a single connection per thread, without sizing.
+    if url.database not in (None, "", ":memory:"):
+        if pool_size is not None:
+            engine_options["pool_size"] = pool_size
+        if max_overflow is not None:
+            engine_options["max_overflow"] = max_overflow
+
+    pragmas = {}
+    if sqlite_profile is not None:
+        if sqlite_profile not in SQLITE_PROFILES:
+            raise ValueError(f"Unknown SQLite profile: {sqlite_profile}")
+        if url.get_backend_name() == "sqlite":
+            pragmas = SQLITE_PROFILES[sqlite_profile]
+
+    engine = create_engine(conn_url, future=True, **engine_options)
+    if pragmas:
+        event.listen(engine, "connect", _sqlite_pragmas(pragmas))
+    event.listen(engine, "connect", _on_connect)
+    event.listen(engine, "checkout", _on_checkout)
 
+    return engine
 
-def configure_database(conn_url: str = "sqlite://"):
-    engine = create_engine(conn_url, future=True)
+
+def configure_database(
+    conn_url: str = "sqlite://",
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_recycle: Optional[int] = None,
+    pool_pre_ping: bool = False,
+    sqlite_profile: Optional[str] = None,
+    read_url: Optional[str] = None,
+    read_snapshot: bool = False,
+    read_snapshot_ttl: Optional[float] = None,
+) -> Engine:
+    """
+    Create the engines and bind the Session factories to them.
+
+    The engines and their pools live for the whole (warm) container: calling
+    this again with the same settings returns the existing engine, so
+    connections are reused across invocations rather than set up every time.
+
+    With a ``read_url``, ``ReadSession`` is bound to a second engine for
+    read-only queries, e.g. a replica file or a ``mode=ro`` URI of the primary.
+    Its SQLite connections get the ``read_only`` profile when a profile is set.
+
+    With ``read_snapshot``, the read database is copied into memory here, at
+    cold start, and ``ReadSession`` is bound to the in-memory copy instead.
+
+    :param conn_url: The database URL.
+    :param pool_size: The number of connections to keep in the pool.
+    :param max_overflow: The number of connections allowed beyond pool_size.
+    :param pool_recycle: The age in seconds after which to replace connections.
+    :param pool_pre_ping: Whether to test connections on checkout.
+    :param sqlite_profile: The name of the SQLite PRAGMA profile to apply to
+        every connection, from ``SQLITE_PROFILES``.
+    :param read_url: The database URL to run read-only queries against.
+    :param read_snapshot: Whether to serve reads from an in-memory snapshot.
+    :param read_snapshot_ttl: The number of seconds after which to check the
+        snapshot for staleness, or None to only reload after local writes.
+    :return: The configured primary engine.
+    """
+    global _engine, _read_engine, _read_snapshot, _engine_config
+
+    pool_config = (pool_size, max_overflow, pool_recycle, pool_pre_ping)
+    config = (
+        conn_url,
+        *pool_config,
+        sqlite_profile,
+        read_url,
+        read_snapshot,
+        read_snapshot_ttl,
+    )
+    if _engine is not None and _engine_config == config:
+        return _engine
+
+    engine = create_database_engine(conn_url, *pool_config, sqlite_profile)
+    read_engine = None
+    if read_url is not None:
+        read_engine = create_database_engine(
+            read_url, *pool_config, sqlite_profile and "read_only"
+        )
+
+    snapshot = None
+    if read_snapshot:
+        snapshot = Snapshot(read_engine or engine, ttl=read_snapshot_ttl)
+        snapshot.load()
+
+    previous_engines = [_engine, _read_engine]
+    if _read_snapshot is not None:
+        previous_engines.append(_read_snapshot.engine)
+    for previous in previous_engines:
+        if previous is not None:
+            previous.dispose()
     Session.configure(bind=engine, future=True)
+    ReadSession.configure(
+        bind=snapshot.engine if snapshot else read_engine or engine, future=True
+    )
+    _engine, _read_engine, _engine_config = engine, read_engine, config
+    _read_snapshot = snapshot
+
+    return engine
+
+
+def get_engine() -> Engine:
+    """
+    Return the engine, configuring it from the environment on first use.
+
+    Reads ``METR_DATABASE_URL`` and the optional ``METR_DB_POOL_SIZE``,
+    ``METR_DB_MAX_OVERFLOW``, ``METR_DB_POOL_RECYCLE``, ``METR_DB_POOL_PRE_PING``,
+    ``METR_DB_SQLITE_PROFILE``, ``METR_DATABASE_READ_URL``,
+    ``METR_DB_READ_SNAPSHOT`` and ``METR_DB_READ_SNAPSHOT_TTL`` settings.
+
+    :return: The configured engine.
+    """
+    if _engine is not None:
+        return _engine
+
+    def _int_setting(name: str) -> Optional[int]:
+        value = os.environ.get(name)
+        return int(value) if value else None
+
+    return configure_database(
+        os.environ.get("METR_DATABASE_URL", "sqlite://"),
+        pool_size=_int_setting("METR_DB_POOL_SIZE"),
+        max_overflow=_int_setting("METR_DB_MAX_OVERFLOW"),
+        pool_recycle=_int_setting("METR_DB_POOL_RECYCLE"),
+        pool_pre_ping=os.environ.get("METR_DB_POOL_PRE_PING", "").lower()
+        in ("1", "true"),
+        sqlite_profile=os.environ.get("METR_DB_SQLITE_PROFILE") or None,
+        read_url=os.environ.get("METR_DATABASE_READ_URL") or None,
+        read_snapshot=os.environ.get("METR_DB_READ_SNAPSHOT", "").lower()
+        in ("1", "true"),
+        read_snapshot_ttl=_int_setting("METR_DB_READ_SNAPSHOT_TTL"),
+    )
+
+
+def get_read_engine() -> Engine:
+    """
+    Return the engine for read-only queries, which may be the primary engine.
+
+    :return: The configured read engine.
+    """
+    get_engine()
+
+    return ReadSession.kw["bind"]
+
+
+def get_read_snapshot() -> Optional[Snapshot]:
+    """
+    Return the in-memory snapshot reads are served from, if any.
+
+    :return: The snapshot, or None when reads go to a database engine.
+    """
+    return _read_snapshot
@@ -1,11 +1,53 @@
 import datetime
 from typing import Optional
 
-from sqlalchemy import String
+from sqlalchemy import DDL, Index, ScalarSelect, String, event, func, select
 from sqlalchemy.orm import Mapped, mapped_column
 
 from metr.database.database import Base
 
+# The fields of a meter as exposed by the API, in representation order.
+METER_FIELDS = (
+    "meter_id",
+    "external_reference",
+    "supply_start_date",
+    "supply_end_date",
+    "enabled",
+    "annual_quantity",
+)
+
+
+def utcnow() -> datetime.datetime:
+    """Return the current UTC time, naive like the other stored datetimes."""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class TableVersion(Base):
+    """A version counter per table, bumped by every write to that table."""
+
+    __tablename__ = "table_version"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int]
+
+
+def next_table_version(table_name: str) -> ScalarSelect[int]:
+    """
+    Return the version the current write will bump a table's counter to.
+
+    A write statement takes SQLite's write lock before evaluating it, and the
+    lock is held until commit, so the value increases in commit order. It is
+    only right in transactions that bump the counter once, after the writes.
+
+    :param table_name: The name of the table written to.
+    :return: A scalar subquery of the next version.
+    """
+    return (
+        select(func.coalesce(func.max(TableVersion.version), 0) + 1)
+        .where(TableVersion.table_name == table_name)
+        .scalar_subquery()
+    )
+
 
 class Meter(Base):
     __tablename__ = "meter"
@@ -16,6 +58,26 @@ class Meter(Base):
     supply_end_date: Mapped[Optional[datetime.datetime]]
     enabled: Mapped[bool]
     annual_quantity: Mapped[float]
+    # Bumped on every update; the ORM adds it to the WHERE of UPDATE/DELETE.
+    version: Mapped[int] = mapped_column(default=1)
+    # Set on insert and on every update, for the change feed: the time, and
+    # the collection version committed with it, which serves as watermark.
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        default=utcnow, onupdate=utcnow
+    )
+    change_version: Mapped[int] = mapped_column(
+        default=next_table_version("meter"),
+        onupdate=next_table_version("meter"),
+        index=True,
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+    # Range filters on either date, carrying the other one so that supply
+    # window overlaps are resolved from the index alone.
+    __table_args__ = (
+        Index("ix_meter_supply_window", "supply_start_date", "supply_end_date"),
+        Index("ix_meter_supply_end_date", "supply_end_date", "supply_start_date"),
+    )
 
     def as_dict(self):
         """Convert Meter object to a dictionary."""
@@ -29,3 +91,59 @@ class Meter(Base):
             "enabled": self.enabled,
             "annual_quantity": self.annual_quantity,
         }
+
+
+class MeterTombstone(Base):
+    """A record of a deleted meter, for the change feed."""
+
+    __tablename__ = "meter_tombstone"
+
+    meter_id: Mapped[int] = mapped_column(primary_key=True)
+    external_reference: Mapped[str] = mapped_column(String(32))
+    deleted_at: Mapped[datetime.datetime]
+    change_version: Mapped[int] = mapped_column(
+        default=next_table_version("meter"), index=True
+    )
+
+
+class MeterSummary(Base):
+    """
+    The count and total annual quantity of meters, per enabled state.
+
+    Kept up to date by triggers on the meter table, so every write updates it
+    in its own transaction. See :mod:`metr.database.summary` to rebuild it.
+    """
+
+    __tablename__ = "meter_summary"
+
+    enabled: Mapped[bool] = mapped_column(primary_key=True)
+    meter_count: Mapped[int]
+    annual_quantity_sum: Mapped[float]
+
+
+_ADD_TO_SUMMARY = """
+    INSERT INTO meter_summary (enabled, meter_count, annual_quantity_sum)
+    VALUES (NEW.enabled, 1, NEW.annual_quantity)
+    ON CONFLICT (enabled) DO UPDATE SET
+        meter_count = meter_count + 1,
+        annual_quantity_sum = annual_quantity_sum + excluded.annual_quantity_sum;
+"""
+_REMOVE_FROM_SUMMARY = """
+    UPDATE meter_summary SET
+        meter_count = meter_count - 1,
+        annual_quantity_sum = annual_quantity_sum - OLD.annual_quantity
+    WHERE enabled = OLD.enabled;
+"""
+SUMMARY_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS meter_summary_insert AFTER INSERT ON meter "
+    f"BEGIN {_ADD_TO_SUMMARY} END",
+    f"CREATE TRIGGER IF NOT EXISTS meter_summary_update "
+    f"AFTER UPDATE OF enabled, annual_quantity ON meter "
+    f"BEGIN {_REMOVE_FROM_SUMMARY} {_ADD_TO_SUMMARY} END",
+    f"CREATE TRIGGER IF NOT EXISTS meter_summary_delete AFTER DELETE ON meter "
+    f"BEGIN {_REMOVE_FROM_SUMMARY} END",
+)
+
+# Created along with the summary table, which comes after the meter table.
+for _trigger in SUMMARY_TRIGGERS:
+    event.listen(MeterSummary.__table__, "after_create", DDL(_trigger))
@@ -0,0 +1,122 @@
+"""In-memory snapshots of a SQLite database, for read-only functions."""
+
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+# Every write bumps a row of table_version, so their sum changes on any write.
+_VERSION_QUERY = text("SELECT COALESCE(SUM(version), 0) FROM table_version")
+
+
+class SnapshotStats:
+    """Counters of snapshot loads, their duration and size."""
+
+    def __init__(self):
+        self.loads = 0
+        self.load_seconds = 0.0
+        self.size_bytes = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert the counters to a dictionary."""
+        return {
+            "loads": self.loads,
+            "load_seconds": self.load_seconds,
+            "size_bytes": self.size_bytes,
+        }
+
+
+class Snapshot:
+    """
+    A copy of a SQLite database held in memory, refreshed when stale.
+
+    The copy is made with the SQLite backup API into a single in-memory
+    connection shared by every session of :attr:`engine`.
+    """
+
+    def __init__(self, source: Engine, ttl: Optional[float] = None):
+        """
+        Initialize.
+
+        :param source: The engine of the database to copy.
+        :param ttl: The number of seconds after which to check the source for
+            changes, or None to never refresh.
+        """
+        self.source = source
+        self.ttl = ttl
+        self.engine = create_engine(
+            "sqlite://",
+            future=True,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+        event.listen(self.engine, "connect", _query_only)
+        self.version: Optional[int] = None
+        self.loaded_at: Optional[float] = None
+        self._stale = False
+        self.stats = SnapshotStats()
+
+    def _source_version(self) -> Optional[int]:
+        with self.source.connect() as connection:
+            try:
+                return connection.scalar(_VERSION_QUERY)
+            except OperationalError:
+                return None
+
+    def load(self):
+        """Copy the source database into memory, replacing the previous copy."""
+        started = time.perf_counter()
+        version = self._source_version()
+        source = self.source.raw_connection()
+        target = self.engine.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+            cursor = target.driver_connection.execute(
+                "SELECT page_count * page_size "
+                "FROM pragma_page_count(), pragma_page_size()"
+            )
+            self.stats.size_bytes = cursor.fetchone()[0]
+        finally:
+            target.close()
+            source.close()
+
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.stats.loads += 1
+        self.stats.load_seconds = time.perf_counter() - started
+
+    def mark_stale(self):
+        """Have the next refresh check the source, whatever the TTL."""
+        self._stale = True
+
+    def refresh(self) -> bool:
+        """
+        Load the snapshot, or reload it if it is due a check and has changed.
+
+        :return: True if the snapshot was (re)loaded.
+        """
+        if self.loaded_at is None:
+            self.load()
+            return True
+
+        due = self._stale or (
+            self.ttl is not None and time.monotonic() - self.loaded_at >= self.ttl
+        )
+        if not due:
+            return False
+
+        self._stale = False
+        if self._source_version() != self.version:
+            self.load()
+            return True
+
+        self.loaded_at = time.monotonic()
+        return False
+
+
+def _query_only(dbapi_connection, connection_record):
+    # The snapshot serves reads only; writes belong on the primary.
+    dbapi_connection.execute("PRAGMA query_only=ON")
@@ -0,0 +1,106 @@
+"""
+Rebuild or verify the meter summary table against the meter table.
+
+Run with ``python -m metr.database.summary {rebuild,verify}``, against the
+database configured by ``METR_DATABASE_URL``. ``verify`` exits non-zero when
+the summary has drifted from a full recompute.
+"""
+
+import argparse
+import math
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Connection
+
+from metr.database.database import Base, get_engine
+from metr.database.models import Meter, MeterSummary
+
+Totals = Dict[bool, Tuple[int, float]]
+
+_RECOMPUTE = select(
+    Meter.enabled,
+    func.count(Meter.meter_id),
+    func.coalesce(func.sum(Meter.annual_quantity), 0.0),
+).group_by(Meter.enabled)
+
+
+def rebuild_summary(connection: Connection):
+    """
+    Replace the summary with a full recompute from the meter table.
+
+    :param connection: The connection to rebuild in, within a transaction.
+    """
+    connection.execute(delete(MeterSummary))
+    connection.execute(
+        insert(MeterSummary).from_select(
+            ["enabled", "meter_count", "annual_quantity_sum"], _RECOMPUTE
+        )
+    )
+
+
+def verify_summary(connection: Connection) -> List[str]:
+    """
+    Compare the summary with a full recompute from the meter table.
+
+    Sums are compared with a relative tolerance, as incrementally maintained
+    floating point sums drift by rounding errors.
+
+    :param connection: The connection to read in.
+    :return: A description of every mismatch, empty if the summary is right.
+    """
+    expected: Totals = {
+        enabled: (count, total)
+        for enabled, count, total in connection.execute(_RECOMPUTE)
+    }
+    actual: Totals = {
+        row.enabled: (row.meter_count, row.annual_quantity_sum)
+        for row in connection.execute(select(MeterSummary))
+    }
+
+    mismatches = []
+    for enabled in sorted(expected.keys() | actual.keys()):
+        count, total = expected.get(enabled, (0, 0.0))
+        summary_count, summary_total = actual.get(enabled, (0, 0.0))
+        if count != summary_count or not math.isclose(
+            total, summary_total, rel_tol=1e-9, abs_tol=1e-6
+        ):
+            mismatches.append(
+                f"enabled={enabled}: expected {count} meters totalling {total}, "
+                f"summary has {summary_count} totalling {summary_total}"
+            )
+
+    return mismatches
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line.
+
+    :param argv: The command line arguments, defaulting to ``sys.argv``.
+    :return: The exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=("rebuild", "verify"))
+    args = parser.parse_args(argv)
+
+    engine = get_engine()
+    Base.metadata.create_all(engine, tables=[MeterSummary.__table__])
+    with engine.begin() as connection:
+        if args.command == "rebuild":
+            rebuild_summary(connection)
+        mismatches = verify_summary(connection)
+
+    for mismatch in mismatches:
+        print(mismatch, file=sys.stderr)
+    if mismatches:
+        print("Summary has drifted.", file=sys.stderr)
+        return 1
+
+    print("Summary rebuilt." if args.command == "rebuild" else "Summary is up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,13 @@
+from contextlib import contextmanager
+
 import pytest
 from aws_lambda_typing.context import Context
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from metr.api.meters.caches import count_cache, meter_cache
 from metr.database import database
+from metr.database.models import Meter, TableVersion
 from tests import factories
 
 
@@ -22,6 +27,8 @@ def fresh_db(setup_db):
         tablenames = [str(t) for t in database.Base.metadata.tables.values()]
         for table in tablenames:
             s.execute(text(f"DELETE FROM {table}"))
+    count_cache.clear()
+    meter_cache.clear()
 
 
 @pytest.fixture()
@@ -30,7 +37,18 @@ def db_meters(fresh_db):
         meters = factories.generate_meters(100)
         s.add_all(meters)
         s.flush()
+        # Like every write, bump the version the meters are stamped with.
+        s.execute(
+            sqlite_insert(TableVersion)
+            .values(table_name=Meter.__tablename__, version=1)
+            .on_conflict_do_update(
+                index_elements=[TableVersion.table_name],
+                set_={"version": TableVersion.version + 1},
+            )
+        )
         s.expunge_all()
+    count_cache.clear()
+    meter_cache.clear()
     return meters
 
 
@@ -43,3 +61,25 @@ class MockContext(Context):
 @pytest.fixture()
 def lambda_context():
     return MockContext()
+
+
+@pytest.fixture()
+def assert_num_queries():
+    """Assert the number of SQL statements run within a block."""
+
+    @contextmanager
+    def _assert_num_queries(expected):
+        statements = []
+        engine = database.Session.kw["bind"]
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert len(statements) == expected, "\n".join(statements)
+
+    return _assert_num_queries
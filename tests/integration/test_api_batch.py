@@ -0,0 +1,123 @@
+import json
+
+from metr.api.meters.persistors import MeterPersistor
+from metr.api.meters.views import get_meters, post_meters_batch
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _meter(index, **changes):
+    meter = {
+        "meter_id": 1,
+        "external_reference": f"BATCH{index}",
+        "supply_start_date": "2021-01-01",
+        "supply_end_date": None,
+        "enabled": True,
+        "annual_quantity": 123.45,
+    }
+    meter.update(changes)
+    return meter
+
+
+def test_post_meters_batch(fresh_db, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "POST", "/meters:batch", body=json.dumps([_meter(i) for i in range(1200)])
+    )
+    response = post_meters_batch(event, lambda_context)
+
+    assert response["statusCode"] == 201
+    results = json.loads(response["body"])["results"]
+    assert [r["status"] for r in results] == [201] * 1200
+    assert results[7]["meter"]["external_reference"] == "BATCH7"
+    assert len({r["meter"]["meter_id"] for r in results}) == 1200
+
+    listing = get_meters(
+        generate_api_gateway_proxy_event_v2("GET", "/meters"), lambda_context
+    )
+    assert json.loads(listing["body"])["total"] == 1200
+
+
+def test_post_meters_batch_ndjson(fresh_db, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "POST",
+        "/meters:batch",
+        body="\n".join(json.dumps(_meter(i)) for i in range(3)),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    response = post_meters_batch(event, lambda_context)
+
+    assert response["statusCode"] == 201
+    assert len(json.loads(response["body"])["results"]) == 3
+
+
+def test_post_meters_batch_partial_failure(db_meters, lambda_context):
+    items = [
+        _meter(0),
+        _meter(1, annual_quantity="NaN"),
+        _meter(0),
+        _meter(3, external_reference=db_meters[0].external_reference),
+        _meter(4, external_reference=None),
+        _meter(5),
+    ]
+    event = generate_api_gateway_proxy_event_v2(
+        "POST", "/meters:batch", body=json.dumps(items)
+    )
+    response = post_meters_batch(event, lambda_context)
+
+    assert response["statusCode"] == 207
+    results = json.loads(response["body"])["results"]
+    assert [r["index"] for r in results] == list(range(6))
+    assert [r["status"] for r in results] == [201, 400, 400, 400, 400, 201]
+    assert results[1]["details"][0]["loc"] == ["annual_quantity"]
+
+
+def test_post_meters_batch_not_a_list(fresh_db, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "POST", "/meters:batch", body=json.dumps(_meter(0))
+    )
+
+    assert post_meters_batch(event, lambda_context)["statusCode"] == 400
+
+
+def test_post_meters_batch_malformed_json(fresh_db, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "POST", "/meters:batch", body='[{"external_reference": "A",'
+    )
+    response = post_meters_batch(event, lambda_context)
+
+    assert response["statusCode"] == 400
+    assert "message" in json.loads(response["body"])
+
+
+def test_post_meters_batch_all_rejected(db_meters, lambda_context):
+    persistor = MeterPersistor()
+    version = persistor.get_collection_version()
+    event = generate_api_gateway_proxy_event_v2(
+        "POST",
+        "/meters:batch",
+        body=json.dumps(
+            [_meter(0, external_reference=db_meters[0].external_reference)]
+        ),
+    )
+    response = post_meters_batch(event, lambda_context)
+
+    assert response["statusCode"] == 207
+    assert persistor.get_collection_version() == version
+    persistor.close()
+
+
+def test_post_meters_batch_concurrent_duplicate(db_meters, lambda_context, monkeypatch):
+    # Another writer adds the reference between the lookup and the insert.
+    monkeypatch.setattr(
+        MeterPersistor, "get_existing_external_references", lambda self, refs: set()
+    )
+    event = generate_api_gateway_proxy_event_v2(
+        "POST",
+        "/meters:batch",
+        body=json.dumps(
+            [_meter(0, external_reference=db_meters[0].external_reference)]
+        ),
+    )
+    response = post_meters_batch(event, lambda_context)
+
+    assert response["statusCode"] == 400
+    assert "already exists" in json.loads(response["body"])["error"]
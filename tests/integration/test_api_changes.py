@@ -0,0 +1,190 @@
+import json
+from datetime import datetime
+from urllib.parse import urlparse
+
+from sqlalchemy import event, update
+
+from metr.api.meters import persistors
+from metr.api.meters.router import handle
+from metr.database import changes, database
+from metr.database.models import Meter
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _request(lambda_context, method, path, body=None, query_string=""):
+    event = generate_api_gateway_proxy_event_v2(
+        method,
+        path,
+        query_string=query_string,
+        body=json.dumps(body) if body is not None else "",
+        headers={"content-type": "application/merge-patch+json"},
+    )
+    return handle(event, lambda_context)
+
+
+def _changes(lambda_context, query_string):
+    response = _request(lambda_context, "GET", "/meters/changes", None, query_string)
+    assert response["statusCode"] == 200, response["body"]
+    return json.loads(response["body"])
+
+
+def _sync(lambda_context, watermark, page_size=100):
+    """Follow every page of changes since a watermark."""
+    changes = []
+    query_string = f"changed_since={watermark}&page_size={page_size}"
+    while query_string:
+        body = _changes(lambda_context, query_string)
+        changes.extend(body["changes"])
+        query_string = body["next_page"] and urlparse(body["next_page"]).query
+    return changes, body["watermark"]
+
+
+def test_changes_since_watermark(db_meters, lambda_context):
+    _, watermark = _sync(lambda_context, 0)
+    updated, deleted, bulk = db_meters[1], db_meters[2], db_meters[3]
+
+    _request(lambda_context, "PATCH", f"/meters/{updated.meter_id}", {"enabled": True})
+    _request(lambda_context, "DELETE", f"/meters/{deleted.meter_id}")
+    _request(
+        lambda_context,
+        "PATCH",
+        "/meters",
+        {"annual_quantity": 1.0},
+        f"meter_id={bulk.meter_id}",
+    )
+
+    body = _changes(lambda_context, f"changed_since={watermark}")
+
+    changes = body["changes"]
+    assert [(c["meter_id"], c["deleted"]) for c in changes] == [
+        (updated.meter_id, False),
+        (deleted.meter_id, True),
+        (bulk.meter_id, False),
+    ]
+    assert changes[0]["enabled"] is True
+    assert changes[1]["external_reference"] == deleted.external_reference
+    assert changes[1]["annual_quantity"] is None
+    assert [c["change_version"] for c in changes] == [
+        watermark + 1,
+        watermark + 2,
+        watermark + 3,
+    ]
+    assert body["watermark"] == watermark + 3
+    assert body["next_page"] is None
+
+    again = _changes(lambda_context, f"changed_since={body['watermark']}")
+    assert again == {"changes": [], "watermark": body["watermark"], "next_page": None}
+
+
+def test_changes_include_meters_from_before_the_feed(db_meters, lambda_context, capsys):
+    # The migration adds the change version column at 0 to existing meters.
+    with database.Session.kw["bind"].begin() as connection:
+        connection.execute(
+            update(Meter).where(Meter.meter_id < 3).values(change_version=0)
+        )
+    synced, watermark = _sync(lambda_context, 0)
+    assert {0, 1, 2}.isdisjoint(c["meter_id"] for c in synced)
+
+    assert changes.main([]) == 0
+    assert capsys.readouterr().out == "Stamped 3 meters.\n"
+    assert changes.main([]) == 0
+    assert capsys.readouterr().out == "Stamped 0 meters.\n"
+
+    synced, _ = _sync(lambda_context, 0)
+    assert {c["meter_id"] for c in synced} == {m.meter_id for m in db_meters}
+    synced, _ = _sync(lambda_context, watermark)
+    assert [c["meter_id"] for c in synced] == [0, 1, 2]
+
+
+def test_changes_ignore_clock_skew(db_meters, lambda_context, monkeypatch):
+    _, watermark = _sync(lambda_context, 0)
+    # A container whose clock lags behind stamps its writes in the past.
+    monkeypatch.setattr(persistors, "utcnow", lambda: datetime(2000, 1, 1))
+    meter = db_meters[4]
+
+    _request(
+        lambda_context,
+        "PUT",
+        "/meters/by-ref",
+        [
+            {
+                "external_reference": meter.external_reference,
+                "supply_start_date": "2021-01-01",
+                "supply_end_date": None,
+                "enabled": True,
+                "annual_quantity": 2.0,
+            }
+        ],
+    )
+
+    changes, _ = _sync(lambda_context, watermark)
+    assert [(c["meter_id"], c["changed_at"]) for c in changes] == [
+        (meter.meter_id, "2000-01-01T00:00:00")
+    ]
+
+
+def test_changes_watermark_within_a_version(db_meters, lambda_context):
+    _, watermark = _sync(lambda_context, 0)
+    _request(lambda_context, "PATCH", "/meters", {"enabled": True}, "meter_id__lt=3")
+
+    first = _changes(lambda_context, f"changed_since={watermark}&page_size=1")
+
+    # The other changes of the same write are on the next page, so the page
+    # does not move the watermark past their version.
+    assert len(first["changes"]) == 1
+    assert first["watermark"] == watermark
+    changes, last_watermark = _sync(lambda_context, first["watermark"])
+    assert [c["meter_id"] for c in changes] == [0, 1, 2]
+    assert last_watermark == watermark + 1
+
+
+def test_changes_paginate_with_cursor(db_meters, lambda_context):
+    seen = []
+    query_string = "changed_since=0&page_size=30"
+    while query_string:
+        body = _changes(lambda_context, query_string)
+        seen.extend(change["meter_id"] for change in body["changes"])
+        query_string = body["next_page"] and urlparse(body["next_page"]).query
+
+    assert sorted(seen) == [meter.meter_id for meter in db_meters]
+    assert len(seen) == len(set(seen))
+
+
+def test_changes_require_a_watermark(db_meters, lambda_context):
+    for query_string in (
+        "",
+        "changed_since=yesterday",
+        "changed_since=-1",
+        "changed_since=0&page_size=0",
+        "changed_since=0&page_size=x",
+        "cursor=nope",
+    ):
+        response = _request(
+            lambda_context, "GET", "/meters/changes", None, query_string
+        )
+        assert response["statusCode"] == 400
+
+
+def test_changes_are_found_through_indexes(db_meters, lambda_context):
+    engine = database.Session.kw["bind"]
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "meter_tombstone" in statement:
+            executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _changes(lambda_context, "changed_since=0")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    ((statement, parameters),) = executed
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "USING INDEX ix_meter_change_version" in details
+    assert "USING INDEX ix_meter_tombstone_change_version" in details
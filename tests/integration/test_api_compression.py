@@ -0,0 +1,71 @@
+import base64
+import gzip
+import json
+import zlib
+
+import pytest
+
+from metr.api.meters.views import get_meter, get_meters
+from metr.core.compression import response_compressor
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+@pytest.fixture
+def compressor(monkeypatch):
+    monkeypatch.setattr(response_compressor, "min_size", 256)
+    response_compressor.stats.reset()
+    yield response_compressor
+    response_compressor.stats.reset()
+
+
+def _get_meters(lambda_context, **headers):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", headers={"accept": "application/json", **headers}
+    )
+    return get_meters(event, lambda_context)
+
+
+def test_get_meters_gzip(db_meters, compressor, lambda_context):
+    plain = _get_meters(lambda_context)
+    response = _get_meters(lambda_context, **{"accept-encoding": "gzip, deflate"})
+
+    assert response["headers"]["content-encoding"] == "gzip"
+    assert response["headers"]["etag"] == plain["headers"]["etag"][:-1] + '-gzip"'
+    assert plain["headers"]["vary"] == response["headers"]["vary"] == "accept-encoding"
+    assert response["isBase64Encoded"] is True
+    body = gzip.decompress(base64.b64decode(response["body"]))
+    assert json.loads(body) == json.loads(plain["body"])
+    assert compressor.stats.compressed == 1
+
+
+def test_get_meters_deflate(db_meters, compressor, lambda_context):
+    response = _get_meters(lambda_context, **{"accept-encoding": "deflate"})
+
+    assert response["headers"]["content-encoding"] == "deflate"
+    body = zlib.decompress(base64.b64decode(response["body"]))
+    assert len(json.loads(body)["meters"]) == 20
+
+
+def test_get_meter_below_threshold(db_meters, compressor, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET",
+        f"/meters/{db_meters[0].meter_id}",
+        {"meter_id": str(db_meters[0].meter_id)},
+        headers={"accept": "application/json", "accept-encoding": "gzip"},
+    )
+    response = get_meter(event, lambda_context)
+
+    assert "content-encoding" not in response["headers"]
+    assert json.loads(response["body"])["meter_id"] == db_meters[0].meter_id
+    assert compressor.stats.skipped == 1
+
+
+def test_get_meters_gzip_not_modified(db_meters, compressor, lambda_context):
+    etag = _get_meters(lambda_context, **{"accept-encoding": "gzip"})["headers"]["etag"]
+
+    response = _get_meters(
+        lambda_context, **{"accept-encoding": "gzip", "if-none-match": etag}
+    )
+
+    assert response["statusCode"] == 304
+    assert response["headers"] == {"etag": etag, "vary": "accept-encoding"}
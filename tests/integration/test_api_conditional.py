@@ -0,0 +1,147 @@
+import json
+
+from sqlalchemy import event
+
+from metr.api.meters.views import (
+    delete_meter,
+    get_meter,
+    get_meters,
+    post_meters,
+    put_meter,
+)
+from metr.database import database
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _meter_body(meter_id, **changes):
+    body = {
+        "meter_id": meter_id,
+        "external_reference": "ETAG1",
+        "supply_start_date": "2021-01-01",
+        "supply_end_date": None,
+        "enabled": True,
+        "annual_quantity": 123.45,
+    }
+    body.update(changes)
+    return json.dumps(body)
+
+
+def _get_meter(meter_id, lambda_context, headers=None):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET",
+        f"/meters/{meter_id}",
+        {"meter_id": str(meter_id)},
+        headers={"accept": "application/json", **(headers or {})},
+    )
+    return get_meter(event, lambda_context)
+
+
+def test_get_meter_not_modified(db_meters, lambda_context):
+    meter_id = db_meters[0].meter_id
+    etag = _get_meter(meter_id, lambda_context)["headers"]["etag"]
+
+    response = _get_meter(meter_id, lambda_context, {"if-none-match": etag})
+
+    assert response["statusCode"] == 304
+    assert response["headers"]["etag"] == etag
+    assert "body" not in response
+
+
+def test_get_meter_etag_changes_on_update(db_meters, lambda_context):
+    meter_id = db_meters[1].meter_id
+    etag = _get_meter(meter_id, lambda_context)["headers"]["etag"]
+
+    put_event = generate_api_gateway_proxy_event_v2(
+        "PUT",
+        f"/meters/{meter_id}",
+        body=_meter_body(meter_id),
+        headers={"accept": "application/json", "if-match": etag},
+    )
+    updated = put_meter(put_event, lambda_context)
+    assert updated["statusCode"] == 200
+    assert updated["headers"]["etag"] != etag
+
+    response = _get_meter(meter_id, lambda_context, {"if-none-match": etag})
+    assert response["statusCode"] == 200
+    assert response["headers"]["etag"] == updated["headers"]["etag"]
+
+    # The old ETag no longer allows the update.
+    stale = put_meter(put_event, lambda_context)
+    assert stale["statusCode"] == 412
+
+
+def test_get_meters_not_modified_skips_meter_rows(db_meters, lambda_context):
+    headers = {"accept": "application/json"}
+    list_event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="page_size=5", headers=headers
+    )
+    etag = get_meters(list_event, lambda_context)["headers"]["etag"]
+
+    statements = []
+    engine = database.Session.kw["bind"]
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        list_event["headers"] = {**headers, "if-none-match": etag}
+        response = get_meters(list_event, lambda_context)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response["statusCode"] == 304
+    assert not [s for s in statements if "FROM meter " in s or s.endswith("meter")]
+
+
+def test_get_meters_etag_changes_on_write(db_meters, lambda_context):
+    list_event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", headers={"accept": "application/json"}
+    )
+    etag = get_meters(list_event, lambda_context)["headers"]["etag"]
+
+    post_meters(
+        generate_api_gateway_proxy_event_v2(
+            "POST", "/meters", body=_meter_body(1000, external_reference="ETAG2")
+        ),
+        lambda_context,
+    )
+
+    list_event["headers"]["if-none-match"] = etag
+    response = get_meters(list_event, lambda_context)
+    assert response["statusCode"] == 200
+    assert response["headers"]["etag"] != etag
+
+
+def test_delete_meter_if_match(db_meters, lambda_context):
+    meter_id = db_meters[2].meter_id
+    etag = _get_meter(meter_id, lambda_context)["headers"]["etag"]
+    stale_etag = etag.replace(".1.", ".0.")
+
+    def _delete(if_match):
+        event = generate_api_gateway_proxy_event_v2(
+            "DELETE",
+            f"/meters/{meter_id}",
+            {"meter_id": str(meter_id)},
+            headers={"if-match": if_match},
+        )
+        return delete_meter(event, lambda_context)
+
+    assert _delete(stale_etag)["statusCode"] == 412
+    assert _delete(etag)["statusCode"] == 204
+    assert _delete(etag)["statusCode"] == 400
+
+
+def test_delete_meter_if_match_any_listed_etag(db_meters, lambda_context):
+    meter_id = db_meters[3].meter_id
+    etag = _get_meter(meter_id, lambda_context)["headers"]["etag"]
+    stale_etag = etag.replace(".1.", ".0.")
+
+    event = generate_api_gateway_proxy_event_v2(
+        "DELETE",
+        f"/meters/{meter_id}",
+        {"meter_id": str(meter_id)},
+        headers={"if-match": f"{stale_etag}, {etag}"},
+    )
+
+    assert delete_meter(event, lambda_context)["statusCode"] == 204
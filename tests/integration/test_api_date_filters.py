@@ -0,0 +1,162 @@
+import json
+import random
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+
+from metr.api.meters.persistors import MeterPersistor
+from metr.api.meters.views import get_meters
+from metr.database import database
+from metr.database.models import Meter
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _meter_ids(lambda_context, **params):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string=urlencode({**params, "page_size": 100})
+    )
+    response = get_meters(event, lambda_context)
+    assert response["statusCode"] == 200, response["body"]
+    return {meter["meter_id"] for meter in json.loads(response["body"])["meters"]}
+
+
+def test_supply_end_date_filter(db_meters, lambda_context):
+    since = date.today() + timedelta(days=300)
+    expected = {
+        m.meter_id
+        for m in db_meters
+        if m.supply_end_date is not None and m.supply_end_date >= since
+    }
+
+    assert _meter_ids(lambda_context, supply_end_date=since.isoformat()) == expected
+
+
+def test_supply_date_range_filters(db_meters, lambda_context):
+    low = date.today() + timedelta(days=20)
+    high = date.today() + timedelta(days=40)
+
+    assert _meter_ids(
+        lambda_context,
+        supply_start_date__gte=low.isoformat(),
+        supply_start_date__lte=high.isoformat(),
+    ) == {m.meter_id for m in db_meters if low <= m.supply_start_date <= high}
+    assert _meter_ids(
+        lambda_context,
+        supply_end_date__gte=low.isoformat(),
+        supply_end_date__lte=high.isoformat(),
+    ) == {
+        m.meter_id
+        for m in db_meters
+        if m.supply_end_date is not None and low <= m.supply_end_date <= high
+    }
+
+
+def test_active_on_filter(db_meters, lambda_context):
+    day = date.today() + timedelta(days=50)
+    expected = {
+        m.meter_id
+        for m in db_meters
+        if m.supply_start_date <= day
+        and (m.supply_end_date is None or m.supply_end_date > day)
+    }
+
+    assert _meter_ids(lambda_context, active_on=day.isoformat()) == expected
+
+
+def test_invalid_date_filter(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="active_on=yesterday"
+    )
+    response = get_meters(event, lambda_context)
+
+    assert response["statusCode"] == 400
+
+
+@pytest.fixture(scope="module")
+def analyzed_engine():
+    """A separate database of meters, with planner statistics."""
+    rng = random.Random(0)
+    rows = []
+    for i in range(5000):
+        supply_start = datetime(2015, 1, 1) + timedelta(days=rng.randrange(3650))
+        rows.append(
+            {
+                "external_reference": f"REF{i}",
+                "supply_start_date": supply_start,
+                "supply_end_date": (
+                    supply_start + timedelta(days=rng.randrange(30, 730))
+                    if i % 4
+                    else None
+                ),
+                "enabled": bool(i % 3),
+                "annual_quantity": rng.random() * 100_000,
+            }
+        )
+
+    engine = create_engine("sqlite://", future=True)
+    database.Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Meter), rows)
+        connection.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "filters, steps",
+    [
+        # A day matches many meters: the page is read in meter_id order until
+        # it is full, and the total is counted from the covering index.
+        (
+            {"active_on": date(2021, 1, 1)},
+            ["SCAN meter", "SEARCH meter USING COVERING INDEX ix_meter_supply_window"],
+        ),
+        (
+            {
+                "supply_start_date__gte": datetime(2020, 1, 1),
+                "supply_start_date__lte": datetime(2020, 2, 1),
+            },
+            [
+                "SEARCH meter USING INDEX ix_meter_supply_window",
+                "SEARCH meter USING COVERING INDEX ix_meter_supply_window",
+                "USE TEMP B-TREE FOR ORDER BY",
+            ],
+        ),
+        (
+            {
+                "supply_end_date__gte": datetime(2020, 1, 1),
+                "supply_end_date__lte": datetime(2020, 2, 1),
+            },
+            [
+                "SEARCH meter USING INDEX ix_meter_supply_end_date",
+                "SEARCH meter USING COVERING INDEX ix_meter_supply_end_date",
+                "USE TEMP B-TREE FOR ORDER BY",
+            ],
+        ),
+    ],
+)
+def test_date_filter_query_plans(fresh_db, analyzed_engine, filters, steps):
+    engine = database.Session.kw["bind"]
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with MeterPersistor() as persistor:
+            persistor.get_meters(page_size="20", with_total=True, **filters)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    statement, parameters = executed[0]
+    with analyzed_engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+
+    details = [row[-1] for row in plan]
+    for step in steps:
+        assert any(detail.startswith(step) for detail in details), details
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+import types
+
+from metr.api.meters.persistors import MeterPersistor
+from metr.api.meters.views import export_meters
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def test_export_meters_ndjson(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2("GET", "/meters/export")
+    response = export_meters(event, lambda_context)
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["content-type"] == "application/x-ndjson"
+    assert isinstance(response["body"], types.GeneratorType)
+
+    lines = "".join(response["body"]).splitlines()
+    meters = [json.loads(line) for line in lines]
+    assert [(m["meter_id"], m["external_reference"]) for m in meters] == [
+        (m.meter_id, m.external_reference) for m in db_meters
+    ]
+
+
+def test_export_meters_csv(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters/export", headers={"accept": "text/csv"}
+    )
+    response = export_meters(event, lambda_context)
+
+    assert response["headers"]["content-type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO("".join(response["body"]))))
+    assert [int(row["meter_id"]) for row in rows] == [m.meter_id for m in db_meters]
+
+
+def test_export_meters_filtered(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters/export", query_string="format=ndjson&enabled=1"
+    )
+    lines = "".join(export_meters(event, lambda_context)["body"]).splitlines()
+
+    assert len(lines) == sum(1 for m in db_meters if m.enabled)
+
+
+def test_export_meters_empty_csv_has_header(fresh_db, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters/export", query_string="format=csv"
+    )
+    body = "".join(export_meters(event, lambda_context)["body"])
+
+    assert body.splitlines() == [
+        "meter_id,external_reference,supply_start_date,supply_end_date,"
+        "enabled,annual_quantity"
+    ]
+
+
+def test_export_meters_invalid_format(fresh_db, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters/export", query_string="format=parquet"
+    )
+
+    assert export_meters(event, lambda_context)["statusCode"] == 400
+
+
+def test_iter_meters_chunks(db_meters):
+    chunks = list(MeterPersistor().iter_meters(chunk_size=30))
+
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+import xml.etree.ElementTree as ElementTree
+from urllib.parse import urlsplit
+
+from sqlalchemy import event
+
+from metr.api.meters.views import export_meters, get_meters
+from metr.database import database
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _get_meters(lambda_context, query_string, accept="application/json"):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string=query_string, headers={"accept": accept}
+    )
+    return get_meters(event, lambda_context)
+
+
+def test_get_meters_fields_json(db_meters, lambda_context):
+    response = _get_meters(lambda_context, "fields=enabled,meter_id")
+
+    meters = json.loads(response["body"])["meters"]
+    assert meters
+    assert all(list(meter) == ["meter_id", "enabled"] for meter in meters)
+
+
+def test_get_meters_fields_csv(db_meters, lambda_context):
+    response = _get_meters(
+        lambda_context, "fields=external_reference,supply_end_date", "text/csv"
+    )
+
+    rows = list(csv.reader(io.StringIO(response["body"])))
+    assert rows[0] == ["external_reference", "supply_end_date"]
+    assert len(rows) == 21
+
+
+def test_get_meters_fields_narrow_select(db_meters, lambda_context):
+    statements = []
+    engine = database.Session.kw["bind"]
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _get_meters(lambda_context, "fields=meter_id,enabled&count=none")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    (select,) = [s for s in statements if "FROM meter" in s]
+    assert "annual_quantity" not in select
+    assert "external_reference" not in select
+
+
+def test_get_meters_fields_cursor_crawl(db_meters, lambda_context):
+    seen = []
+    next_page = "/meters?fields=enabled&order_by=-annual_quantity&page_size=30"
+    while next_page:
+        url = urlsplit(next_page)
+        body = json.loads(_get_meters(lambda_context, url.query)["body"])
+        assert all(list(meter) == ["enabled"] for meter in body["meters"])
+        seen.extend(body["meters"])
+        next_page = body["next_page"]
+
+    assert len(seen) == len(db_meters)
+
+
+def test_get_meters_unknown_field(db_meters, lambda_context):
+    response = _get_meters(lambda_context, "fields=meter_id,colour")
+
+    assert response["statusCode"] == 400
+    assert "colour" in json.loads(response["body"])["error"]
+
+
+def test_export_meters_fields(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters/export", query_string="format=csv&fields=meter_id"
+    )
+    body = "".join(export_meters(event, lambda_context)["body"])
+
+    assert body.splitlines()[:2] == ["meter_id", str(db_meters[0].meter_id)]
+
+
+def test_get_meters_fields_xml(db_meters, lambda_context):
+    response = _get_meters(lambda_context, "fields=meter_id,enabled", "application/xml")
+
+    root = ElementTree.fromstring(response["body"])
+    items = root.findall("meters/item")
+    assert response["headers"]["content-type"] == "application/xml"
+    assert len(items) == 20
+    assert all(
+        [child.tag for child in item] == ["meter_id", "enabled"] for item in items
+    )
@@ -0,0 +1,133 @@
+import json
+from datetime import datetime
+from urllib.parse import urlencode
+
+from sqlalchemy import event
+
+from metr.api.meters.caches import statement_cache
+from metr.api.meters.persistors import MeterPersistor
+from metr.api.meters.views import get_meters
+from metr.database import database
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _get_meters(lambda_context, **params):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string=urlencode({**params, "page_size": 100})
+    )
+    return get_meters(event, lambda_context)
+
+
+def _meter_ids(lambda_context, **params):
+    response = _get_meters(lambda_context, **params)
+    assert response["statusCode"] == 200, response["body"]
+    return {meter["meter_id"] for meter in json.loads(response["body"])["meters"]}
+
+
+def test_filter_operators(db_meters, lambda_context):
+    median = sorted(m.annual_quantity for m in db_meters)[50]
+
+    assert _meter_ids(lambda_context, meter_id__in="3,5,7,1000") == {3, 5, 7}
+    assert _meter_ids(lambda_context, meter_id__ne="0") == set(range(1, 100))
+    assert _meter_ids(lambda_context, meter_id__gt="10", meter_id__lte="12") == {
+        11,
+        12,
+    }
+    assert _meter_ids(lambda_context, annual_quantity__lt=str(median)) == {
+        m.meter_id for m in db_meters if m.annual_quantity < median
+    }
+    assert _meter_ids(lambda_context, supply_end_date__is_null="true") == {
+        m.meter_id for m in db_meters if m.supply_end_date is None
+    }
+    assert _meter_ids(lambda_context, enabled__eq="false") == {
+        m.meter_id for m in db_meters if not m.enabled
+    }
+
+
+def test_prefix_filter_matches_literally(db_meters, lambda_context):
+    reference = db_meters[7].external_reference
+
+    assert 7 in _meter_ids(lambda_context, external_reference__prefix=reference[:3])
+    assert _meter_ids(lambda_context, external_reference__prefix="%") == {
+        m.meter_id for m in db_meters if m.external_reference.startswith("%")
+    }
+
+
+def test_prefix_filter_is_case_sensitive(fresh_db, lambda_context):
+    with MeterPersistor() as persistor:
+        rows, _ = persistor.upsert_meters(
+            [
+                {
+                    "external_reference": reference,
+                    "supply_start_date": datetime(2020, 1, 1),
+                    "supply_end_date": None,
+                    "enabled": True,
+                    "annual_quantity": 1.0,
+                }
+                for reference in ("ABC1", "abc2", "abd", "ab")
+            ]
+        )
+    meter_ids = {row.external_reference: row.meter_id for row in rows}
+
+    assert _meter_ids(lambda_context, external_reference__prefix="abc") == {
+        meter_ids["abc2"]
+    }
+    assert _meter_ids(lambda_context, external_reference__prefix="AB") == {
+        meter_ids["ABC1"]
+    }
+
+
+def test_prefix_filter_uses_the_index(db_meters, lambda_context):
+    engine = database.Session.kw["bind"]
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "external_reference >=" in statement:
+            executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _meter_ids(lambda_context, external_reference__prefix="abc")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert executed
+    for statement, parameters in executed:
+        with engine.connect() as connection:
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).all()
+
+        details = " ".join(row[-1] for row in plan)
+        assert "INDEX ix_meter_external_reference" in details, details
+        assert "SCAN meter" not in details, details
+
+
+def test_prefix_filter_on_non_text_fields(db_meters, lambda_context):
+    for field, value in (
+        ("meter_id", "1"),
+        ("enabled", "t"),
+        ("annual_quantity", "1"),
+        ("supply_start_date", "2020"),
+    ):
+        response = _get_meters(lambda_context, **{f"{field}__prefix": value})
+
+        assert response["statusCode"] == 400
+
+
+def test_unknown_filter(db_meters, lambda_context):
+    response = _get_meters(lambda_context, meter_id__between="1,2")
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["error"] == "Unknown filter: meter_id__between"
+
+
+def test_statements_are_cached_per_shape(db_meters, lambda_context):
+    statement_cache.clear()
+    statement_cache.backend.stats.reset()
+
+    _meter_ids(lambda_context, meter_id__in="1,2")
+    _meter_ids(lambda_context, meter_id__in="3,4,5")
+    _meter_ids(lambda_context, meter_id__gt="3")
+
+    assert statement_cache.stats == {"hits": 1, "misses": 2, "evictions": 0}
@@ -0,0 +1,105 @@
+import json
+from typing import Any, Dict, Hashable
+
+import pytest
+
+from metr.api.meters.caches import meter_cache
+from metr.api.meters.views import delete_meter, get_meter, put_meter
+from metr.core.cache import CacheBackend
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+# Stands in for a cache shared between containers, e.g. a memcached cluster.
+_shared_store: Dict[Hashable, Any] = {}
+
+
+class SharedDictCacheBackend(CacheBackend):
+    def _get(self, key):
+        return _shared_store.get(key)
+
+    def _set(self, key, value):
+        _shared_store[key] = value
+
+    def _delete(self, key):
+        _shared_store.pop(key, None)
+
+    def _clear(self):
+        _shared_store.clear()
+
+
+@pytest.fixture()
+def shared_meter_cache():
+    backend = meter_cache.backend
+    meter_cache.configure(SharedDictCacheBackend())
+    yield meter_cache
+    meter_cache.clear()
+    meter_cache.configure(backend)
+
+
+def _get(meter_id, lambda_context, **headers):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET",
+        f"/meters/{meter_id}",
+        {"meter_id": str(meter_id)},
+        headers={"accept": "application/json", **headers},
+    )
+    return get_meter(event, lambda_context)
+
+
+def test_get_meter_served_from_cache(db_meters, shared_meter_cache, lambda_context):
+    meter_id = db_meters[0].meter_id
+    first = _get(meter_id, lambda_context)
+    second = _get(meter_id, lambda_context)
+
+    assert second == first
+    assert shared_meter_cache.stats == {"hits": 1, "misses": 1, "evictions": 0}
+
+    not_modified = _get(
+        meter_id, lambda_context, **{"if-none-match": first["headers"]["etag"]}
+    )
+    assert not_modified["statusCode"] == 304
+    assert shared_meter_cache.stats["hits"] == 2
+
+
+def test_get_meter_cache_invalidated_by_update(
+    db_meters, shared_meter_cache, lambda_context
+):
+    meter_id = db_meters[1].meter_id
+    _get(meter_id, lambda_context)
+
+    put_meter(
+        generate_api_gateway_proxy_event_v2(
+            "PUT",
+            f"/meters/{meter_id}",
+            body=json.dumps(
+                {
+                    "meter_id": meter_id,
+                    "external_reference": "CACHED1",
+                    "supply_start_date": "2021-01-01",
+                    "supply_end_date": None,
+                    "enabled": True,
+                    "annual_quantity": 1.5,
+                }
+            ),
+            headers={"accept": "application/json"},
+        ),
+        lambda_context,
+    )
+
+    meter = json.loads(_get(meter_id, lambda_context)["body"])
+    assert meter["annual_quantity"] == 1.5
+
+
+def test_get_meter_cache_invalidated_by_delete(
+    db_meters, shared_meter_cache, lambda_context
+):
+    meter_id = db_meters[2].meter_id
+    assert _get(meter_id, lambda_context)["statusCode"] == 200
+
+    delete_meter(
+        generate_api_gateway_proxy_event_v2(
+            "DELETE", f"/meters/{meter_id}", {"meter_id": str(meter_id)}
+        ),
+        lambda_context,
+    )
+
+    assert _get(meter_id, lambda_context)["statusCode"] == 400
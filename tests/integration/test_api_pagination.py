@@ -0,0 +1,172 @@
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from metr.api.meters.views import delete_meter, get_meters
+from metr.database import database
+from metr.database.models import Meter
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _crawl(lambda_context, query_string):
+    seen = []
+    next_page = f"/meters?{query_string}"
+    while next_page:
+        url = urlsplit(next_page)
+        event = generate_api_gateway_proxy_event_v2(
+            "GET", url.path, query_string=url.query
+        )
+        response = get_meters(event, lambda_context)
+        assert response["statusCode"] == 200
+        body = json.loads(response["body"])
+        assert len(body["meters"]) <= body["page_size"]
+        seen.extend(body["meters"])
+        next_page = body["next_page"]
+    return seen
+
+
+@pytest.mark.parametrize(
+    "order_by",
+    [
+        None,
+        "meter_id",
+        "-meter_id",
+        "external_reference",
+        "-supply_start_date",
+        "supply_end_date",
+        "-supply_end_date",
+        "enabled",
+        "-annual_quantity",
+    ],
+)
+def test_get_meters_cursor_crawl(order_by, db_meters, lambda_context):
+    query_string = "page_size=7"
+    if order_by:
+        query_string += f"&order_by={order_by}"
+
+    seen = _crawl(lambda_context, query_string)
+
+    assert sorted(m["meter_id"] for m in seen) == [m.meter_id for m in db_meters]
+    if order_by:
+        column = order_by.lstrip("-")
+        values = [m[column] for m in seen if m[column] is not None]
+        assert values == sorted(values, reverse=order_by.startswith("-"))
+
+
+def test_get_meters_cursor_keeps_filters(db_meters, lambda_context):
+    seen = _crawl(lambda_context, "page_size=5&enabled=1")
+
+    assert len(seen) == sum(1 for m in db_meters if m.enabled)
+
+
+def test_get_meters_page_then_cursor(db_meters, lambda_context):
+    first = _crawl(lambda_context, "page_size=10")
+    from_page = _crawl(lambda_context, "page=3&page_size=10")
+
+    assert from_page == first[20:]
+
+
+def test_get_meters_invalid_cursor(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="cursor=not-a-cursor"
+    )
+    response = get_meters(event, lambda_context)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])
+
+
+def test_get_meters_unknown_order_by(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="order_by=colour"
+    )
+    response = get_meters(event, lambda_context)
+
+    assert response["statusCode"] == 400
+
+
+@pytest.mark.parametrize("query_string", ["", "page=3&page_size=10", "enabled=1"])
+def test_get_meters_count_modes_agree(query_string, db_meters, lambda_context):
+    totals = {}
+    for mode in ("exact", "estimate"):
+        event = generate_api_gateway_proxy_event_v2(
+            "GET", "/meters", query_string=f"{query_string}&count={mode}"
+        )
+        response = get_meters(event, lambda_context)
+        assert response["statusCode"] == 200
+        totals[mode] = json.loads(response["body"])["total"]
+
+    assert totals["exact"] == totals["estimate"]
+
+
+def test_get_meters_exact_count_past_last_page(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="page=50&page_size=10"
+    )
+    body = json.loads(get_meters(event, lambda_context)["body"])
+
+    assert body["meters"] == []
+    assert body["total"] == len(db_meters)
+    assert body["next_page"] is None
+
+
+@pytest.mark.parametrize(
+    "query_string",
+    ["page_size=0", "page_size=-1", "page_size=ten", "page=0", "page=-2", "page=x"],
+)
+def test_get_meters_invalid_paging(db_meters, lambda_context, query_string):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string=query_string
+    )
+
+    assert get_meters(event, lambda_context)["statusCode"] == 400
+
+
+def test_get_meters_count_none(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="page_size=10&count=none"
+    )
+    body = json.loads(get_meters(event, lambda_context)["body"])
+
+    assert body["total"] is None
+    assert len(body["meters"]) == 10
+    assert body["next_page"]
+
+
+def test_get_meters_estimate_invalidated_by_delete(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="count=estimate"
+    )
+    assert json.loads(get_meters(event, lambda_context)["body"])["total"] == 100
+
+    meter_id = db_meters[-1].meter_id
+    delete_meter(
+        generate_api_gateway_proxy_event_v2(
+            "DELETE", f"/meters/{meter_id}", {"meter_id": str(meter_id)}
+        ),
+        lambda_context,
+    )
+
+    assert json.loads(get_meters(event, lambda_context)["body"])["total"] == 99
+
+
+def test_get_meters_invalid_count_mode(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="count=roughly"
+    )
+
+    assert get_meters(event, lambda_context)["statusCode"] == 400
+
+
+def test_get_meters_matches_orm_serialization(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="page_size=100"
+    )
+    body = json.loads(get_meters(event, lambda_context)["body"])
+
+    with database.Session() as session:
+        meters = session.query(Meter).order_by(Meter.meter_id).all()
+        expected = json.dumps([meter.as_dict() for meter in meters])
+
+    assert json.dumps(body["meters"]) == expected
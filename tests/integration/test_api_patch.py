@@ -0,0 +1,87 @@
+import json
+
+from metr.api.meters.views import get_meter, get_meters, patch_meter, patch_meters
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _patch(meter_id, patch, lambda_context, **headers):
+    event = generate_api_gateway_proxy_event_v2(
+        "PATCH",
+        f"/meters/{meter_id}",
+        {"meter_id": str(meter_id)},
+        body=json.dumps(patch),
+        headers={"content-type": "application/merge-patch+json", **headers},
+    )
+    return patch_meter(event, lambda_context)
+
+
+def test_patch_meter_sets_given_fields(db_meters, assert_num_queries, lambda_context):
+    meter = db_meters[1]
+    # UPDATE ... RETURNING and the collection version bump.
+    with assert_num_queries(2):
+        response = _patch(
+            meter.meter_id,
+            {"enabled": not meter.enabled, "supply_end_date": None},
+            lambda_context,
+        )
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["enabled"] is not meter.enabled
+    assert body["supply_end_date"] is None
+    assert body["external_reference"] == meter.external_reference
+    assert body["annual_quantity"] == meter.annual_quantity
+
+
+def test_patch_meter_honours_if_match(db_meters, lambda_context):
+    meter_id = db_meters[1].meter_id
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", f"/meters/{meter_id}", {"meter_id": str(meter_id)}
+    )
+    etag = get_meter(event, lambda_context)["headers"]["etag"]
+
+    first = _patch(meter_id, {"enabled": True}, lambda_context, **{"if-match": etag})
+    second = _patch(meter_id, {"enabled": False}, lambda_context, **{"if-match": etag})
+
+    assert first["statusCode"] == 200
+    assert first["headers"]["etag"] != etag
+    assert second["statusCode"] == 412
+
+
+def test_patch_meter_rejects_invalid_patches(db_meters, lambda_context):
+    meter_id = db_meters[1].meter_id
+
+    assert _patch(meter_id, {"enabled": None}, lambda_context)["statusCode"] == 400
+    assert _patch(meter_id, {"meter_id": 5}, lambda_context)["statusCode"] == 400
+    assert _patch(meter_id, {}, lambda_context)["statusCode"] == 400
+    assert _patch(999999, {"enabled": True}, lambda_context)["statusCode"] == 400
+
+
+def test_patch_meters_by_filter(db_meters, assert_num_queries, lambda_context):
+    enabled = sum(meter.enabled for meter in db_meters)
+    event = generate_api_gateway_proxy_event_v2(
+        "PATCH",
+        "/meters",
+        query_string="enabled=true",
+        body=json.dumps({"enabled": False}),
+    )
+    # One UPDATE ... RETURNING and the collection version bump.
+    with assert_num_queries(2):
+        response = patch_meters(event, lambda_context)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"updated": enabled}
+
+    listing = get_meters(
+        generate_api_gateway_proxy_event_v2("GET", "/meters"), lambda_context
+    )
+    meters = json.loads(listing["body"])["meters"]
+    assert not any(meter["enabled"] for meter in meters)
+
+
+def test_patch_meters_requires_filter(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "PATCH", "/meters", body=json.dumps({"enabled": False})
+    )
+
+    assert patch_meters(event, lambda_context)["statusCode"] == 400
@@ -0,0 +1,89 @@
+import json
+
+from metr.api.meters.views import delete_meter, get_meter, post_meters, put_meter
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _meter_body(**changes):
+    body = {
+        "meter_id": 1,
+        "external_reference": "COUNT1",
+        "supply_start_date": "2021-01-01T00:00:00",
+        "supply_end_date": None,
+        "enabled": True,
+        "annual_quantity": 123.45,
+    }
+    body.update(changes)
+    return json.dumps(body)
+
+
+def test_post_meter_statements(fresh_db, assert_num_queries, lambda_context):
+    event = generate_api_gateway_proxy_event_v2("POST", "/meters", body=_meter_body())
+    # INSERT ... RETURNING and the collection version bump.
+    with assert_num_queries(2):
+        response = post_meters(event, lambda_context)
+
+    assert response["statusCode"] == 201
+    assert json.loads(response["body"])["external_reference"] == "COUNT1"
+
+
+def test_post_meter_duplicate_statements(db_meters, assert_num_queries, lambda_context):
+    body = _meter_body(external_reference=db_meters[0].external_reference)
+    event = generate_api_gateway_proxy_event_v2("POST", "/meters", body=body)
+    with assert_num_queries(1):
+        response = post_meters(event, lambda_context)
+
+    assert response["statusCode"] == 400
+    assert "already exists" in json.loads(response["body"])["error"]
+
+
+def test_put_meter_statements(db_meters, assert_num_queries, lambda_context):
+    meter = db_meters[1]
+    event = generate_api_gateway_proxy_event_v2(
+        "PUT",
+        f"/meters/{meter.meter_id}",
+        body=_meter_body(
+            meter_id=meter.meter_id, external_reference=meter.external_reference
+        ),
+    )
+    # UPDATE ... RETURNING and the collection version bump.
+    with assert_num_queries(2):
+        response = put_meter(event, lambda_context)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["annual_quantity"] == 123.45
+
+
+def test_put_meter_duplicate_reference(db_meters, assert_num_queries, lambda_context):
+    meter = db_meters[1]
+    event = generate_api_gateway_proxy_event_v2(
+        "PUT",
+        f"/meters/{meter.meter_id}",
+        body=_meter_body(
+            meter_id=meter.meter_id,
+            external_reference=db_meters[2].external_reference,
+        ),
+    )
+    with assert_num_queries(1):
+        response = put_meter(event, lambda_context)
+
+    assert response["statusCode"] == 400
+
+
+def test_get_meter_statements(db_meters, assert_num_queries, lambda_context):
+    meter_id = db_meters[0].meter_id
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", f"/meters/{meter_id}", {"meter_id": str(meter_id)}
+    )
+    with assert_num_queries(1):
+        assert get_meter(event, lambda_context)["statusCode"] == 200
+
+
+def test_delete_meter_statements(db_meters, assert_num_queries, lambda_context):
+    meter_id = db_meters[0].meter_id
+    event = generate_api_gateway_proxy_event_v2(
+        "DELETE", f"/meters/{meter_id}", {"meter_id": str(meter_id)}
+    )
+    # DELETE, the tombstone and the collection version bump.
+    with assert_num_queries(3):
+        assert delete_meter(event, lambda_context)["statusCode"] == 204
@@ -0,0 +1,77 @@
+import json
+from urllib.parse import quote
+
+import pytest
+
+from metr.api.meters import router
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def test_router_dispatches_list(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters", query_string="page_size=5"
+    )
+    response = router.handle(event, lambda_context)
+
+    assert response["statusCode"] == 200
+    assert len(json.loads(response["body"])["meters"]) == 5
+
+
+def test_router_fills_path_parameters(db_meters, lambda_context):
+    meter_id = db_meters[0].meter_id
+    event = generate_api_gateway_proxy_event_v2("GET", f"/meters/{meter_id}")
+    response = router.handle(event, lambda_context)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["meter_id"] == meter_id
+
+
+def test_router_prefers_exact_paths(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2("GET", "/meters/export")
+    response = router.handle(event, lambda_context)
+
+    assert response["headers"]["content-type"] == "application/x-ndjson"
+    assert len(list(response["body"])) >= 1
+
+
+def test_router_unquotes_external_reference(fresh_db, lambda_context):
+    reference = "A/B C"
+    event = generate_api_gateway_proxy_event_v2(
+        "PUT",
+        f"/meters/by-ref/{quote(reference, safe='')}",
+        body=json.dumps(
+            {"supply_start_date": "2021-01-01T00:00:00", "annual_quantity": 10.0}
+        ),
+    )
+    response = router.handle(event, lambda_context)
+
+    assert response["statusCode"] in (200, 201)
+    assert json.loads(response["body"])["external_reference"] == reference
+
+
+def test_router_uses_route_key(db_meters, lambda_context):
+    meter_id = db_meters[0].meter_id
+    event = generate_api_gateway_proxy_event_v2(
+        "DELETE", f"/meters/{meter_id}", {"meter_id": str(meter_id)}
+    )
+    event["routeKey"] = "DELETE /meters/{meter_id}"
+
+    assert router.handle(event, lambda_context)["statusCode"] == 204
+
+
+@pytest.mark.parametrize(
+    "method, path, status_code",
+    [
+        ("GET", "/unknown", 404),
+        ("GET", "/meters/1/extra", 404),
+        ("DELETE", "/meters", 405),
+        ("POST", "/meters/1", 405),
+        ("GET", "/meters/by-ref", 405),
+    ],
+)
+def test_router_rejects_unknown_routes(method, path, status_code, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(method, path)
+    response = router.handle(event, lambda_context)
+
+    assert response["statusCode"] == status_code
+    assert json.loads(response["body"])["status_code"] == status_code
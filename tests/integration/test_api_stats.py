@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from collections import defaultdict
+
+import pytest
+
+from metr.api.meters.router import handle
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _get_stats(lambda_context, query_string="", accept="application/json"):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters/stats", query_string=query_string, headers={"accept": accept}
+    )
+    return handle(event, lambda_context)
+
+
+def test_stats_of_every_meter(db_meters, assert_num_queries, lambda_context):
+    quantities = [m.annual_quantity for m in db_meters]
+
+    # The collection version, for the ETag, and the aggregate itself.
+    with assert_num_queries(2):
+        response = _get_stats(lambda_context)
+
+    assert response["statusCode"] == 200
+    (stats,) = json.loads(response["body"])["stats"]
+    assert stats["count"] == 100
+    assert stats["sum"] == pytest.approx(sum(quantities))
+    assert stats["avg"] == pytest.approx(sum(quantities) / 100)
+    assert stats["min"] == min(quantities)
+    assert stats["max"] == max(quantities)
+
+
+def test_stats_grouped_and_filtered(db_meters, lambda_context):
+    expected = defaultdict(list)
+    for meter in db_meters:
+        if meter.meter_id >= 50:
+            key = (meter.enabled, meter.supply_end_date is not None)
+            expected[key].append(meter.annual_quantity)
+
+    response = _get_stats(
+        lambda_context, "group_by=enabled,has_supply_end_date&meter_id__gte=50"
+    )
+
+    groups = json.loads(response["body"])["stats"]
+    assert [(g["enabled"], g["has_supply_end_date"]) for g in groups] == sorted(
+        expected
+    )
+    for group in groups:
+        quantities = expected[(group["enabled"], group["has_supply_end_date"])]
+        assert group["count"] == len(quantities)
+        assert group["sum"] == pytest.approx(sum(quantities))
+
+
+def test_stats_by_month_as_csv(db_meters, lambda_context):
+    expected = defaultdict(int)
+    for meter in db_meters:
+        expected[meter.supply_start_date.strftime("%Y-%m")] += 1
+
+    response = _get_stats(lambda_context, "group_by=supply_start_month", "text/csv")
+
+    assert response["headers"]["content-type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response["body"])))
+    assert list(rows[0]) == ["supply_start_month", "count", "sum", "avg", "min", "max"]
+    assert {row["supply_start_month"]: int(row["count"]) for row in rows} == expected
+
+
+def test_stats_unknown_group(db_meters, lambda_context):
+    response = _get_stats(lambda_context, "group_by=colour")
+
+    assert response["statusCode"] == 400
@@ -0,0 +1,147 @@
+import json
+from urllib.parse import quote
+
+from metr.api.meters.views import (
+    get_changes,
+    get_meters,
+    put_meter_by_ref,
+    put_meters_by_ref,
+)
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _meter(external_reference, **changes):
+    meter = {
+        "external_reference": external_reference,
+        "supply_start_date": "2021-01-01",
+        "supply_end_date": None,
+        "enabled": True,
+        "annual_quantity": 123.45,
+    }
+    meter.update(changes)
+    return meter
+
+
+def _put_by_ref(external_reference, body, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "PUT",
+        f"/meters/by-ref/{quote(external_reference)}",
+        {"external_reference": external_reference},
+        body=json.dumps(body),
+    )
+    return put_meter_by_ref(event, lambda_context)
+
+
+def _put_many(items, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "PUT", "/meters/by-ref", body=json.dumps(items)
+    )
+    return put_meters_by_ref(event, lambda_context)
+
+
+def _changes(watermark, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", "/meters/changes", query_string=f"changed_since={watermark}"
+    )
+    body = json.loads(get_changes(event, lambda_context)["body"])
+    return body["changes"], body["watermark"]
+
+
+def test_put_meter_by_ref_creates_then_updates(fresh_db, lambda_context):
+    created = _put_by_ref("UPSERT1", _meter("UPSERT1"), lambda_context)
+    assert created["statusCode"] == 201
+    meter = json.loads(created["body"])
+
+    updated = _put_by_ref(
+        "UPSERT1", _meter("UPSERT1", annual_quantity=99.0), lambda_context
+    )
+    assert updated["statusCode"] == 200
+    assert json.loads(updated["body"]) == {**meter, "annual_quantity": 99.0}
+
+
+def test_put_meter_by_ref_existing(db_meters, lambda_context):
+    existing = db_meters[3]
+    body = _meter(existing.external_reference, enabled=not existing.enabled)
+    del body["external_reference"]
+
+    response = _put_by_ref(existing.external_reference, body, lambda_context)
+
+    meter = json.loads(response["body"])
+    assert meter["meter_id"] == existing.meter_id
+    assert meter["enabled"] is not existing.enabled
+
+
+def test_put_meter_by_ref_mismatch(fresh_db, lambda_context):
+    response = _put_by_ref("UPSERT1", _meter("UPSERT2"), lambda_context)
+
+    assert response["statusCode"] == 400
+
+
+def test_put_meter_by_ref_invalid(fresh_db, lambda_context):
+    response = _put_by_ref(
+        "UPSERT1", _meter("UPSERT1", annual_quantity=-1), lambda_context
+    )
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["details"]
+
+
+def test_put_meter_by_ref_not_an_object(fresh_db, lambda_context):
+    for body in ([1], "UPSERT1", None):
+        response = _put_by_ref("UPSERT1", body, lambda_context)
+
+        assert response["statusCode"] == 400
+
+
+def test_put_meters_by_ref_bulk(db_meters, lambda_context):
+    items = [_meter(db_meters[0].external_reference, annual_quantity=1.0)]
+    items += [_meter(f"NEW{i}") for i in range(600)]
+    event = generate_api_gateway_proxy_event_v2(
+        "PUT", "/meters/by-ref", body=json.dumps(items)
+    )
+    response = put_meters_by_ref(event, lambda_context)
+
+    assert response["statusCode"] == 200
+    meters = json.loads(response["body"])["meters"]
+    assert len(meters) == 601
+    by_ref = {m["external_reference"]: m for m in meters}
+    assert by_ref[db_meters[0].external_reference]["meter_id"] == db_meters[0].meter_id
+    assert by_ref[db_meters[0].external_reference]["annual_quantity"] == 1.0
+
+    listing = get_meters(
+        generate_api_gateway_proxy_event_v2("GET", "/meters"), lambda_context
+    )
+    assert json.loads(listing["body"])["total"] == len(db_meters) + 600
+
+    # Replaying the same sync is idempotent.
+    replayed = put_meters_by_ref(event, lambda_context)
+    assert json.loads(replayed["body"]) == json.loads(response["body"])
+
+
+def test_put_meters_by_ref_skips_unchanged(fresh_db, lambda_context):
+    items = [_meter("UPSERT1"), _meter("UPSERT2")]
+    written = json.loads(_put_many(items, lambda_context)["body"])["meters"]
+    _, watermark = _changes(0, lambda_context)
+
+    items[1]["enabled"] = False
+    response = _put_many(items, lambda_context)
+
+    assert response["statusCode"] == 200
+    meters = json.loads(response["body"])["meters"]
+    assert [m["enabled"] for m in meters] == [True, False]
+    changes, _ = _changes(watermark, lambda_context)
+    assert [c["meter_id"] for c in changes] == [written[1]["meter_id"]]
+
+    # A replay writes nothing, so the change feed is left as it was.
+    _, watermark = _changes(watermark, lambda_context)
+    assert _put_many(items, lambda_context)["statusCode"] == 200
+    assert _put_by_ref("UPSERT1", items[0], lambda_context)["statusCode"] == 200
+    assert _changes(watermark, lambda_context) == ([], watermark)
+
+
+def test_put_meters_by_ref_invalid(fresh_db, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "PUT", "/meters/by-ref", body=json.dumps([_meter("A"), _meter(None)])
+    )
+
+    assert put_meters_by_ref(event, lambda_context)["statusCode"] == 400
@@ -78,3 +78,13 @@ def test_post_meter_duplicate_ref(db_meters, lambda_context):
     assert 400 <= resp["statusCode"] < 500
     assert "json" in resp["headers"]["content-type"]
     assert json.loads(resp["body"])
+
+
+def test_post_meter_malformed_json(fresh_db, lambda_context):
+    event = generate_api_gateway_proxy_event_v2(
+        "POST", "/meters", body='{"external_reference": '
+    )
+    resp = post_meters(event, lambda_context)
+
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["details"][0]["type"] == "json_invalid"
@@ -0,0 +1,224 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from metr.api.meters.caches import meter_cache
+from metr.api.meters.persistors import MeterPersistor
+from metr.api.meters.views import get_meter, get_meters
+from metr.core.cache import LRUCacheBackend
+from metr.database import database, snapshot as snapshot_module
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def test_configure_database_reuses_engine(setup_db):
+    engine = database.Session.kw["bind"]
+
+    assert database.configure_database() is engine
+    assert database.get_engine() is engine
+
+
+def test_warm_invocations_reuse_connection(db_meters, lambda_context):
+    event = generate_api_gateway_proxy_event_v2("GET", "/meters")
+    get_meters(event, lambda_context)
+    connects = database.connection_stats.connects
+    reuses = database.connection_stats.reuses
+
+    for _ in range(3):
+        assert get_meters(event, lambda_context)["statusCode"] == 200
+
+    assert database.connection_stats.connects == connects
+    assert database.connection_stats.reuses >= reuses + 3
+
+
+def test_persistor_session_closed_on_error(setup_db):
+    with pytest.raises(RuntimeError):
+        with MeterPersistor() as persistor:
+            persistor.session.execute(text("SELECT 1"))
+            assert persistor.session.in_transaction()
+            raise RuntimeError()
+
+    assert not persistor.session.in_transaction()
+
+
+@pytest.mark.parametrize(
+    "profile, journal_mode, synchronous",
+    [("default", "delete", 2), ("performance", "wal", 1), ("bulk_load", "wal", 0)],
+)
+def test_sqlite_profile_applied_on_connect(
+    tmp_path, profile, journal_mode, synchronous
+):
+    engine = database.create_database_engine(
+        f"sqlite:///{tmp_path / 'metr.db'}", sqlite_profile=profile
+    )
+    try:
+        with engine.connect() as connection:
+            assert connection.scalar(text("PRAGMA journal_mode")) == journal_mode
+            assert connection.scalar(text("PRAGMA synchronous")) == synchronous
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_read_only_profile_refuses_writes(tmp_path):
+    engine = database.create_database_engine(
+        f"sqlite:///{tmp_path / 'metr.db'}", sqlite_profile="read_only"
+    )
+    try:
+        with engine.connect() as connection:
+            with pytest.raises(OperationalError):
+                connection.execute(text("CREATE TABLE t (id INTEGER)"))
+    finally:
+        engine.dispose()
+
+
+def test_read_only_uri_with_profile(configure_isolated, tmp_path):
+    path = tmp_path / "metr.db"
+    engine = configure_isolated(
+        f"sqlite:///{path}",
+        sqlite_profile="default",
+        read_url=f"sqlite:///file:{path}?mode=ro&uri=true",
+    )
+    database.Base.metadata.create_all(engine)
+
+    with MeterPersistor(read_your_writes=False) as persistor:
+        meter = _add_meter(persistor)
+
+        assert persistor.get_meter(meter.meter_id).external_reference == "PRIMARY"
+        with pytest.raises(OperationalError):
+            persistor.read_session.execute(text("CREATE TABLE t (id INTEGER)"))
+
+
+def test_sqlite_unknown_profile():
+    with pytest.raises(ValueError):
+        database.create_database_engine("sqlite://", sqlite_profile="fast")
+
+
+@pytest.fixture()
+def configure_isolated(setup_db, monkeypatch):
+    """Configure the database anew, restoring the shared test database after."""
+    for name in ("_engine", "_read_engine", "_read_snapshot", "_engine_config"):
+        monkeypatch.setattr(database, name, None)
+    session_kw = dict(database.Session.kw)
+    read_session_kw = dict(database.ReadSession.kw)
+    engines = []
+
+    def _configure(*args, **kwargs):
+        engine = database.configure_database(*args, **kwargs)
+        engines.extend([engine, database.get_read_engine()])
+        return engine
+
+    yield _configure
+    for engine in engines:
+        engine.dispose()
+    database.Session.kw.update(session_kw)
+    database.ReadSession.kw.update(read_session_kw)
+
+
+@pytest.fixture()
+def replica_database(configure_isolated, tmp_path):
+    """Configure a file primary with a separate replica file."""
+    engine = configure_isolated(
+        f"sqlite:///{tmp_path / 'primary.db'}",
+        read_url=f"sqlite:///{tmp_path / 'replica.db'}",
+    )
+    database.Base.metadata.create_all(engine)
+    database.Base.metadata.create_all(database.get_read_engine())
+
+
+def _add_meter(persistor):
+    return persistor.add_meter(
+        {
+            "external_reference": "PRIMARY",
+            "supply_start_date": datetime(2021, 1, 1),
+            "enabled": True,
+            "annual_quantity": 1.0,
+        }
+    )
+
+
+def test_reads_routed_to_read_engine(replica_database):
+    with MeterPersistor(read_your_writes=False) as persistor:
+        meter = _add_meter(persistor)
+
+        assert persistor.get_meter(meter.meter_id) is None
+        assert persistor.count_meters() == 0
+    with MeterPersistor() as persistor:
+        assert persistor.get_meter(meter.meter_id) is None
+
+
+def test_meter_cache_filled_from_primary(replica_database, lambda_context):
+    with MeterPersistor() as persistor:
+        meter_id = _add_meter(persistor).meter_id
+    event = generate_api_gateway_proxy_event_v2(
+        "GET", f"/meters/{meter_id}", {"meter_id": str(meter_id)}
+    )
+
+    backend = meter_cache.backend
+    meter_cache.configure(LRUCacheBackend())
+    try:
+        # The replica has not caught up, but the cached meter must be current.
+        assert get_meter(event, lambda_context)["statusCode"] == 200
+        assert meter_cache.get(meter_id, "application/json") is not None
+    finally:
+        meter_cache.configure(backend)
+
+
+def test_reads_see_own_writes(replica_database):
+    with MeterPersistor() as persistor:
+        meter = _add_meter(persistor)
+
+        assert persistor.get_meter(meter.meter_id).external_reference == "PRIMARY"
+        assert persistor.count_meters() == 1
+
+
+def test_read_engine_defaults_to_primary(setup_db):
+    assert database.get_read_engine() is database.get_engine()
+    with MeterPersistor() as persistor:
+        assert persistor.read_session is persistor.session
+
+
+def test_read_snapshot_serves_reads_from_memory(configure_isolated, tmp_path):
+    url = f"sqlite:///{tmp_path / 'primary.db'}"
+    source = database.create_database_engine(url)
+    database.Base.metadata.create_all(source)
+    source.dispose()
+
+    configure_isolated(url, read_snapshot=True, read_snapshot_ttl=3600)
+    snapshot = database.get_read_snapshot()
+    assert database.get_read_engine() is snapshot.engine
+    assert snapshot.stats.loads == 1
+    assert snapshot.stats.size_bytes > 0
+
+    with MeterPersistor() as persistor:
+        meter = _add_meter(persistor)
+    # The local write marks the snapshot stale; the next reader reloads it.
+    with MeterPersistor() as persistor:
+        assert persistor.get_meter(meter.meter_id).external_reference == "PRIMARY"
+    assert snapshot.stats.loads == 2
+
+    with MeterPersistor() as persistor:
+        assert persistor.count_meters() == 1
+    assert snapshot.stats.loads == 2
+
+
+def test_read_snapshot_reloads_after_ttl(configure_isolated, tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'primary.db'}"
+    source = database.create_database_engine(url)
+    database.Base.metadata.create_all(source)
+    source.dispose()
+    engine = configure_isolated(url, read_snapshot=True, read_snapshot_ttl=60)
+    snapshot = database.get_read_snapshot()
+    now = [snapshot.loaded_at]
+    monkeypatch.setattr(snapshot_module.time, "monotonic", lambda: now[0])
+
+    now[0] += 61
+    assert not snapshot.refresh()
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO table_version (table_name, version) VALUES ('x', 1)")
+        )
+    assert not snapshot.refresh()
+    now[0] += 61
+    assert snapshot.refresh()
+    assert snapshot.version == 1
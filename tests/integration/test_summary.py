@@ -0,0 +1,92 @@
+import json
+
+from sqlalchemy import update
+
+from metr.api.meters.router import handle
+from metr.database import database, summary
+from metr.database.models import MeterSummary
+from tests.factories import generate_api_gateway_proxy_event_v2
+
+
+def _request(lambda_context, method, path, body=None, **kwargs):
+    event = generate_api_gateway_proxy_event_v2(
+        method,
+        path,
+        body=json.dumps(body) if body is not None else "",
+        headers={"content-type": "application/merge-patch+json"},
+        **kwargs,
+    )
+    response = handle(event, lambda_context)
+    assert response["statusCode"] < 300, response["body"]
+    return response
+
+
+def _verify():
+    with database.Session.kw["bind"].connect() as connection:
+        return summary.verify_summary(connection)
+
+
+def test_summary_follows_every_write(db_meters, lambda_context):
+    assert _verify() == []
+    meter = {
+        "external_reference": "SUMMARY1",
+        "supply_start_date": "2021-01-01",
+        "supply_end_date": None,
+        "enabled": True,
+        "annual_quantity": 10.5,
+    }
+
+    created = _request(lambda_context, "POST", "/meters", {**meter, "meter_id": 1})
+    meter_id = json.loads(created["body"])["meter_id"]
+    _request(
+        lambda_context,
+        "PUT",
+        f"/meters/{meter_id}",
+        {**meter, "meter_id": meter_id, "enabled": False, "annual_quantity": 20.0},
+    )
+    _request(
+        lambda_context,
+        "PATCH",
+        "/meters",
+        {"enabled": True},
+        query_string="meter_id__lt=10",
+    )
+    _request(
+        lambda_context,
+        "PUT",
+        "/meters/by-ref",
+        [
+            {**meter, "annual_quantity": 30.0},
+            {**meter, "external_reference": "SUMMARY2"},
+        ],
+    )
+    _request(lambda_context, "DELETE", f"/meters/{db_meters[5].meter_id}")
+
+    assert _verify() == []
+
+
+def test_unfiltered_total_reads_the_summary(
+    db_meters, assert_num_queries, lambda_context
+):
+    with assert_num_queries(2) as statements:
+        response = _request(
+            lambda_context, "GET", "/meters", query_string="page_size=5"
+        )
+
+    assert json.loads(response["body"])["total"] == 100
+    assert "meter_summary" in statements[-1]
+    assert "count(meter.meter_id)" not in statements[-1]
+
+
+def test_verify_and_rebuild_command(db_meters, capsys):
+    with database.Session.begin() as session:
+        session.execute(
+            update(MeterSummary).values(meter_count=MeterSummary.meter_count + 1)
+        )
+
+    assert summary.main(["verify"]) == 1
+    assert "Summary has drifted." in capsys.readouterr().err
+
+    assert summary.main(["rebuild"]) == 0
+    assert summary.main(["verify"]) == 0
+    assert _verify() == []
@@ -0,0 +1,44 @@
+from metr.core import cache
+from metr.core.cache import LRUCacheBackend
+
+
+def test_lru_cache_evicts_least_recently_used():
+    backend = LRUCacheBackend(maxsize=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    assert backend.get("a") == 1
+
+    backend.set("c", 3)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.get("c") == 3
+    assert backend.stats.as_dict() == {"hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_lru_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    backend = LRUCacheBackend(ttl=10)
+    backend.set("a", 1)
+
+    now[0] += 9
+    assert backend.get("a") == 1
+
+    now[0] += 2
+    assert backend.get("a") is None
+    assert len(backend) == 0
+    assert backend.stats.evictions == 1
+
+
+def test_lru_cache_delete_and_clear():
+    backend = LRUCacheBackend()
+    backend.set("a", 1)
+    backend.set("b", 2)
+
+    backend.delete("a")
+    backend.delete("missing")
+    assert backend.get("a") is None
+
+    backend.clear()
+    assert backend.get("b") is None
@@ -0,0 +1,14 @@
+import subprocess
+import sys
+
+
+def test_views_import_leaves_optional_modules_unloaded():
+    code = (
+        "import sys, metr.api.meters.views\n"
+        "print(sorted({'brotli', 'gzip'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+
+    assert result.stdout.strip() == "[]"
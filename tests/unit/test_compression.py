@@ -0,0 +1,68 @@
+import base64
+import gzip
+
+import pytest
+
+from metr.core import compression
+from metr.core.compression import (
+    ResponseCompressor,
+    encoded_etag,
+    identity_etag,
+    negotiate_encoding,
+)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip, deflate", "gzip"),
+        ("deflate, gzip;q=0.5", "deflate"),
+        ("gzip;q=0, deflate", "deflate"),
+        ("*", "gzip"),
+        ("x-gzip", "gzip"),
+    ],
+)
+def test_negotiate_encoding(monkeypatch, accept_encoding, expected):
+    monkeypatch.delitem(compression.ENCODERS, "br", raising=False)
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_compressor_skips_small_bodies():
+    compressor = ResponseCompressor(min_size=100)
+    response = {"statusCode": 200, "headers": {}, "body": "x" * 99}
+
+    skipped = compressor.compress(response, "gzip")
+
+    assert skipped["body"] is response["body"]
+    assert skipped["headers"] == {"vary": "accept-encoding"}
+    assert compressor.stats.skipped == 1
+
+
+def test_compressor_gzip_round_trip():
+    compressor = ResponseCompressor(min_size=100, level=1)
+    body = '{"meters": []}' * 100
+    response = {"statusCode": 200, "headers": {"etag": '"1"'}, "body": body}
+
+    compressed = compressor.compress(response, "gzip")
+
+    assert compressed["isBase64Encoded"] is True
+    assert compressed["headers"] == {
+        "etag": '"1-gzip"',
+        "content-encoding": "gzip",
+        "vary": "accept-encoding",
+    }
+    assert gzip.decompress(base64.b64decode(compressed["body"])).decode() == body
+    assert response["headers"] == {"etag": '"1"'}
+    assert compressor.stats.bytes_in == len(body)
+    assert compressor.stats.ratio < 0.1
+
+
+@pytest.mark.parametrize(
+    "etag, expected",
+    [('"1.2.json-gzip"', '"1.2.json"'), ('"1.2.json"', '"1.2.json"')],
+)
+def test_identity_etag(etag, expected):
+    assert identity_etag(etag) == expected
+    assert identity_etag(encoded_etag(expected, "br")) == expected
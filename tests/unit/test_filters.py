@@ -0,0 +1,95 @@
+from datetime import date, datetime
+
+import pytest
+
+from metr.api.meters.filters import (
+    filter_criteria,
+    filter_shape,
+    filter_values,
+    parse_filters,
+)
+from metr.core.exceptions import BadRequestException
+
+
+def test_parse_filters_coerces_values():
+    filters = parse_filters(
+        {
+            "meter_id__in": "1,2,3",
+            "enabled": "true",
+            "supply_start_date": "2024-01-01",
+            "supply_end_date__is_null": "false",
+            "annual_quantity__lt": "10.5",
+            "active_on": "2024-06-01",
+        }
+    )
+
+    assert filters == {
+        "meter_id__in": (1, 2, 3),
+        "enabled__eq": True,
+        "supply_start_date__gte": datetime(2024, 1, 1),
+        "supply_end_date__is_null": False,
+        "annual_quantity__lt": 10.5,
+        "active_on__eq": date(2024, 6, 1),
+    }
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        ({"colour": "red"}, "Unknown filter: colour"),
+        ({"meter_id__like": "1"}, "Unknown filter: meter_id__like"),
+        ({"meter_id__in": "1,x"}, "Invalid value for filter: meter_id__in"),
+        ({"active_on": "yesterday"}, "Invalid value for filter: active_on"),
+        (
+            {"meter_id__prefix": "1"},
+            "Prefix filters only apply to text: meter_id__prefix",
+        ),
+        (
+            {"supply_start_date__prefix": "2020"},
+            "Prefix filters only apply to text: supply_start_date__prefix",
+        ),
+        (
+            {"external_reference__prefix": ""},
+            "Invalid value for filter: external_reference__prefix",
+        ),
+    ],
+)
+def test_parse_filters_rejects_bad_filters(params, message):
+    with pytest.raises(BadRequestException) as error:
+        parse_filters(params)
+
+    assert error.value.message == message
+
+
+def test_filter_shape_ignores_values_but_is_null():
+    assert filter_shape({"meter_id__in": (1,), "enabled": True}) == filter_shape(
+        {"enabled__eq": False, "meter_id__in": (2, 3)}
+    )
+    assert filter_shape({"supply_end_date__is_null": True}) != filter_shape(
+        {"supply_end_date__is_null": False}
+    )
+
+
+def test_prefix_is_a_range():
+    filters = {"external_reference__prefix": "A_1%"}
+
+    (criterion,) = filter_criteria(filter_shape(filters))
+
+    assert str(criterion) == (
+        "meter.external_reference >= :external_reference__prefix"
+        " AND meter.external_reference < :external_reference__prefix__end"
+    )
+    assert filter_values(filters) == {
+        "external_reference__prefix": "A_1%",
+        "external_reference__prefix__end": "A_1&",
+    }
+
+
+@pytest.mark.parametrize(
+    "prefix, end",
+    [("abc", "abd"), ("a\ud7ff", "a\ue000"), ("a\U0010ffff\U0010ffff", "b")],
+)
+def test_prefix_end(prefix, end):
+    values = filter_values({"external_reference__prefix": prefix})
+
+    assert values["external_reference__prefix__end"] == end
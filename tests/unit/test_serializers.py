@@ -0,0 +1,45 @@
+import xml.etree.ElementTree as ElementTree
+
+import dicttoxml
+
+from metr.api.meters.serializers import SERIALIZERS, get_serializer
+
+BODY = {
+    "page": 1,
+    "total": None,
+    "meters": [
+        {
+            "meter_id": 1,
+            "external_reference": "A&B<1>\"O'Neil\"",
+            "supply_start_date": "2020-01-01T00:00:00",
+            "supply_end_date": None,
+            "enabled": True,
+            "annual_quantity": 1.5,
+        }
+    ],
+    "next_page": "/meters?page_size=1&cursor=abc",
+}
+
+
+def test_xml_serializer_matches_dicttoxml():
+    dicttoxml.LOG.disabled = True
+    expected = dicttoxml.dicttoxml(BODY).decode()
+
+    assert SERIALIZERS["application/xml"].dumps(BODY) == expected
+
+
+def test_xml_serializer_replaces_invalid_characters():
+    body = {**BODY, "meters": [{**BODY["meters"][0], "external_reference": "a\x01"}]}
+
+    root = ElementTree.fromstring(SERIALIZERS["application/xml"].dumps(body))
+
+    assert root.find("meters/item/external_reference").text == "a�"
+
+
+def test_get_serializer_negotiates_accept_header():
+    assert get_serializer("text/csv").content_type == "text/csv"
+    assert get_serializer("text/html, application/xml;q=0.9").content_type == (
+        "application/xml"
+    )
+    assert get_serializer("*/*").content_type == "application/json"
+    assert get_serializer(None).content_type == "application/json"